@@ -0,0 +1,82 @@
+"""Rows/second for loading the cube: row-at-a-time vs the staged bulk merge.
+
+    python benchmarks/cube_bulk_load.py --rows 10000
+
+The "row-at-a-time" figure replays what ``DuckDbCube`` used to do -- one
+``INSERT OR REPLACE`` per fact plus a DELETE and one INSERT per tag into the
+bridge -- against the same schema, so both numbers come from one process and
+one DuckDB build. The "bulk" figure is :meth:`DuckDbCube.rebuild_for_user`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from uuid import uuid4
+
+from tomin.adapters.outbound.cube import DuckDbCube
+from tomin.domain.entities import Transaction
+from tomin.domain.value_objects.enums import TxType
+
+
+def _history(rows: int) -> list[Transaction]:
+    rng = random.Random(7)
+    user = uuid4()
+    tags = [uuid4() for _ in range(5)]
+    start = date(2015, 1, 1)
+    return [
+        Transaction(
+            user_id=user,
+            tx_date=start + timedelta(days=i % 3650),
+            amount=Decimal(rng.randint(100, 500_000)) / 100,
+            raw_description=f"COMPRA COMERCIO {i % 400}",
+            tx_type=TxType.INCOME if i % 15 == 0 else TxType.EXPENSE,
+            tag_ids=rng.sample(tags, k=i % 3),
+        )
+        for i in range(rows)
+    ]
+
+
+def _row_at_a_time(cube: DuckDbCube, transactions: list[Transaction]) -> None:
+    with cube._lock:
+        con = cube._connection
+        for t in transactions:
+            con.execute(
+                "INSERT OR REPLACE INTO fact_transactions VALUES "
+                "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                cube._fact_row(t),
+            )
+            con.execute("DELETE FROM bridge_transaction_tag WHERE tx_id = ?", [str(t.id)])
+            for tag_id in t.tag_ids:
+                con.execute(
+                    "INSERT OR REPLACE INTO bridge_transaction_tag VALUES (?, ?)",
+                    [str(t.id), str(tag_id)],
+                )
+
+
+def _time(label: str, rows: int, fn) -> float:
+    started = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - started
+    print(f"{label:<16} {rows:>8} rows  {elapsed:8.2f}s  {rows / elapsed:>10,.0f} rows/s")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    args = parser.parse_args()
+
+    history = _history(args.rows)
+    user = history[0].user_id
+
+    before = _time("row-at-a-time", args.rows, lambda: _row_at_a_time(DuckDbCube(), history))
+    after = _time("bulk", args.rows, lambda: DuckDbCube().rebuild_for_user(user, iter(history)))
+    print(f"speed-up         {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Per-query overhead of DuckDbMetricEngine: compile alone, and compile + execute.
+
+    python benchmarks/metric_compile.py --rows 2000 --repeat 500
+
+"cold" clears the engine's plan cache before every query, which is what every
+query paid before the cache existed; "warm" reuses it. Execution runs against
+one user's history in an in-memory cube, so the gap between the compile line
+and the execute line is DuckDB's own parse/plan/run time.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from uuid import uuid4
+
+from tomin.adapters.outbound.cube import DuckDbCube, DuckDbMetricEngine
+from tomin.application.dtos.metrics import MetricQuery, Period
+from tomin.domain.entities import Transaction
+from tomin.domain.metrics.catalog import METRIC_CATALOG
+from tomin.domain.metrics.spec import normalize
+from tomin.domain.value_objects.enums import TxType
+
+_QUERIES = [
+    ("spend_by_category", {}),
+    ("monthly_cash_flow", {}),
+    ("accumulated_spend", {"grain": "day"}),
+    ("spend_by_category", {"filters": {"category": ["a", "b", "c"]}}),
+]
+
+
+def _microseconds(fn, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=500)
+    args = parser.parse_args()
+
+    cube = DuckDbCube()
+    user = uuid4()
+    start = date(2024, 1, 1)
+    cube.upsert_transactions([
+        Transaction(
+            user_id=user,
+            tx_date=start + timedelta(days=i % 365),
+            amount=Decimal(100 + i % 900),
+            raw_description=f"COMERCIO {i % 50}",
+            tx_type=TxType.INCOME if i % 20 == 0 else TxType.EXPENSE,
+        )
+        for i in range(args.rows)
+    ])
+    engine = DuckDbMetricEngine(cube)
+    # Mid-month, so every query reads the facts rather than the rollup.
+    period = Period(date(2024, 2, 10), date(2024, 11, 20))
+
+    print(f"{'metric':<20} {'compile cold':>13} {'compile warm':>13} {'execute':>10}  (us)")
+    for metric, fields in _QUERIES:
+        spec = METRIC_CATALOG[metric]
+        query = normalize(spec, MetricQuery(key="k", metric=metric, period=period, **fields))
+
+        def compile_warm(spec=spec, query=query):
+            item = engine._prepare(user, spec, query)
+            engine._cached(("sql", item.shape), lambda: engine._compile(item)[0])
+
+        def compile_cold(compile_warm=compile_warm):
+            engine._plans.clear()
+            compile_warm()
+
+        cold = _microseconds(compile_cold, args.repeat)
+        warm = _microseconds(compile_warm, args.repeat)
+        run = _microseconds(lambda spec=spec, query=query: engine.execute(user, spec, query),
+                            args.repeat)
+        print(f"{metric:<20} {cold:>13.1f} {warm:>13.1f} {run:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""Latency of POST /api/metrics/query under concurrent clients.
+
+    python benchmarks/metrics_query_load.py --clients 16 --requests 40 --rows 50000
+
+Each client posts the command center's batch (four widgets) in a loop while one
+writer re-upserts a slice of the same user's history every quarter second, the
+way a stream of ingests would. The run is repeated with the cube's reads forced
+back through the writer lock -- what ``DuckDbCube`` did before it had read
+cursors -- so both p50/p95 lines come from one process and one DuckDB build.
+
+Run it on a machine with several cores: read cursors buy parallelism, and on a
+single core the only thing they change is which waiter the scheduler favours.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+from uuid import UUID
+
+from tomin.adapters.outbound.cube import DuckDbCube
+from tomin.config.settings import Settings
+from tomin.domain.entities import Transaction
+from tomin.domain.value_objects.enums import TxType
+from tomin.main import create_app
+
+_BATCH = {
+    "queries": [
+        {"key": "categories", "metric": "spend_by_category"},
+        {"key": "flow", "metric": "monthly_cash_flow"},
+        {"key": "tags", "metric": "tag_totals"},
+        {"key": "daily", "metric": "accumulated_spend", "grain": "day"},
+    ]
+}
+
+
+def _history(user: UUID, rows: int) -> list[Transaction]:
+    rng = random.Random(7)
+    start = date(2015, 1, 1)
+    return [
+        Transaction(
+            user_id=user,
+            tx_date=start + timedelta(days=i % 3650),
+            amount=Decimal(rng.randint(100, 500_000)) / 100,
+            raw_description=f"COMPRA COMERCIO {i % 400}",
+            tx_type=TxType.INCOME if i % 15 == 0 else TxType.EXPENSE,
+        )
+        for i in range(rows)
+    ]
+
+
+@contextmanager
+def _locked_reading(self: DuckDbCube):
+    """Every read on the writer connection, under the writer lock."""
+    with self._lock:
+        yield self._connection
+
+
+def _run(app, history: list[Transaction], clients: int, requests: int) -> list[float]:
+    cube = app.extensions["container"].cube
+    latencies: list[float] = []
+    record = threading.Lock()
+    stop = threading.Event()
+
+    def client() -> None:
+        http = app.test_client()
+        for _ in range(requests):
+            started = time.perf_counter()
+            resp = http.post("/api/metrics/query", json=_BATCH)
+            elapsed = time.perf_counter() - started
+            assert resp.status_code == 200, resp.get_data(as_text=True)
+            with record:
+                latencies.append(elapsed)
+
+    def writer() -> None:
+        while not stop.wait(0.25):
+            cube.upsert_transactions(history[:2000])
+
+    background = threading.Thread(target=writer)
+    background.start()
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    stop.set()
+    background.join()
+    return latencies
+
+
+def _report(label: str, latencies: list[float]) -> float:
+    cuts = statistics.quantiles(latencies, n=100)
+    p50, p95 = cuts[49] * 1000, cuts[94] * 1000
+    print(f"{label:<14} {len(latencies):>5} requests  p50 {p50:8.1f}ms  p95 {p95:8.1f}ms")
+    return p95
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=40, help="per client")
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--readers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        settings = Settings(
+            database_url=f"sqlite:///{Path(tmp) / 'bench.db'}",
+            cube_path=":memory:",
+            cube_readers=args.readers,
+            auth_disabled=True,
+            run_migrations=False,
+        )
+        app = create_app(settings)
+        container = app.extensions["container"]
+        container.bootstrap()
+        history = _history(UUID(settings.dev_user_id), args.rows)
+        container.cube.rebuild_for_user(history[0].user_id, iter(history))
+
+        pooled = DuckDbCube._reading
+        DuckDbCube._reading = _locked_reading
+        try:
+            before = _report("writer lock", _run(app, history, args.clients, args.requests))
+        finally:
+            DuckDbCube._reading = pooled
+        after = _report("read cursors", _run(app, history, args.clients, args.requests))
+        print(f"p95 speed-up   {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Rows/second for SqlTransactionRepository.add_many: ORM objects vs the Core path.
+
+    python benchmarks/transaction_bulk_insert.py --rows 10000
+    python benchmarks/transaction_bulk_insert.py --database-url postgresql://...
+
+The "orm" figure replays what ``add_many`` used to do -- one ``TransactionModel``
+per row, added to a session and flushed on commit -- against the same schema,
+so both numbers come from one process and one database. The "core" figure is
+:meth:`SqlTransactionRepository.add_many` (``COPY`` on PostgreSQL/psycopg2,
+``executemany`` elsewhere). Each run inserts a fresh user's rows.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+from uuid import uuid4
+
+from tomin.adapters.outbound.persistence.db import Database
+from tomin.adapters.outbound.persistence.models import TransactionModel
+from tomin.adapters.outbound.persistence.repositories import (
+    SqlTransactionRepository,
+    _transaction_row,
+)
+from tomin.domain.entities import Transaction
+from tomin.domain.value_objects.enums import TxType
+
+
+def _parsed(rows: int) -> list[Transaction]:
+    rng = random.Random(7)
+    user = uuid4()
+    start = date(2020, 1, 1)
+    return [
+        Transaction(
+            user_id=user,
+            tx_date=start + timedelta(days=i % 1500),
+            amount=Decimal(rng.randint(100, 500_000)) / 100,
+            raw_description=f"COMPRA COMERCIO {i % 400} REF {rng.randint(0, 10**8)}",
+            tx_type=TxType.INCOME if i % 15 == 0 else TxType.EXPENSE,
+        )
+        for i in range(rows)
+    ]
+
+
+def _orm(db: Database, transactions: list[Transaction]) -> None:
+    with db.session() as s:
+        for t in transactions:
+            s.add(TransactionModel(**_transaction_row(t)))
+
+
+def _rate(label: str, fn, rows: int) -> float:
+    started = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - started
+    print(f"{label:<6} {rows:>7} rows  {elapsed * 1000:8.1f}ms  {rows / elapsed:>10,.0f} rows/s")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--database-url", help="defaults to a temporary SQLite file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(args.database_url or f"sqlite:///{Path(tmp) / 'bench.db'}")
+        db.create_all()
+        repo = SqlTransactionRepository(db)
+
+        old, new = _parsed(args.rows), _parsed(args.rows)
+        before = _rate("orm", lambda: _orm(db, old), args.rows)
+        after = _rate("core", lambda: repo.add_many(new), args.rows)
+        print(f"speed-up {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
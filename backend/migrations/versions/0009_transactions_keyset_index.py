@@ -0,0 +1,39 @@
+"""Composite (user_id, tx_date, id) index for keyset pagination.
+
+The transactions list pages by a cursor over ``(tx_date, id)`` rather than by
+OFFSET: an offset page costs every row before it, and ordering by ``tx_date``
+alone left equal-date rows free to swap between pages. With the tenant column
+leading, "this user's rows after the cursor, newest first" is one range scan
+of this index, in index order, however deep the page.
+
+``ix_transactions_user_id`` stays. It is a prefix of this one and could go, but
+dropping an index is the kind of change worth making on its own, after the
+query plans say nothing still prefers it.
+
+Adds no table, so no new RLS policy.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "0009"
+down_revision: str | None = "0008"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_transactions_user_date_id", "transactions", ["user_id", "tx_date", "id"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_transactions_user_date_id", table_name="transactions")
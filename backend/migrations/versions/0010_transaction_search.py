@@ -0,0 +1,147 @@
+"""Indexed, accent-insensitive search over transaction descriptions.
+
+The list's ``?search=`` used to be ``description ILIKE '%term%'``: a scan of
+every row the user owns, on every keystroke, that found "CAFÉ" for "café" but
+not for "cafe". This adds ``transactions.search_text`` -- the description run
+through ``categorization.normalize``, the same folding the categorizer matches
+on -- and an index that answers substring queries over it:
+
+* SQLite: an external-content FTS5 table with the ``trigram`` tokenizer, kept
+  in step with ``transactions`` by three triggers. Trigram FTS serves
+  ``LIKE '%term%'`` from the index for terms of three or more characters.
+* PostgreSQL: ``pg_trgm`` and a GIN index on the column, which the planner
+  uses for the same ``LIKE``. A ``tsvector`` would have been the textbook
+  choice, but it matches whole words, and the list has always matched
+  substrings ("oxx" finds "OXXO"); trigrams keep that behaviour.
+
+**Backfill through the domain rule**, for the reason 0008 gives: the column
+must mean exactly what the repository writes on insert, or old and new rows
+would answer the same search differently.
+
+**SQLite caveat.** The FTS table points at ``transactions.rowid``. A future
+``batch_alter_table`` on ``transactions`` rebuilds the table, drops these
+triggers and may renumber rows; such a migration must recreate the triggers
+and run the ``'rebuild'`` command below afterwards.
+
+The FTS shadow tables belong to ``transactions`` and are reached only through
+it, so no new RLS policy (and SQLite has none to add).
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+from tomin.domain.services.categorization import normalize
+
+revision: str = "0010"
+down_revision: str | None = "0009"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+#: Rows per executemany in the backfill.
+_BACKFILL_CHUNK = 1000
+
+_transactions = sa.table(
+    "transactions",
+    sa.column("id", sa.String(36)),
+    sa.column("description", sa.String(500)),
+    sa.column("raw_description", sa.String(500)),
+    sa.column("search_text", sa.String(500)),
+)
+
+# Frozen copies of models.SQLITE_SEARCH_DDL / POSTGRES_SEARCH_DDL.
+_SQLITE_UP = (
+    (
+        "CREATE VIRTUAL TABLE transactions_fts USING fts5("
+        "search_text, content='transactions', content_rowid='rowid', tokenize='trigram')"
+    ),
+    (
+        "CREATE TRIGGER transactions_fts_ai AFTER INSERT ON transactions BEGIN "
+        "INSERT INTO transactions_fts(rowid, search_text) VALUES (new.rowid, new.search_text); "
+        "END"
+    ),
+    (
+        "CREATE TRIGGER transactions_fts_ad AFTER DELETE ON transactions BEGIN "
+        "INSERT INTO transactions_fts(transactions_fts, rowid, search_text) "
+        "VALUES ('delete', old.rowid, old.search_text); "
+        "END"
+    ),
+    (
+        "CREATE TRIGGER transactions_fts_au AFTER UPDATE OF search_text ON transactions BEGIN "
+        "INSERT INTO transactions_fts(transactions_fts, rowid, search_text) "
+        "VALUES ('delete', old.rowid, old.search_text); "
+        "INSERT INTO transactions_fts(rowid, search_text) VALUES (new.rowid, new.search_text); "
+        "END"
+    ),
+    "INSERT INTO transactions_fts(transactions_fts) VALUES ('rebuild')",
+)
+_SQLITE_DOWN = (
+    "DROP TRIGGER IF EXISTS transactions_fts_au",
+    "DROP TRIGGER IF EXISTS transactions_fts_ad",
+    "DROP TRIGGER IF EXISTS transactions_fts_ai",
+    "DROP TABLE IF EXISTS transactions_fts",
+)
+_POSTGRES_UP = (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    (
+        "CREATE INDEX IF NOT EXISTS ix_transactions_search_trgm "
+        "ON transactions USING gin (search_text gin_trgm_ops)"
+    ),
+)
+_POSTGRES_DOWN = ("DROP INDEX IF EXISTS ix_transactions_search_trgm",)
+
+
+def upgrade() -> None:
+    # Nullable, so a plain ADD COLUMN on both dialects -- no batch rebuild.
+    op.add_column("transactions", sa.Column("search_text", sa.String(500), nullable=True))
+
+    bind = op.get_bind()
+    rows = bind.execute(
+        sa.select(_transactions.c.id, _transactions.c.description, _transactions.c.raw_description)
+    ).all()
+    # One executemany per chunk rather than a round trip per row; chunked so
+    # the parameter list stays small however large the table is.
+    backfill = (
+        sa.update(_transactions)
+        .where(_transactions.c.id == sa.bindparam("_id"))
+        .values(search_text=sa.bindparam("_search_text"))
+    )
+    for start in range(0, len(rows), _BACKFILL_CHUNK):
+        bind.execute(
+            backfill,
+            [
+                {"_id": tx_id, "_search_text": normalize(description or raw_description or "")}
+                for tx_id, description, raw_description in rows[start : start + _BACKFILL_CHUNK]
+            ],
+        )
+    logger.info("Search text backfilled for %s transaction(s).", len(rows))
+
+    # Index last: on SQLite 'rebuild' reads the backfilled column in one pass,
+    # and on PostgreSQL one build beats maintaining the index row by row.
+    statements = _SQLITE_UP if bind.dialect.name == "sqlite" else _POSTGRES_UP
+    if bind.dialect.name in ("sqlite", "postgresql"):
+        for statement in statements:
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == "sqlite":
+        for statement in _SQLITE_DOWN:
+            op.execute(statement)
+    elif bind.dialect.name == "postgresql":
+        for statement in _POSTGRES_DOWN:
+            op.execute(statement)
+    # batch: SQLite before 3.35 cannot DROP COLUMN in place.
+    with op.batch_alter_table("transactions") as batch:
+        batch.drop_column("search_text")
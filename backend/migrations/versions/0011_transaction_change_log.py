@@ -0,0 +1,170 @@
+"""Change log for incremental cube sync: ``transaction_changes`` and its triggers.
+
+The cube is kept in step by the use cases writing to it as they write to the
+relational store, and until now the only repair for a write that missed it
+(the cube was locked, the process died between the two) was a full rebuild.
+This records every write to ``transactions`` and ``transaction_tags`` as
+``(seq, user_id, transaction_id)``; the cube remembers, per user, the last
+``seq`` it has applied, and catches up by re-reading only the transactions
+named after it.
+
+**Triggers, not repository code.** Bulk ``COPY``, ``executemany`` updates,
+cascaded deletes and hand-run SQL all land in the log without any of them
+having to remember to. SQLite gets row triggers; PostgreSQL gets statement
+triggers over transition tables, one ``INSERT ... SELECT`` per statement.
+
+**Empty on upgrade.** Nothing is backfilled: the cube has no marks yet either,
+so its first sync of each user is a full rebuild, after which the log covers
+everything since.
+
+The log is user-owned, so RLS like its neighbours. Its rows are written by the
+triggers in the writer's own session and satisfy the policy by construction.
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0011"
+down_revision: str | None = "0010"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+UUIDStr = sa.String(36)
+
+# Frozen copies of models.SQLITE_CHANGE_LOG_DDL / POSTGRES_CHANGE_LOG_DDL.
+_SQLITE_UP = (
+    (
+        "CREATE TRIGGER IF NOT EXISTS transaction_changes_ai AFTER INSERT ON transactions "
+        "BEGIN INSERT INTO transaction_changes (user_id, transaction_id) VALUES (new.user_id, "
+        "new.id); END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS transaction_changes_au AFTER UPDATE ON transactions "
+        "BEGIN INSERT INTO transaction_changes (user_id, transaction_id) VALUES (new.user_id, "
+        "new.id); END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS transaction_changes_ad AFTER DELETE ON transactions "
+        "BEGIN INSERT INTO transaction_changes (user_id, transaction_id) VALUES (old.user_id, "
+        "old.id); END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS transaction_changes_tag_ai AFTER INSERT ON "
+        "transaction_tags BEGIN INSERT INTO transaction_changes (user_id, transaction_id) "
+        "SELECT user_id, id FROM transactions WHERE id = new.transaction_id; END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS transaction_changes_tag_ad AFTER DELETE ON "
+        "transaction_tags BEGIN INSERT INTO transaction_changes (user_id, transaction_id) "
+        "SELECT user_id, id FROM transactions WHERE id = old.transaction_id; END"
+    ),
+)
+_SQLITE_DOWN = (
+    "DROP TRIGGER IF EXISTS transaction_changes_tag_ad",
+    "DROP TRIGGER IF EXISTS transaction_changes_tag_ai",
+    "DROP TRIGGER IF EXISTS transaction_changes_ad",
+    "DROP TRIGGER IF EXISTS transaction_changes_au",
+    "DROP TRIGGER IF EXISTS transaction_changes_ai",
+)
+_POSTGRES_UP = (
+    (
+        "CREATE OR REPLACE FUNCTION log_transaction_changes() RETURNS trigger LANGUAGE "
+        "plpgsql AS $$ BEGIN INSERT INTO transaction_changes (user_id, transaction_id) SELECT "
+        "user_id, id FROM changed_rows; RETURN NULL; END $$"
+    ),
+    (
+        "CREATE OR REPLACE FUNCTION log_transaction_tag_changes() RETURNS trigger LANGUAGE "
+        "plpgsql AS $$ BEGIN INSERT INTO transaction_changes (user_id, transaction_id) SELECT "
+        "t.user_id, t.id FROM transactions t WHERE t.id IN (SELECT transaction_id FROM "
+        "changed_rows); RETURN NULL; END $$"
+    ),
+    (
+        "CREATE OR REPLACE TRIGGER transaction_changes_ai AFTER INSERT ON transactions "
+        "REFERENCING NEW TABLE AS changed_rows FOR EACH STATEMENT EXECUTE FUNCTION "
+        "log_transaction_changes()"
+    ),
+    (
+        "CREATE OR REPLACE TRIGGER transaction_changes_au AFTER UPDATE ON transactions "
+        "REFERENCING NEW TABLE AS changed_rows FOR EACH STATEMENT EXECUTE FUNCTION "
+        "log_transaction_changes()"
+    ),
+    (
+        "CREATE OR REPLACE TRIGGER transaction_changes_ad AFTER DELETE ON transactions "
+        "REFERENCING OLD TABLE AS changed_rows FOR EACH STATEMENT EXECUTE FUNCTION "
+        "log_transaction_changes()"
+    ),
+    (
+        "CREATE OR REPLACE TRIGGER transaction_changes_tag_ai AFTER INSERT ON "
+        "transaction_tags REFERENCING NEW TABLE AS changed_rows FOR EACH STATEMENT EXECUTE "
+        "FUNCTION log_transaction_tag_changes()"
+    ),
+    (
+        "CREATE OR REPLACE TRIGGER transaction_changes_tag_ad AFTER DELETE ON "
+        "transaction_tags REFERENCING OLD TABLE AS changed_rows FOR EACH STATEMENT EXECUTE "
+        "FUNCTION log_transaction_tag_changes()"
+    ),
+    "ALTER TABLE public.transaction_changes ENABLE ROW LEVEL SECURITY;",
+    'DROP POLICY IF EXISTS "owner_all_transaction_changes" ON public.transaction_changes;',
+    (
+        'CREATE POLICY "owner_all_transaction_changes" ON public.transaction_changes '
+        "FOR ALL USING (auth.uid()::text = user_id) "
+        "WITH CHECK (auth.uid()::text = user_id);"
+    ),
+)
+_POSTGRES_DOWN = (
+    'DROP POLICY IF EXISTS "owner_all_transaction_changes" ON public.transaction_changes;',
+    "DROP TRIGGER IF EXISTS transaction_changes_tag_ad ON transaction_tags",
+    "DROP TRIGGER IF EXISTS transaction_changes_tag_ai ON transaction_tags",
+    "DROP TRIGGER IF EXISTS transaction_changes_ad ON transactions",
+    "DROP TRIGGER IF EXISTS transaction_changes_au ON transactions",
+    "DROP TRIGGER IF EXISTS transaction_changes_ai ON transactions",
+    "DROP FUNCTION IF EXISTS log_transaction_tag_changes()",
+    "DROP FUNCTION IF EXISTS log_transaction_changes()",
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "transaction_changes",
+        sa.Column(
+            "seq",
+            sa.BigInteger().with_variant(sa.Integer(), "sqlite"),
+            nullable=False,
+            autoincrement=True,
+        ),
+        sa.Column("user_id", UUIDStr, nullable=False),
+        sa.Column("transaction_id", UUIDStr, nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint("seq"),
+        # AUTOINCREMENT: a seq is never reused, even once the top rows are pruned.
+        sqlite_autoincrement=True,
+    )
+    op.create_index("ix_transaction_changes_user_seq", "transaction_changes", ["user_id", "seq"])
+
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        for statement in _SQLITE_UP:
+            op.execute(statement)
+    elif dialect == "postgresql":
+        for statement in _POSTGRES_UP:
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        for statement in _SQLITE_DOWN:
+            op.execute(statement)
+    elif dialect == "postgresql":
+        for statement in _POSTGRES_DOWN:
+            op.execute(statement)
+    op.drop_index("ix_transaction_changes_user_seq", table_name="transaction_changes")
+    op.drop_table("transaction_changes")
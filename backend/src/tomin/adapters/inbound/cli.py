@@ -0,0 +1,152 @@
+"""Operator commands, run as ``flask --app tomin.main <command>``.
+
+These work on every user's data at once, which the HTTP API deliberately
+never does (there is no admin role). They open the DuckDB cube file like the
+server does, and DuckDB allows one writer per file: run them with the server
+stopped, or point ``CUBE_PATH`` at the file the server is not using.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from uuid import UUID
+
+import click
+from flask import Flask, current_app
+from flask.cli import with_appcontext
+
+
+def _container():
+    container = current_app.extensions["container"]
+    container.bootstrap()
+    return container
+
+
+@click.command("backfill-flags")
+@click.option("--user", "user_id", type=click.UUID, help="Only this user (default: everyone).")
+@click.option("--dry-run", is_flag=True, help="Report what would move; write nothing.")
+@click.option("--batch-size", type=click.IntRange(min=1), default=1000, show_default=True)
+@click.option(
+    "--checkpoint",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="File holding the last finished user. An existing one resumes after it.",
+)
+@with_appcontext
+def backfill_flags_command(
+    user_id: UUID | None, dry_run: bool, batch_size: int, checkpoint: Path | None
+) -> None:
+    """Re-derive is_transfer / is_cash_withdrawal with today's heuristics."""
+    after_user = None
+    if checkpoint is not None and checkpoint.exists() and user_id is None:
+        after_user = UUID(checkpoint.read_text().strip())
+        click.echo(f"Resuming after user {after_user}.")
+
+    def finished(user: UUID) -> None:
+        # A dry run moves nothing, so there is nothing to resume past.
+        if checkpoint is not None and not dry_run:
+            checkpoint.write_text(f"{user}\n")
+
+    result = _container().backfill_flags.execute(
+        user_id=user_id,
+        dry_run=dry_run,
+        batch_size=batch_size,
+        after_user=after_user,
+        on_user=finished,
+    )
+
+    verb = "would change" if dry_run else "changed"
+    click.echo(
+        f"{result.users} user(s), {result.scanned} row(s) scanned, {result.changed} {verb} "
+        f"({result.transfers_flipped} transfer, {result.withdrawals_flipped} withdrawal flag(s)) "
+        f"in {result.seconds:.1f}s, {result.rows_per_second:,.0f} rows/s."
+    )
+    for currency, delta in sorted(result.spend_delta.items()):
+        click.echo(f"  spend {verb}: {delta:+} {currency}")
+    for currency, delta in sorted(result.cash_withdrawn_delta.items()):
+        click.echo(f"  cash withdrawn {verb}: {delta:+} {currency}")
+    if checkpoint is not None and not dry_run and user_id is None:
+        # Finished: the next run starts from the beginning again.
+        checkpoint.unlink(missing_ok=True)
+
+
+@click.command("rebuild-cube")
+@click.option("--user", "user_id", type=click.UUID, help="Only this user (default: everyone).")
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=4,
+    show_default=True,
+    help="Users read from the database at once. DuckDB is written by one.",
+)
+@click.option("--batch-size", type=click.IntRange(min=1), default=1000, show_default=True)
+@click.option(
+    "--checkpoint",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="File holding the last finished user. An existing one resumes after it.",
+)
+@with_appcontext
+def rebuild_cube_command(
+    user_id: UUID | None, workers: int, batch_size: int, checkpoint: Path | None
+) -> None:
+    """Re-derive the cube from the relational tables, several users at a time."""
+    after_user = None
+    if checkpoint is not None and checkpoint.exists() and user_id is None:
+        after_user = UUID(checkpoint.read_text().strip())
+        click.echo(f"Resuming after user {after_user}.")
+
+    def finished(progress) -> None:
+        if checkpoint is not None:
+            checkpoint.write_text(f"{progress.last_user}\n")
+        click.echo(
+            f"  [{progress.users}/{progress.users_total}] {progress.last_user}: "
+            f"{progress.rows} row(s) so far, {progress.rows_per_second:,.0f} rows/s"
+        )
+
+    result = _container().rebuild_fleet.execute(
+        user_id=user_id,
+        workers=workers,
+        batch_size=batch_size,
+        after_user=after_user,
+        on_user=finished,
+    )
+
+    click.echo(
+        f"{result.users} user(s), {result.rows} fact row(s) rebuilt "
+        f"in {result.seconds:.1f}s, {result.rows_per_second:,.0f} rows/s."
+    )
+    if checkpoint is not None and user_id is None:
+        # Finished: the next run starts from the beginning again.
+        checkpoint.unlink(missing_ok=True)
+
+
+@click.command("sync-cube")
+@click.option("--user", "user_id", type=click.UUID, help="Only this user (default: everyone).")
+@click.option("--batch-size", type=click.IntRange(min=1), default=1000, show_default=True)
+@with_appcontext
+def sync_cube_command(user_id: UUID | None, batch_size: int) -> None:
+    """Apply the change log to the cube: only what changed since each user's mark."""
+    result = _container().sync_cube.execute(user_id=user_id, batch_size=batch_size)
+    click.echo(
+        f"{result.users} user(s) synced to change {result.horizon}: {result.rebuilt} rebuilt, "
+        f"{result.applied} transaction(s) applied ({result.deleted} deleted), "
+        f"{result.pruned} change-log row(s) pruned, in {result.seconds:.1f}s."
+    )
+
+
+@click.command("export-cube")
+@click.argument("directory", type=click.Path(file_okay=False, path_type=Path))
+@click.option("--user", "user_id", type=click.UUID, help="Only this user (default: everyone).")
+@with_appcontext
+def export_cube_command(directory: Path, user_id: UUID | None) -> None:
+    """Write the cube's tables to DIRECTORY as Parquet, one file per table."""
+    result = _container().export_cube.execute(directory, user_id=user_id)
+    for table, rows in result.rows.items():
+        click.echo(f"  {result.path(table)}: {rows} row(s)")
+    click.echo(f"{sum(result.rows.values())} row(s) in {result.seconds:.1f}s.")
+
+
+def register_commands(app: Flask) -> None:
+    app.cli.add_command(backfill_flags_command)
+    app.cli.add_command(rebuild_cube_command)
+    app.cli.add_command(sync_cube_command)
+    app.cli.add_command(export_cube_command)
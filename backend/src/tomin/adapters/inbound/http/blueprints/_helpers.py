@@ -1,8 +1,13 @@
 from __future__ import annotations
 
+import shutil
 from datetime import date
+from pathlib import Path
 
-from flask import request
+from flask import Response, request
+
+#: Read size when streaming a file out.
+_FILE_CHUNK = 64 * 1024
 
 
 def query_date(name: str) -> date | None:
@@ -17,3 +22,37 @@ def query_int(name: str, default: int) -> int:
         return int(request.args.get(name, default))
     except (TypeError, ValueError):
         return default
+
+
+def query_bool(name: str, default: bool) -> bool:
+    value = request.args.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() not in {"0", "false", "no", "off", ""}
+
+
+def send_and_remove(path: Path, scratch: Path, *, mimetype: str, download_name: str) -> Response:
+    """Stream ``path`` to the client, then delete the ``scratch`` directory it is in.
+
+    For a file written only to be downloaded once. The directory goes when the
+    response is closed, whether the client read it all, hung up midway, or
+    never asked for the body at all (``HEAD``).
+    """
+
+    def chunks():
+        with path.open("rb") as f:
+            while chunk := f.read(_FILE_CHUNK):
+                yield chunk
+
+    response = Response(
+        chunks(),
+        mimetype=mimetype,
+        headers={
+            "Content-Disposition": f"attachment; filename={download_name}",
+            "Content-Length": str(path.stat().st_size),
+        },
+    )
+    # Not a `finally` in the generator: closing one that never started runs
+    # nothing, and a body that is never iterated is never started.
+    response.call_on_close(lambda: shutil.rmtree(scratch, ignore_errors=True))
+    return response
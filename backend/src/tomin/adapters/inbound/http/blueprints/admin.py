@@ -1,8 +1,16 @@
 from __future__ import annotations
 
+import shutil
+import tempfile
+import zipfile
+from dataclasses import asdict
+from pathlib import Path
+
 from flask import Blueprint, jsonify
 
 from ..auth import current_user_id, get_container
+from ..serialization import flag_backfill_json
+from ._helpers import query_bool, send_and_remove
 
 admin_bp = Blueprint("admin", __name__, url_prefix="/api/admin")
 
@@ -17,3 +25,77 @@ def rebuild_cube():
     """
     result = get_container().rebuild_cube.execute(user_id=current_user_id())
     return jsonify(user_id=str(result.user_id), rows=result.rows)
+
+
+@admin_bp.post("/cube/sync")
+def sync_cube():
+    """Catch the current user's cube up from the change log.
+
+    Only the transactions written since the cube's mark are re-read; with no
+    mark yet, this is a rebuild. Scoped to the caller like the rebuild;
+    everyone's, with the log pruned after, is ``flask sync-cube``.
+    """
+    result = get_container().sync_cube.execute(user_id=current_user_id())
+    return jsonify(asdict(result))
+
+
+@admin_bp.get("/cube/export")
+def export_cube():
+    """The current user's cube tables, one Parquet file each, in a zip.
+
+    Facts, tag bridge and both dimensions: enough to read the facts with
+    their labels, or to seed another environment's cube. Scoped to the
+    caller like the rebuild; everyone's is ``flask export-cube``.
+    """
+    scratch = Path(tempfile.mkdtemp(prefix="tomin-export-"))
+    try:
+        result = get_container().export_cube.execute(scratch, user_id=current_user_id())
+        archive = scratch / "cube.zip"
+        # Stored, not deflated: Parquet pages are compressed already.
+        with zipfile.ZipFile(archive, "w", zipfile.ZIP_STORED) as zf:
+            for table in result.rows:
+                zf.write(result.path(table), f"{table}.parquet")
+    except BaseException:
+        shutil.rmtree(scratch, ignore_errors=True)
+        raise
+    return send_and_remove(
+        archive, scratch, mimetype="application/zip", download_name="cube-parquet.zip"
+    )
+
+
+@admin_bp.post("/transactions/recategorize")
+def recategorize_transactions():
+    """Re-run the categorizer over the current user's ``auto`` transactions.
+
+    Scoped to the caller for the same reason as the rebuild above. Rows the
+    user categorized themselves are left alone.
+    """
+    result = get_container().recategorize.execute(user_id=current_user_id())
+    return jsonify(
+        scanned=result.scanned,
+        changed=result.changed,
+        seconds=round(result.seconds, 3),
+        rows_per_second=round(result.rows_per_second),
+    )
+
+
+@admin_bp.post("/transactions/backfill-flags")
+def backfill_flags():
+    """Re-derive the current user's transfer / withdrawal flags.
+
+    ``?dry_run=true`` only reports what would move. Everyone's history is
+    the ``flask backfill-flags`` command's job, not this endpoint's.
+    """
+    result = get_container().backfill_flags.execute(
+        user_id=current_user_id(), dry_run=query_bool("dry_run", False)
+    )
+    return jsonify(flag_backfill_json(result))
+
+
+@admin_bp.get("/metrics/cache")
+def metric_cache_stats():
+    """Hit/miss counters of the metric result cache, for scraping.
+
+    Process-wide counts only -- no keys, so nothing about any user's queries.
+    """
+    return jsonify(asdict(get_container().metric_engine.stats()))
@@ -6,11 +6,17 @@ from flask import Blueprint, jsonify, request
 
 from .....domain.services.forecasting import SimulationInput
 from ..auth import current_user_id, get_container
-from ..serialization import forecast_point_json
+from ..serialization import forecast_band_json, forecast_point_json
 from ._helpers import query_int
 
 forecast_bp = Blueprint("forecast", __name__, url_prefix="/api/forecast")
 
+#: Enough for smooth percentiles; past this a request only buys CPU time.
+MAX_PATHS = 20000
+#: Fifty years. Memory is several floats per month per path, so the horizon
+#: needs a ceiling as much as the path count does.
+MAX_MONTHS = 600
+
 
 @forecast_bp.get("")
 def get_forecast():
@@ -21,6 +27,16 @@ def get_forecast():
     return jsonify(points=[forecast_point_json(p) for p in points])
 
 
+@forecast_bp.get("/bands")
+def get_forecast_bands():
+    """Percentile bands (p10/p50/p90) of the default forecast's baseline."""
+    user_id = current_user_id()
+    paths = min(query_int("paths", 2000), MAX_PATHS)
+    months = min(query_int("months", 12), MAX_MONTHS)
+    bands = get_container().get_forecast_bands.execute(user_id=user_id, months=months, paths=paths)
+    return jsonify(paths=paths, points=[forecast_band_json(b) for b in bands])
+
+
 @forecast_bp.post("/simulate")
 def simulate():
     """Run the interactive Forecast Simulator with client-supplied sliders."""
@@ -2,10 +2,10 @@ from __future__ import annotations
 
 from uuid import UUID
 
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, jsonify, request, url_for
 
 from ..auth import current_user_id, get_container
-from ..serialization import statement_json
+from ..serialization import ingestion_json, statement_json
 
 statements_bp = Blueprint("statements", __name__, url_prefix="/api/statements")
 
@@ -20,9 +20,12 @@ def list_statements():
 
 @statements_bp.post("")
 def upload_statement():
-    """Accept a transient statement upload (PDF or SAT XML) and process it.
+    """Accept a transient statement upload (PDF or SAT XML) for processing.
 
-    The raw file is parsed then discarded; only structured data is stored.
+    Duplicate and unsupported files are refused here (409/415). Anything else
+    is answered with 202 and a job id, and parsed in the background; poll the
+    ``Location`` for the outcome. The raw file is parsed then discarded; only
+    structured data is stored.
     """
     user_id = current_user_id()
     if "file" not in request.files:
@@ -33,20 +36,23 @@ def upload_statement():
     if not data:
         return jsonify(error="Empty file"), 400
 
-    result = get_container().process_file.execute(
+    status = get_container().ingest_statement.submit(
         user_id=user_id,
         data=data,
         filename=upload.filename or "upload",
         mime=upload.mimetype,
     )
-    return (
-        jsonify(
-            statement_id=str(result.statement_id),
-            template=result.template,
-            transactions_created=result.transactions_created,
-        ),
-        201,
+    location = url_for("statements.upload_status", job_id=str(status.job_id))
+    return jsonify(ingestion_json(status)), 202, {"Location": location}
+
+
+@statements_bp.get("/jobs/<job_id>")
+def upload_status(job_id: str):
+    """Where an upload is: ``processing``, ``processed`` (with counts) or ``failed``."""
+    status = get_container().ingest_statement.status(
+        user_id=current_user_id(), job_id=UUID(job_id)
     )
+    return jsonify(ingestion_json(status))
 
 
 @statements_bp.delete("/<statement_id>")
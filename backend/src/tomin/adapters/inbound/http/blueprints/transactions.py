@@ -2,14 +2,17 @@ from __future__ import annotations
 
 import csv
 import io
+import shutil
+import tempfile
+from pathlib import Path
 from uuid import UUID
 
-from flask import Blueprint, Response, jsonify, request
+from flask import Blueprint, Response, jsonify, request, stream_with_context
 
 from .....application.use_cases.update_transaction import UNSET
 from ..auth import current_user_id, get_container
 from ..serialization import transaction_json
-from ._helpers import query_date, query_int
+from ._helpers import query_bool, query_date, query_int, send_and_remove
 
 transactions_bp = Blueprint("transactions", __name__, url_prefix="/api/transactions")
 
@@ -26,12 +29,22 @@ def _filters():
 
 @transactions_bp.get("")
 def list_transactions():
+    """A page of transactions, newest first.
+
+    Page with ``cursor`` (the previous page's ``next_cursor``) or with
+    ``offset``. ``total`` is counted on offset pages and skipped on cursor
+    pages unless asked for with ``total=true``: a scrolling client keeps the
+    one it got with the first page.
+    """
     user_id = current_user_id()
     filters = _filters()
+    cursor = request.args.get("cursor") or None
     page = get_container().list_transactions.execute(
         user_id=user_id,
         limit=query_int("limit", 100),
         offset=query_int("offset", 0),
+        cursor=cursor,
+        with_total=query_bool("total", cursor is None),
         **filters,
     )
     return jsonify(
@@ -39,6 +52,7 @@ def list_transactions():
         total=page.total,
         limit=page.limit,
         offset=page.offset,
+        next_cursor=page.next_cursor,
     )
 
 
@@ -107,24 +121,74 @@ def set_transaction_tags(transaction_id: str):
     )
 
 
+#: Rows per chunk of the streamed CSV, and per page read for it: few enough
+#: writes to the socket, small enough that a chunk is never more than a few
+#: dozen kilobytes.
+_CSV_CHUNK_ROWS = 500
+
+
 @transactions_bp.get("/export.csv")
 def export_csv():
+    """Every transaction matching the list filters, newest first, as CSV.
+
+    Streamed: the header goes out before the first query runs and rows follow
+    a page at a time, so memory stays flat however long the history is, and a
+    slow client holds no read open on the database between pages.
+    """
     user_id = current_user_id()
-    filters = _filters()
-    page = get_container().list_transactions.execute(
-        user_id=user_id, limit=100000, offset=0, **filters
+    rows = get_container().list_transactions.stream(
+        user_id=user_id, page_size=_CSV_CHUNK_ROWS, **_filters()
     )
 
-    buffer = io.StringIO()
-    writer = csv.writer(buffer)
-    writer.writerow(["date", "description", "amount", "currency", "type", "status"])
-    for t in page.items:
-        writer.writerow(
-            [t.tx_date.isoformat(), t.description, t.amount, t.currency,
-             t.tx_type.value, t.status.value]
-        )
+    def generate():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(["date", "description", "amount", "currency", "type", "status"])
+        yield _drain(buffer)
+        for count, t in enumerate(rows, start=1):
+            writer.writerow(
+                [t.tx_date.isoformat(), t.description, t.amount, t.currency,
+                 t.tx_type.value, t.status.value]
+            )
+            if count % _CSV_CHUNK_ROWS == 0:
+                yield _drain(buffer)
+        yield _drain(buffer)
+
     return Response(
-        buffer.getvalue(),
+        stream_with_context(generate()),
         mimetype="text/csv",
         headers={"Content-Disposition": "attachment; filename=transactions.csv"},
     )
+
+
+@transactions_bp.get("/export.parquet")
+def export_parquet():
+    """The caller's ``fact_transactions`` rows as one Parquet file.
+
+    Written by the cube itself rather than row by row, and unfiltered: this
+    is the bulk copy for offline analysis, not the list on screen. Tags come
+    along inline in ``tag_ids``; their labels and the category names are in
+    ``GET /api/admin/cube/export``.
+    """
+    user_id = current_user_id()
+    scratch = Path(tempfile.mkdtemp(prefix="tomin-export-"))
+    try:
+        result = get_container().export_cube.execute(
+            scratch, user_id=user_id, tables=["fact_transactions"]
+        )
+    except BaseException:
+        shutil.rmtree(scratch, ignore_errors=True)
+        raise
+    return send_and_remove(
+        result.path("fact_transactions"),
+        scratch,
+        mimetype="application/vnd.apache.parquet",
+        download_name="transactions.parquet",
+    )
+
+
+def _drain(buffer: io.StringIO) -> str:
+    chunk = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    return chunk
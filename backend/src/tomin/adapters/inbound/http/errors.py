@@ -5,6 +5,7 @@ import logging
 from flask import Flask, jsonify
 from werkzeug.exceptions import HTTPException
 
+from ....application.use_cases.ingest_statement import IngestionJobNotFoundError
 from ....application.use_cases.process_file import (
     DuplicateStatementError,
     UnsupportedFileError,
@@ -34,6 +35,10 @@ def register_error_handlers(app: Flask) -> None:
     def _statement_missing(err: StatementNotFoundError):
         return jsonify(error="Statement not found", detail=str(err)), 404
 
+    @app.errorhandler(IngestionJobNotFoundError)
+    def _job_missing(err: IngestionJobNotFoundError):
+        return jsonify(error="Upload job not found", detail=str(err)), 404
+
     @app.errorhandler(TransactionNotFoundError)
     def _transaction_missing(err: TransactionNotFoundError):
         return jsonify(error="Transaction not found", detail=str(err)), 404
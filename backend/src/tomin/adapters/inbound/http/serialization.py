@@ -5,6 +5,8 @@ from decimal import Decimal
 
 from ....application.dtos.analytics import CategorySpend, MonthlyPoint, SpendingSummary
 from ....application.dtos.metrics import MetricError, MetricResult
+from ....application.use_cases.backfill_flags import FlagBackfillResult
+from ....application.use_cases.ingest_statement import IngestionStatus
 from ....domain.entities import (
     Dashboard,
     DashboardWidget,
@@ -14,7 +16,7 @@ from ....domain.entities import (
     Transaction,
 )
 from ....domain.metrics.spec import MetricSpec
-from ....domain.services.forecasting import ForecastPoint
+from ....domain.services.forecasting import ForecastBand, ForecastPoint
 
 
 def _num(value: Decimal | None) -> float:
@@ -68,6 +70,32 @@ def statement_json(s: Statement) -> dict:
     }
 
 
+def ingestion_json(s: IngestionStatus) -> dict:
+    return {
+        "job_id": str(s.job_id),
+        "statement_id": str(s.statement_id),
+        "status": s.status.value,
+        "template": s.template,
+        "transactions_created": s.transactions_created,
+        "error": s.error,
+    }
+
+
+def flag_backfill_json(r: FlagBackfillResult) -> dict:
+    # Money as strings, as in metric results: a delta is an exact amount.
+    return {
+        "dry_run": r.dry_run,
+        "scanned": r.scanned,
+        "changed": r.changed,
+        "transfers_flipped": r.transfers_flipped,
+        "withdrawals_flipped": r.withdrawals_flipped,
+        "spend_delta": {cur: str(v) for cur, v in r.spend_delta.items()},
+        "cash_withdrawn_delta": {cur: str(v) for cur, v in r.cash_withdrawn_delta.items()},
+        "seconds": round(r.seconds, 3),
+        "rows_per_second": round(r.rows_per_second),
+    }
+
+
 def category_spend_json(c: CategorySpend) -> dict:
     return {
         "category_id": c.category_id,
@@ -99,6 +127,13 @@ def forecast_point_json(p: ForecastPoint) -> dict:
     }
 
 
+def forecast_band_json(b: ForecastBand) -> dict:
+    return {
+        "month_offset": b.month_offset,
+        **{f"p{p}": _num(value) for p, value in b.percentiles.items()},
+    }
+
+
 def metric_spec_json(spec: MetricSpec) -> dict:
     """The catalog as data: everything the widget picker needs before querying.
 
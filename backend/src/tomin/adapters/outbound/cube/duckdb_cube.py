@@ -1,9 +1,15 @@
 from __future__ import annotations
 
+import json
+import queue
 import threading
-from collections.abc import Iterable
+from collections import deque
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
 from datetime import date
 from decimal import Decimal
+from itertools import islice
+from pathlib import Path
 from uuid import UUID
 
 import duckdb
@@ -14,16 +20,113 @@ from ....application.dtos.analytics import (
     SpendingSummary,
 )
 from ....domain.entities import Category, Tag, Transaction
+from ....domain.services.categorization import normalize
+from ....domain.services.recurrence import RecurrenceStats
 
 #: Aggregates are scoped to a single currency. Everything the app ingests today
 #: is Mexican, so MXN is the default rather than a required argument.
 DEFAULT_CURRENCY = "MXN"
 
-_UPSERT_FACT = (
-    "INSERT OR REPLACE INTO fact_transactions VALUES "
-    "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+#: ``fact_transactions`` columns in table order, as the JSON structure a staged
+#: batch is parsed into. A batch crosses the Python/DuckDB boundary as **one**
+#: JSON document that DuckDB's vectorised reader turns into typed columns: a
+#: bound list parameter per column looks columnar but is converted element by
+#: element on the Python side, which costs more than the inserts it replaces.
+#: Arrow would do the same job, at the price of a dependency the cube does not
+#: otherwise need.
+_FACT_SHAPE: dict[str, str | list[str]] = {
+    "tx_id": "VARCHAR",
+    "user_id": "VARCHAR",
+    "tx_date": "DATE",
+    "amount": "DECIMAL(14,2)",
+    "currency": "VARCHAR",
+    "tx_type": "VARCHAR",
+    "category_id": "VARCHAR",
+    "merchant_id": "VARCHAR",
+    "description": "VARCHAR",
+    "excluded_from_stats": "BOOLEAN",
+    "is_transfer": "BOOLEAN",
+    "is_cash_withdrawal": "BOOLEAN",
+    "tag_ids": ["VARCHAR"],
+    "description_key": "VARCHAR",
+}
+
+_STAGE_FACTS = (
+    "CREATE OR REPLACE TEMP TABLE stage_facts AS SELECT r.* FROM "
+    f"(SELECT unnest(from_json(?, '{json.dumps([_FACT_SHAPE])}')) AS r)"
 )
 
+#: The one materialisation. Every column the grain is made of is something a
+#: metric can group or filter by without reaching for the fact row: the month,
+#: the category, the currency a figure is scoped to, the direction, and the
+#: three booleans the measures' default filters read. ``row_count`` keeps
+#: ``meta.source_txn_count`` honest when a query is answered from here.
+ROLLUP_TABLE = "rollup_monthly_category"
+
+_ROLLUP_GROUP = (
+    "f.user_id, CAST(date_trunc('month', f.tx_date) AS DATE), f.category_id, f.currency, "
+    "f.tx_type, f.excluded_from_stats, f.is_transfer, f.is_cash_withdrawal"
+)
+
+#: Re-aggregates the facts of every (user, month) listed in ``stage_months``.
+_ROLLUP_FROM_STAGED_MONTHS = (
+    f"INSERT INTO {ROLLUP_TABLE} "
+    f"SELECT {_ROLLUP_GROUP}, SUM(f.amount), COUNT(*) FROM fact_transactions f "
+    "WHERE EXISTS (SELECT 1 FROM stage_months m WHERE m.user_id = f.user_id "
+    "AND m.month = CAST(date_trunc('month', f.tx_date) AS DATE)) "
+    f"GROUP BY {_ROLLUP_GROUP}"
+)
+
+#: Recurrence, kept like the rollup: per (user, normalized description), the
+#: aggregates :class:`RecurrenceService` judges a group on. Expenses only, but
+#: every key -- a one-off is one occurrence away from being recurring.
+RECURRENCE_TABLE = "recurrence_index"
+
+_RECURRENCE_AGGREGATE = (
+    f"INSERT INTO {RECURRENCE_TABLE} "
+    "SELECT f.user_id, f.description_key, COUNT(*), SUM(f.amount), MIN(f.tx_date), "
+    "MAX(f.tx_date) FROM fact_transactions f "
+    "WHERE f.tx_type = 'expense' AND f.description_key <> '' "
+)
+
+#: Re-aggregates the facts of every (user, key) listed in ``stage_keys``.
+_RECURRENCE_FROM_STAGED_KEYS = (
+    f"{_RECURRENCE_AGGREGATE}AND EXISTS (SELECT 1 FROM stage_keys k "
+    "WHERE k.user_id = f.user_id AND k.description_key = f.description_key) "
+    "GROUP BY f.user_id, f.description_key"
+)
+
+#: Rows per staged batch during a rebuild. Bounds how much of a long history is
+#: held in Python at once; the set-based merge cost is per batch, not per row.
+_BULK_BATCH = 5000
+
+#: What an export writes, one Parquet file per table: the facts, the tag bridge
+#: and both dimensions -- everything needed to read the facts with their labels
+#: or to load them into another cube. The rollup and the recurrence index are
+#: left out: they are derived from the facts, and a load re-derives them.
+EXPORT_TABLES = ("fact_transactions", "bridge_transaction_tag", "dim_category", "dim_tag")
+
+#: Per table, the rows an export of one user takes. Without a user, all of them.
+_EXPORT_SCOPED = {
+    "fact_transactions": "SELECT * FROM fact_transactions WHERE user_id = ? "
+    "ORDER BY tx_date, tx_id",
+    "bridge_transaction_tag": "SELECT b.* FROM bridge_transaction_tag b "
+    "JOIN fact_transactions f ON f.tx_id = b.tx_id WHERE f.user_id = ? ORDER BY b.tx_id, b.tag_id",
+    # Categories are shared by every user, so the whole dimension goes along.
+    "dim_category": "SELECT * FROM dim_category ORDER BY category_id",
+    "dim_tag": "SELECT * FROM dim_tag WHERE tag_id IN (SELECT b.tag_id FROM "
+    "bridge_transaction_tag b JOIN fact_transactions f ON f.tx_id = b.tx_id "
+    "WHERE f.user_id = ?) ORDER BY tag_id",
+}
+
+#: Per user, the change-log ``seq`` the cube has caught up to; see
+#: :meth:`DuckDbCube.sync_mark`.
+SYNC_TABLE = "sync_marks"
+
+#: How many of a user's latest writes :meth:`DuckDbCube.months_changed` can
+#: account for. A reader further behind than that reloads in full.
+_MONTH_LOG = 64
+
 #: Bump whenever the cube table shapes change. The cube is derived state with
 #: no migrations: an on-disk file created by an older build simply gets its
 #: tables dropped and recreated, then repopulated from the relational store.
@@ -38,13 +141,19 @@ class DuckDbCube:
     Structured transactions are streamed into ``fact_transactions`` as they are
     processed, and every read aggregates that one fact table directly.
 
-    There are deliberately **no rollup tables**. The previous ``rollup_monthly``
-    and ``rollup_category`` were written on every upload and every delete and
-    then never read by anything; ``refresh_rollups`` also ignored its
-    ``user_id`` argument and rebuilt every user's rollups each time. They have
-    been deleted rather than fixed. If aggregate reads ever become slow enough
-    to matter, a materialisation should be added back with a reader that
-    actually consults it.
+    There is exactly **one rollup table**, :data:`ROLLUP_TABLE`, and it exists
+    because something reads it: the metric engine's planner answers every query
+    whose axes and filters fit its grain from there instead of from the facts.
+    The previous ``rollup_monthly`` and ``rollup_category`` were written on
+    every upload and every delete and then never read by anything, and
+    ``refresh_rollups`` ignored its ``user_id``; they stay deleted. This one is
+    maintained inside the same write that changes the facts, and only for the
+    (user, month) partitions that write touched.
+
+    :data:`RECURRENCE_TABLE` is kept the same way, per (user, description
+    key) instead of per month, for :meth:`recurrence_stats`. Every write that
+    moves a fact -- ingest, an edit, a statement deletion, a backfill --
+    keeps it in step, in the same transaction.
 
     The cube is derived state. :meth:`rebuild_for_user` reconstructs it from
     the relational tables, which is what makes it safe to throw away.
@@ -53,12 +162,34 @@ class DuckDbCube:
     first use rather than in ``__init__``. Importing the app therefore does not
     take the file lock -- which matters under the Flask dev reloader, where the
     parent process imports the app but never serves a request.
+
+    **One writer, many readers.** Writes go through the one connection this
+    class opens, under ``self._lock``, and each write is a single DuckDB
+    transaction. Reads never take that lock: they lease a cursor (a second
+    handle onto the same database, see :meth:`_reading`) from a small pool and
+    run in parallel -- with each other and with a write in flight. DuckDB's
+    MVCC gives every read a committed snapshot, so a read during a rebuild sees
+    the user's old facts or the new ones, never a half-written mix.
     """
 
-    def __init__(self, path: str = ":memory:") -> None:
+    def __init__(self, path: str = ":memory:", readers: int = 4) -> None:
         self._path = path
         self._lock = threading.Lock()
         self._con: duckdb.DuckDBPyConnection | None = None
+        #: Idle read cursors. Created on demand, never more than ``readers``.
+        self._idle_readers: queue.SimpleQueue[duckdb.DuckDBPyConnection] = queue.SimpleQueue()
+        self._reader_slots = threading.BoundedSemaphore(readers)
+        #: Data versions, see :meth:`data_version`. ``_touched`` collects what
+        #: the write in flight changed: user ids, or ``None`` for everyone.
+        self._epoch = 0
+        self._versions: dict[str, int] = {}
+        self._touched: set[str] | None = set()
+        #: Per user, ``(version, months)`` for the latest writes: the months
+        #: whose facts that write changed, ``None`` when it did not say. The
+        #: write in flight collects its months in ``_touched_months``.
+        self._month_log: dict[str, deque[tuple[int, frozenset[str] | None]]] = {}
+        self._month_log_lock = threading.Lock()
+        self._touched_months: dict[str, set[str]] = {}
 
     @property
     def _connection(self) -> duckdb.DuckDBPyConnection:
@@ -68,6 +199,71 @@ class DuckDbCube:
             self._create_schema()
         return self._con
 
+    @contextmanager
+    def _writing(self) -> Iterator[duckdb.DuckDBPyConnection]:
+        """The writer connection, locked, inside one transaction.
+
+        A write is several statements (facts, bridge, rollup); committing them
+        together is what lets readers skip the lock without ever seeing facts
+        whose rollup has not caught up.
+        """
+        with self._lock:
+            con = self._connection
+            self._touched = set()
+            self._touched_months = {}
+            con.begin()
+            try:
+                yield con
+            except BaseException:
+                con.rollback()
+                raise
+            con.commit()
+            # Only after the commit: a reader that saw the new version must not
+            # be able to read the old snapshot under it.
+            if self._touched is None:
+                self._epoch += 1
+                return
+            with self._month_log_lock:
+                for user in self._touched:
+                    version = self._versions.get(user, 0) + 1
+                    self._versions[user] = version
+                    months = self._touched_months.get(user)
+                    self._month_log.setdefault(user, deque(maxlen=_MONTH_LOG)).append(
+                        (version, frozenset(months) if months is not None else None)
+                    )
+
+    def _touch(self, user_ids: Iterable[object] | None) -> None:
+        """Record that the write in flight changes these users' answers.
+
+        ``None`` means every user's: a dimension label shows up in all of them.
+        """
+        if user_ids is None:
+            self._touched = None
+        elif self._touched is not None:
+            self._touched.update(str(u) for u in user_ids)
+
+    @contextmanager
+    def _reading(self) -> Iterator[duckdb.DuckDBPyConnection]:
+        """Lease a read cursor for the duration of one read.
+
+        ``connection.cursor()`` is DuckDB's per-thread handle onto the same
+        database, so an in-memory cube is shared too. Pooled rather than kept
+        per thread because the dev server starts a thread per request, and a
+        cursor per dead thread is a leak. The semaphore bounds how many reads
+        run at once; past that, a read waits for a cursor rather than for every
+        other user's dashboard.
+        """
+        with self._reader_slots:
+            try:
+                cursor = self._idle_readers.get_nowait()
+            except queue.Empty:
+                with self._lock:
+                    cursor = self._connection.cursor()
+            try:
+                yield cursor
+            finally:
+                self._idle_readers.put(cursor)
+
     def _create_schema(self) -> None:
         assert self._con is not None
         self._con.execute(
@@ -91,6 +287,10 @@ class DuckDbCube:
             # repopulates (upload, or POST /api/admin/cube/rebuild) — an empty
             # correct answer beats a binder error on every metric.
             self._con.execute("DROP TABLE IF EXISTS fact_transactions;")
+            self._con.execute(f"DROP TABLE IF EXISTS {ROLLUP_TABLE};")
+            self._con.execute(f"DROP TABLE IF EXISTS {RECURRENCE_TABLE};")
+            # The marks vouch for facts that are about to be gone.
+            self._con.execute(f"DROP TABLE IF EXISTS {SYNC_TABLE};")
             self._con.execute("DROP TABLE IF EXISTS bridge_transaction_tag;")
             self._con.execute("DROP TABLE IF EXISTS dim_tag;")
             self._con.execute("DROP TABLE IF EXISTS dim_category;")
@@ -113,10 +313,12 @@ class DuckDbCube:
                 excluded_from_stats BOOLEAN,
                 is_transfer BOOLEAN,
                 is_cash_withdrawal BOOLEAN,
-                tag_ids VARCHAR[]
+                tag_ids VARCHAR[],
+                description_key VARCHAR
             );
             """
         )
+        self._add_description_key()
         self._con.execute(
             "CREATE TABLE IF NOT EXISTS dim_category "
             "(category_id VARCHAR PRIMARY KEY, name VARCHAR);"
@@ -133,15 +335,104 @@ class DuckDbCube:
             "CREATE TABLE IF NOT EXISTS bridge_transaction_tag "
             "(tx_id VARCHAR, tag_id VARCHAR, PRIMARY KEY (tx_id, tag_id));"
         )
+        has_rollup = (
+            self._con.execute(
+                "SELECT count(*) FROM information_schema.tables WHERE table_name = ?",
+                [ROLLUP_TABLE],
+            ).fetchone()[0]
+            > 0
+        )
+        self._con.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {ROLLUP_TABLE} (
+                user_id VARCHAR,
+                month DATE,
+                category_id VARCHAR,
+                currency VARCHAR,
+                tx_type VARCHAR,
+                excluded_from_stats BOOLEAN,
+                is_transfer BOOLEAN,
+                is_cash_withdrawal BOOLEAN,
+                amount DECIMAL(18,2),
+                row_count BIGINT
+            );
+            """
+        )
+        if not has_rollup:
+            # A file from before the rollup existed still has valid facts.
+            # Deriving the rollup from them beats a schema-version bump, which
+            # would throw every user's facts away to add a table.
+            self._con.execute(
+                f"INSERT INTO {ROLLUP_TABLE} "
+                f"SELECT {_ROLLUP_GROUP}, SUM(f.amount), COUNT(*) "
+                f"FROM fact_transactions f GROUP BY {_ROLLUP_GROUP}"
+            )
+        self._create_recurrence_index()
+        # No derivation for a file from before the marks: an unmarked user is
+        # rebuilt in full on their first sync, which is the safe answer.
+        self._con.execute(
+            f"CREATE TABLE IF NOT EXISTS {SYNC_TABLE} (user_id VARCHAR PRIMARY KEY, seq BIGINT);"
+        )
+
+    def _create_recurrence_index(self) -> None:
+        assert self._con is not None
+        has_index = (
+            self._con.execute(
+                "SELECT count(*) FROM information_schema.tables WHERE table_name = ?",
+                [RECURRENCE_TABLE],
+            ).fetchone()[0]
+            > 0
+        )
+        self._con.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {RECURRENCE_TABLE} (
+                user_id VARCHAR,
+                description_key VARCHAR,
+                occurrences BIGINT,
+                total_amount DECIMAL(18,2),
+                first_date DATE,
+                last_date DATE
+            );
+            """
+        )
+        if not has_index:
+            # Derived from the facts already there, as the rollup is.
+            self._con.execute(f"{_RECURRENCE_AGGREGATE}GROUP BY f.user_id, f.description_key")
+
+    def _add_description_key(self) -> None:
+        """Give a file from before ``description_key`` the column, filled in.
+
+        The key is :func:`normalize` -- Python, so that the cube groups rows
+        exactly as the domain does -- and DuckDB cannot call into Python here
+        without numpy. Keys are computed once per distinct description and
+        written back in one statement; like the rollup above, this beats a
+        schema-version bump that would throw every user's facts away.
+        """
+        assert self._con is not None
+        has_key = self._con.execute(
+            "SELECT count(*) FROM information_schema.columns "
+            "WHERE table_name = 'fact_transactions' AND column_name = 'description_key'"
+        ).fetchone()[0]
+        if has_key:
+            return
+        self._con.execute("ALTER TABLE fact_transactions ADD COLUMN description_key VARCHAR")
+        descriptions = self._con.execute(
+            "SELECT DISTINCT description FROM fact_transactions WHERE description IS NOT NULL"
+        ).fetchall()
+        if not descriptions:
+            return
+        keys = json.dumps([{"description": d, "key": normalize(d)} for (d,) in descriptions])
+        self._con.execute(
+            "UPDATE fact_transactions f SET description_key = k.key FROM "
+            "(SELECT r.* FROM (SELECT unnest(from_json(?, "
+            """'[{"description": "VARCHAR", "key": "VARCHAR"}]')) AS r)) k """
+            "WHERE f.description = k.description",
+            [keys],
+        )
 
     # --- writer ----------------------------------------------------------
     def sync_categories(self, categories: list[Category]) -> None:
-        with self._lock:
-            for c in categories:
-                self._connection.execute(
-                    "INSERT OR REPLACE INTO dim_category VALUES (?, ?)",
-                    [str(c.id), c.name],
-                )
+        self._sync_labels("dim_category", "category_id", [(str(c.id), c.name) for c in categories])
 
     def sync_tags(self, tags: list[Tag]) -> None:
         """Refresh the tag dimension so a tag breakdown has labels to show.
@@ -150,57 +441,194 @@ class DuckDbCube:
         left behind: a stale label attached to no facts is invisible, but a
         stale label reattached by an id reused elsewhere is a wrong answer.
         """
-        with self._lock:
-            for t in tags:
-                self._connection.execute(
-                    "INSERT OR REPLACE INTO dim_tag VALUES (?, ?)", [str(t.id), t.name]
-                )
+        self._sync_labels("dim_tag", "tag_id", [(str(t.id), t.name) for t in tags])
+
+    def _sync_labels(self, table: str, key: str, rows: list[tuple[str, str]]) -> None:
+        """Upsert ``(id, name)`` rows into a dimension, writing only the ones that differ.
+
+        A label change is everyone's new data version (see :meth:`_touch`), and
+        the rebuild and sync paths call this once per user with labels that are
+        almost always already there; re-asserting them must not retire every
+        user's cached answers.
+        """
+        if not rows:
+            return
+        with self._writing() as con:
+            current = dict(
+                con.execute(
+                    f"SELECT {key}, name FROM {table} WHERE {key} IN (SELECT unnest(?))",
+                    [[row_id for row_id, _ in rows]],
+                ).fetchall()
+            )
+            changed = [
+                (row_id, name)
+                for row_id, name in rows
+                if row_id not in current or current[row_id] != name
+            ]
+            if changed:
+                con.executemany(f"INSERT OR REPLACE INTO {table} VALUES (?, ?)", changed)
+                self._touch(None)
 
     def forget_tag(self, tag_id: UUID) -> None:
         """Drop a deleted tag's dimension row and every bridge row it owned."""
-        with self._lock:
-            self._connection.execute(
-                "DELETE FROM bridge_transaction_tag WHERE tag_id = ?", [str(tag_id)]
-            )
-            self._connection.execute("DELETE FROM dim_tag WHERE tag_id = ?", [str(tag_id)])
+        with self._writing() as con:
+            con.execute("DELETE FROM bridge_transaction_tag WHERE tag_id = ?", [str(tag_id)])
+            con.execute("DELETE FROM dim_tag WHERE tag_id = ?", [str(tag_id)])
+            self._touch(None)
 
     def upsert_transactions(self, transactions: list[Transaction]) -> None:
         if not transactions:
             return
-        with self._lock:
-            for t in transactions:
-                self._connection.execute(_UPSERT_FACT, self._fact_row(t))
-                self._write_bridge(t)
+        with self._writing():
+            self._merge(transactions)
+
+    def _merge(self, transactions: list[Transaction], *, refresh: bool = True) -> None:
+        """Stage a batch in one round trip and merge it with set-based statements.
 
-    def _write_bridge(self, t: Transaction) -> None:
-        """Re-derive one transaction's bridge rows. Callers hold ``self._lock``.
+        Callers are inside :meth:`_writing`. Facts are replaced by id and each staged
+        transaction's bridge rows are re-derived wholesale: delete-then-insert
+        rather than insert-if-missing, because the entity's tag list is the
+        whole truth for that transaction and untagging has to be able to remove
+        a row, not just fail to add one.
 
-        Delete-then-insert rather than insert-if-missing: the entity's tag list
-        is the whole truth for that transaction, so untagging has to be able to
-        remove a row, not just fail to add one.
+        The batch is keyed by id first, last write winning, so a transaction
+        that appears twice behaves as two consecutive upserts would.
+
+        The rollup is re-derived for every (user, month) the batch touches --
+        the months its rows move *from* as well as the ones they land in, so
+        an edit that changes a category or a date leaves no stale bucket. The
+        recurrence index likewise, for every (user, description key).
         """
-        assert self._con is not None
-        self._con.execute("DELETE FROM bridge_transaction_tag WHERE tx_id = ?", [str(t.id)])
-        for tag_id in t.tag_ids:
-            self._con.execute(
-                "INSERT OR REPLACE INTO bridge_transaction_tag VALUES (?, ?)",
-                [str(t.id), str(tag_id)],
+        batch = {t.id: t for t in transactions}
+        self._touch({t.user_id for t in batch.values()})
+        # `default=str` renders Decimal, date and UUID the way DuckDB casts them.
+        payload = json.dumps(
+            [dict(zip(_FACT_SHAPE, self._fact_row(t))) for t in batch.values()], default=str
+        )
+        con = self._connection
+        con.execute(_STAGE_FACTS, [payload])
+        if refresh:
+            con.execute(
+                "CREATE OR REPLACE TEMP TABLE stage_months AS "
+                "SELECT user_id, CAST(date_trunc('month', tx_date) AS DATE) AS month "
+                "FROM fact_transactions WHERE tx_id IN (SELECT tx_id FROM stage_facts) "
+                "UNION SELECT user_id, CAST(date_trunc('month', tx_date) AS DATE) "
+                "FROM stage_facts"
             )
+            con.execute(
+                "CREATE OR REPLACE TEMP TABLE stage_keys AS "
+                "SELECT user_id, description_key FROM fact_transactions "
+                "WHERE tx_id IN (SELECT tx_id FROM stage_facts) "
+                "UNION SELECT user_id, description_key FROM stage_facts"
+            )
+        con.execute(
+            "DELETE FROM bridge_transaction_tag WHERE tx_id IN (SELECT tx_id FROM stage_facts)"
+        )
+        con.execute("INSERT OR REPLACE INTO fact_transactions SELECT * FROM stage_facts")
+        con.execute(
+            "INSERT OR IGNORE INTO bridge_transaction_tag "
+            "SELECT tx_id, unnest(tag_ids) FROM stage_facts"
+        )
+        con.execute("DROP TABLE stage_facts")
+        if refresh:
+            self._refresh_staged()
+
+    def _refresh_staged(self) -> None:
+        """Recompute the rollup for ``stage_months`` and the index for ``stage_keys``.
+
+        Callers are inside :meth:`_writing`. A partition is recomputed from the facts
+        rather than patched by a delta: a (user, month) is a few hundred rows
+        at most, and recomputing it cannot drift from the facts the way
+        accumulated deltas can. The same goes for a key, and there a delta
+        could not even be applied: deleting a group's last occurrence leaves
+        no way to know the one before it.
+        """
+        con = self._connection
+        con.execute(
+            f"DELETE FROM {ROLLUP_TABLE} r WHERE EXISTS (SELECT 1 FROM stage_months m "
+            "WHERE m.user_id = r.user_id AND m.month = r.month)"
+        )
+        con.execute(_ROLLUP_FROM_STAGED_MONTHS)
+        for user, month in con.execute(
+            "SELECT user_id, strftime(month, '%Y-%m') FROM stage_months"
+        ).fetchall():
+            self._touched_months.setdefault(user, set()).add(month)
+        con.execute("DROP TABLE stage_months")
+        con.execute(
+            f"DELETE FROM {RECURRENCE_TABLE} r WHERE EXISTS (SELECT 1 FROM stage_keys k "
+            "WHERE k.user_id = r.user_id AND k.description_key = r.description_key)"
+        )
+        con.execute(_RECURRENCE_FROM_STAGED_KEYS)
+        con.execute("DROP TABLE stage_keys")
 
     def delete_transactions(self, tx_ids: list[UUID]) -> None:
         if not tx_ids:
             return
+        with self._writing():
+            self._delete(tx_ids)
+
+    def _delete(self, tx_ids: list[UUID]) -> None:
+        """Drop facts and bridge rows by id, re-deriving what they were counted in.
+
+        Callers are inside :meth:`_writing`.
+        """
         placeholders = ", ".join("?" * len(tx_ids))
         ids = [str(i) for i in tx_ids]
-        with self._lock:
-            self._connection.execute(
-                f"DELETE FROM bridge_transaction_tag WHERE tx_id IN ({placeholders})", ids
-            )
-            self._connection.execute(
-                f"DELETE FROM fact_transactions WHERE tx_id IN ({placeholders})", ids
-            )
+        con = self._connection
+        con.execute(
+            "CREATE OR REPLACE TEMP TABLE stage_months AS "
+            "SELECT DISTINCT user_id, CAST(date_trunc('month', tx_date) AS DATE) AS month "
+            f"FROM fact_transactions WHERE tx_id IN ({placeholders})",
+            ids,
+        )
+        con.execute(
+            "CREATE OR REPLACE TEMP TABLE stage_keys AS SELECT DISTINCT user_id, "
+            f"description_key FROM fact_transactions WHERE tx_id IN ({placeholders})",
+            ids,
+        )
+        self._touch(u for (u,) in con.execute("SELECT user_id FROM stage_months").fetchall())
+        con.execute(f"DELETE FROM bridge_transaction_tag WHERE tx_id IN ({placeholders})", ids)
+        con.execute(f"DELETE FROM fact_transactions WHERE tx_id IN ({placeholders})", ids)
+        self._refresh_staged()
 
-    def rebuild_for_user(self, user_id: UUID, transactions: Iterable[Transaction]) -> int:
+    def sync_mark(self, user_id: UUID) -> int | None:
+        """The change-log ``seq`` this user's facts are known to include.
+
+        Written only in the commit that applied the changes up to it, so a
+        write lost in between (a crash, a rollback) leaves the mark behind
+        and the next sync replays from there.
+        """
+        with self._reading() as cursor:
+            row = cursor.execute(
+                f"SELECT seq FROM {SYNC_TABLE} WHERE user_id = ?", [str(user_id)]
+            ).fetchone()
+        return row[0] if row else None
+
+    def apply_changes(
+        self,
+        user_id: UUID,
+        transactions: list[Transaction],
+        deleted_ids: list[UUID],
+        *,
+        mark: int | None = None,
+    ) -> None:
+        with self._writing():
+            if transactions:
+                self._merge(transactions)
+            if deleted_ids:
+                self._delete(deleted_ids)
+            if mark is not None:
+                self._set_mark(user_id, mark)
+
+    def _set_mark(self, user_id: UUID, mark: int) -> None:
+        # Not a data change: the facts say what they said, so no _touch.
+        self._connection.execute(
+            f"INSERT OR REPLACE INTO {SYNC_TABLE} VALUES (?, ?)", [str(user_id), mark]
+        )
+
+    def rebuild_for_user(
+        self, user_id: UUID, transactions: Iterable[Transaction], *, mark: int | None = None
+    ) -> int:
         """Discard and re-derive one user's fact rows. Returns the row count.
 
         The cube is a *derived* store: the relational tables are the record of
@@ -208,28 +636,44 @@ class DuckDbCube:
         replaceable — and what makes every later backfill (transfer flags,
         fingerprints, tags) a rebuild rather than a bespoke migration.
 
-        Delete and repopulate happen under one lock so a concurrent read never
+        Delete and repopulate are one transaction, so a concurrent read never
         observes a user with no transactions. ``transactions`` is supplied by
         the caller rather than fetched here: the cube adapter must not reach
         for a repository.
         """
-        with self._lock:
+        with self._writing() as con:
             # Bridge rows first, while the fact table still says which
             # transactions are this user's -- the bridge carries no user_id, by
             # the same reasoning as the relational one.
-            self._connection.execute(
+            con.execute(
                 "DELETE FROM bridge_transaction_tag WHERE tx_id IN "
                 "(SELECT tx_id FROM fact_transactions WHERE user_id = ?)",
                 [str(user_id)],
             )
-            self._connection.execute(
-                "DELETE FROM fact_transactions WHERE user_id = ?", [str(user_id)]
-            )
+            con.execute("DELETE FROM fact_transactions WHERE user_id = ?", [str(user_id)])
+            self._touch([user_id])
             count = 0
-            for t in transactions:
-                self._connection.execute(_UPSERT_FACT, self._fact_row(t))
-                self._write_bridge(t)
-                count += 1
+            rows = iter(transactions)
+            while batch := list(islice(rows, _BULK_BATCH)):
+                # The rollup and the recurrence index are derived once at the
+                # end: per batch, a month or a key straddling two batches would
+                # be aggregated twice for nothing.
+                self._merge(batch, refresh=False)
+                count += len(batch)
+            con.execute(f"DELETE FROM {ROLLUP_TABLE} WHERE user_id = ?", [str(user_id)])
+            con.execute(
+                f"INSERT INTO {ROLLUP_TABLE} "
+                f"SELECT {_ROLLUP_GROUP}, SUM(f.amount), COUNT(*) "
+                f"FROM fact_transactions f WHERE f.user_id = ? GROUP BY {_ROLLUP_GROUP}",
+                [str(user_id)],
+            )
+            con.execute(f"DELETE FROM {RECURRENCE_TABLE} WHERE user_id = ?", [str(user_id)])
+            con.execute(
+                f"{_RECURRENCE_AGGREGATE}AND f.user_id = ? GROUP BY f.user_id, f.description_key",
+                [str(user_id)],
+            )
+            if mark is not None:
+                self._set_mark(user_id, mark)
         return count
 
     @staticmethod
@@ -248,22 +692,99 @@ class DuckDbCube:
             t.is_transfer,
             t.is_cash_withdrawal,
             [str(tag_id) for tag_id in t.tag_ids],
+            normalize(t.description or t.raw_description),
         ]
 
     # --- reader ----------------------------------------------------------
+    def data_version(self, user_id: UUID) -> tuple[int, int]:
+        """A token that changes whenever a write could change this user's answers.
+
+        Bumped by every writer method once its transaction commits: per user for
+        facts, for everyone at once for the dimension tables. In-process only --
+        the writer lock already makes the cube file one process's.
+        """
+        return self._epoch, self._versions.get(str(user_id), 0)
+
+    def months_changed(
+        self, user_id: UUID, since: tuple[int, int], until: tuple[int, int]
+    ) -> frozenset[str] | None:
+        """The ``YYYY-MM`` months whose facts changed between two data versions.
+
+        Every write that goes through the rollup's staged months says which
+        (user, month) partitions it touched; this is their union over the
+        writes after ``since`` up to ``until``. ``None`` when that cannot be
+        told -- the writes are older than the log, or one of them (a rebuild)
+        replaced the user's facts without listing months -- and the caller
+        should reread everything. Dimension writes change no facts and are not
+        counted.
+        """
+        first, last = since[1], until[1]
+        if first == last:
+            return frozenset()
+        with self._month_log_lock:
+            writes = [
+                months
+                for version, months in self._month_log.get(str(user_id), ())
+                if first < version <= last
+            ]
+        if len(writes) != last - first or None in writes:
+            return None
+        return frozenset().union(*writes)
+
+    def export_parquet(
+        self,
+        directory: str | Path,
+        *,
+        user_id: UUID | None = None,
+        tables: Iterable[str] = EXPORT_TABLES,
+    ) -> dict[str, int]:
+        """Write ``<directory>/<table>.parquet`` per table; return rows per table.
+
+        DuckDB's own ``COPY ... TO`` does the writing: columnar and compressed
+        straight from its storage, no row crosses into Python. All the tables
+        are read in one transaction on one read cursor, so they are one
+        snapshot -- no bridge row without its fact -- and a write in flight
+        neither waits for the export nor shows up in half of it.
+
+        ``user_id`` scopes the export to one user's facts, their bridge rows
+        and the tags those reference; without it, everything.
+        """
+        tables = list(tables)
+        unknown = set(tables) - set(EXPORT_TABLES)
+        if unknown:
+            raise ValueError(f"Not an exportable table: {sorted(unknown)}")
+        Path(directory).mkdir(parents=True, exist_ok=True)
+        counts: dict[str, int] = {}
+        with self._reading() as cursor:
+            cursor.begin()
+            try:
+                for table in tables:
+                    if user_id is None:
+                        query, params = f"SELECT * FROM {table}", []
+                    else:
+                        query = _EXPORT_SCOPED[table]
+                        params = [str(user_id)] * query.count("?")
+                    target = str(Path(directory) / f"{table}.parquet").replace("'", "''")
+                    (counts[table],) = cursor.execute(
+                        f"COPY ({query}) TO '{target}' (FORMAT parquet)", params
+                    ).fetchone()
+            finally:
+                cursor.rollback()
+        return counts
+
     def fetch(self, sql: str, params: list) -> list[tuple]:
-        """Run one read against the fact tables under this cube's lock.
+        """Run one read against the fact tables on a leased read cursor.
 
         Exposed for the sibling adapter in this package: the metric engine
-        compiles its own SQL, and DuckDB is single-writer, so every statement
-        has to travel through the one connection this class owns rather than a
-        second one opened on the same file.
+        compiles its own SQL, and DuckDB is single-writer per file, so every
+        statement has to travel through the database this class owns rather
+        than a second connection opened on the same file.
 
         ``sql`` is built from whitelisted identifiers by the caller; ``params``
         carries every value. Nothing user-supplied is ever interpolated.
         """
-        with self._lock:
-            return self._connection.execute(sql, params).fetchall()
+        with self._reading() as cursor:
+            return cursor.execute(sql, params).fetchall()
 
     def spending_by_category(
         self,
@@ -273,8 +794,8 @@ class DuckDbCube:
         currency: str = DEFAULT_CURRENCY,
     ) -> list[CategorySpend]:
         clause, params = self._filter(user_id, start, end, currency)
-        with self._lock:
-            rows = self._connection.execute(
+        with self._reading() as cursor:
+            rows = cursor.execute(
                 f"""
                 SELECT f.category_id,
                        COALESCE(d.name, 'Sin Categoria') AS name,
@@ -298,17 +819,36 @@ class DuckDbCube:
             for r in rows
         ]
 
+    def recurrence_stats(self, user_id: UUID, min_occurrences: int = 2) -> list[RecurrenceStats]:
+        """Per normalized description, the aggregates recurrence is judged on.
+
+        Read from :data:`RECURRENCE_TABLE`, which already holds them for the
+        whole history: one row per group, whatever the history's length. Only
+        the groups with at least ``min_occurrences`` rows come back to Python.
+        """
+        with self._reading() as cursor:
+            rows = cursor.execute(
+                f"""
+                SELECT description_key, occurrences, total_amount, first_date, last_date
+                FROM {RECURRENCE_TABLE}
+                WHERE user_id = ? AND occurrences >= ?
+                """,
+                [str(user_id), min_occurrences],
+            ).fetchall()
+        return [RecurrenceStats(*r) for r in rows]
+
     def monthly_series(self, user_id: UUID, months: int = 12) -> list[MonthlyPoint]:
-        with self._lock:
-            rows = self._connection.execute(
-                """
-                SELECT strftime(tx_date, '%Y-%m') AS month,
+        # Whole months with no other filter: always inside the rollup's grain.
+        with self._reading() as cursor:
+            rows = cursor.execute(
+                f"""
+                SELECT strftime(month, '%Y-%m') AS month,
                        SUM(CASE WHEN tx_type = 'income' THEN amount ELSE 0 END) AS income,
                        SUM(CASE WHEN tx_type = 'expense' THEN amount ELSE 0 END) AS expense
-                FROM fact_transactions
+                FROM {ROLLUP_TABLE}
                 WHERE user_id = ?
-                GROUP BY month
-                ORDER BY month DESC
+                GROUP BY 1
+                ORDER BY 1 DESC
                 LIMIT ?
                 """,
                 [str(user_id), months],
@@ -328,8 +868,8 @@ class DuckDbCube:
         currency: str = DEFAULT_CURRENCY,
     ) -> SpendingSummary:
         clause, params = self._filter(user_id, start, end, currency)
-        with self._lock:
-            income, expense = self._connection.execute(
+        with self._reading() as cursor:
+            income, expense = cursor.execute(
                 f"""
                 SELECT
                     SUM(CASE WHEN tx_type = 'income' THEN amount ELSE 0 END),
@@ -11,10 +11,25 @@ metric's own allow-list before we are called; here they are looked up in
 :data:`_COLUMN_SQL`, a closed dict. Every *value* -- period bounds, filter
 operands, the user id -- is a bound parameter. There is no string path from
 request body to SQL text.
+
+**Fusion.** A dashboard asks for several metrics over the same user, period
+and currency at once. :meth:`DuckDbMetricEngine.execute_many` compiles every
+such group into one scan: the shared scope is the WHERE, each query's own
+predicates become ``FILTER`` clauses on its aggregates, and its group columns
+one of the ``GROUPING SETS``. The rows are split back per query afterwards.
+
+**Plan cache.** Which relation a query reads, its group columns and its SQL text
+depend only on the query's *shape* (see :func:`_shape`) -- the values are all
+parameters. They are built once per shape and reused.
 """
 
 from __future__ import annotations
 
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from datetime import timedelta
 from decimal import Decimal
 from typing import Any
 from uuid import UUID
@@ -28,7 +43,7 @@ from ....application.dtos.metrics import (
 )
 from ....domain.metrics.spec import Measure, MetricSpec
 from ....domain.metrics.vocabulary import DIMENSIONS, FILTERS, GRAINS, MEASURES
-from .duckdb_cube import DuckDbCube
+from .duckdb_cube import ROLLUP_TABLE, DuckDbCube
 
 #: Semantic column name -> SQL expression. The whitelist. `f` is
 #: ``fact_transactions``, `d` is ``dim_category``, `b` is
@@ -57,6 +72,93 @@ _GRAIN_FORMAT = {"month": "%Y-%m", "day": "%Y-%m-%d"}
 
 _ROW_COUNT = "row_count"
 
+#: Distinct query shapes remembered per engine. A catalog of a handful of
+#: metrics times the dimensions and filters the UI offers stays well under it.
+_PLAN_CACHE_SIZE = 512
+
+
+@dataclass(frozen=True)
+class _Source:
+    """A relation a query can be answered from, aliased ``f`` either way.
+
+    ``columns`` is that relation's slice of the whitelist: a semantic name
+    missing from it is a question this source cannot answer.
+    """
+
+    table: str
+    columns: dict[str, str]
+    #: How many fact rows stand behind one group.
+    row_count: str
+
+
+_FACTS = _Source("fact_transactions", _COLUMN_SQL, "COUNT(*)")
+
+#: The monthly rollup (see ``DuckDbCube``). Its ``month`` column stands in for
+#: ``tx_date``, which is only sound for month-aligned periods and a month grain
+#: -- :meth:`DuckDbMetricEngine._plan` checks both. Tags, merchants and
+#: descriptions are not in its grain, so any query naming them stays on facts.
+_ROLLUP = _Source(
+    ROLLUP_TABLE,
+    {
+        **{
+            name: _COLUMN_SQL[name]
+            for name in (
+                "amount",
+                "tx_type",
+                "currency",
+                "category_id",
+                "excluded_from_stats",
+                "is_transfer",
+                "is_cash_withdrawal",
+                "category_name",
+            )
+        },
+        "tx_date": "f.month",
+        "tx_month": "strftime(f.month, '%Y-%m')",
+    },
+    "SUM(f.row_count)",
+)
+
+
+@dataclass(frozen=True)
+class _Prepared:
+    """One query resolved against its source, before the SQL is assembled.
+
+    ``scope`` is the part of the WHERE that fusable queries share (user,
+    currency, period); ``predicates`` is the rest, which fusion moves onto the
+    query's own aggregates.
+    """
+
+    spec: MetricSpec
+    query: MetricQuery
+    measures: list[Measure]
+    source: _Source
+    group_by: list[tuple[str, str]]
+    currency: str | None
+    scope: tuple[list[str], list[Any]]
+    predicates: tuple[list[str], list[Any]]
+    shape: tuple
+
+    @property
+    def params(self) -> list[Any]:
+        """Bound values for the query run alone, in placeholder order."""
+        return self.scope[1] + self.predicates[1]
+
+    @property
+    def fusion_key(self) -> tuple:
+        """Queries with equal keys read the same rows and can share a scan.
+
+        A tag breakdown joins the bridge, which fans rows out, so it only
+        shares with other tag breakdowns.
+        """
+        clauses, params = self.scope
+        return (
+            self.source.table,
+            "tag" in self.query.dimensions,
+            tuple(clauses),
+            tuple(params),
+        )
+
 
 class MetricCompilationError(RuntimeError):
     """The catalog referenced something this adapter cannot map.
@@ -71,23 +173,90 @@ class DuckDbMetricEngine:
 
     def __init__(self, cube: DuckDbCube) -> None:
         self._cube = cube
+        self._plans: OrderedDict[tuple, Any] = OrderedDict()
+        self._plans_lock = threading.Lock()
 
     def execute(self, user_id: UUID, spec: MetricSpec, query: MetricQuery) -> MetricResult:
+        return self._run(self._prepare(user_id, spec, query))
+
+    def execute_many(
+        self, user_id: UUID, requests: Sequence[tuple[MetricSpec, MetricQuery]]
+    ) -> list[MetricResult]:
+        """Answer a batch, one scan per group of queries that read the same rows.
+
+        Results come back in request order. A group of one runs exactly as
+        :meth:`execute` would.
+        """
+        prepared = [self._prepare(user_id, spec, query) for spec, query in requests]
+        groups: dict[tuple, list[int]] = {}
+        for index, item in enumerate(prepared):
+            groups.setdefault(item.fusion_key, []).append(index)
+
+        results: list[MetricResult] = [None] * len(prepared)  # type: ignore[list-item]
+        for indexes in groups.values():
+            if len(indexes) == 1:
+                results[indexes[0]] = self._run(prepared[indexes[0]])
+                continue
+            fused = self._run_fused([prepared[i] for i in indexes])
+            for index, result in zip(indexes, fused):
+                results[index] = result
+        return results
+
+    def _prepare(self, user_id: UUID, spec: MetricSpec, query: MetricQuery) -> _Prepared:
         measures = [self._measure(name) for name in spec.measures]
         if not measures:
             raise MetricCompilationError(f"Metric '{spec.id}' declares no measures.")
 
-        group_by = self._group_columns(spec, query)
+        shape = _shape(spec, query)
+        source, group_by = self._cached(("layout", shape), lambda: self._layout(spec, query, measures))
         currency = self._currency_scope(query, group_by)
+        return _Prepared(
+            spec=spec,
+            query=query,
+            measures=measures,
+            source=source,
+            group_by=group_by,
+            currency=currency,
+            scope=self._scope(user_id, spec, query, currency, source),
+            predicates=self._predicates(query, measures, source),
+            shape=shape,
+        )
 
-        sql, params = self._compile(user_id, spec, query, measures, group_by, currency)
-        rows = self._cube.fetch(sql, params)
+    def _layout(
+        self, spec: MetricSpec, query: MetricQuery, measures: list[Measure]
+    ) -> tuple[_Source, list[tuple[str, str]]]:
+        source = self._plan(spec, query, measures)
+        return source, self._group_columns(spec, query, source)
 
+    def _cached(self, key: tuple, build: Callable[[], Any]) -> Any:
+        """The value for ``key``, built on first use and kept LRU-bounded.
+
+        Built outside the lock: two threads racing on a new shape both compile
+        it, which is cheaper than serialising every compile behind one lock.
+        """
+        with self._plans_lock:
+            if key in self._plans:
+                self._plans.move_to_end(key)
+                return self._plans[key]
+        value = build()
+        with self._plans_lock:
+            self._plans[key] = value
+            if len(self._plans) > _PLAN_CACHE_SIZE:
+                self._plans.popitem(last=False)
+        return value
+
+    def _run(self, item: _Prepared) -> MetricResult:
+        sql = self._cached(("sql", item.shape), lambda: self._compile(item)[0])
+        return self._result(item, self._cube.fetch(sql, item.params))
+
+    def _result(self, item: _Prepared, rows: list[tuple]) -> MetricResult:
         # A breakdown by an overlapping axis does not partition the total: one
         # transaction with three tags lands in three rows. The client is told so
         # rather than left to infer it from sums that do not add up.
-        overlapping = any(DIMENSIONS[name].overlapping for name in query.dimensions)
-        return self._to_result(spec, measures, group_by, rows, currency, overlapping)
+        overlapping = any(DIMENSIONS[name].overlapping for name in item.query.dimensions)
+        return self._to_result(
+            item.spec, item.measures, item.group_by, rows, item.currency, overlapping
+        )
 
     # --- compilation -----------------------------------------------------
     @staticmethod
@@ -98,19 +267,52 @@ class DuckDbMetricEngine:
             raise MetricCompilationError(f"Unknown measure '{name}'.") from exc
 
     @staticmethod
-    def _sql(column: str) -> str:
+    def _sql(column: str, source: _Source = _FACTS) -> str:
         try:
-            return _COLUMN_SQL[column]
+            return source.columns[column]
         except KeyError as exc:  # pragma: no cover - vocabulary/adapter drift
             raise MetricCompilationError(f"No column mapping for '{column}'.") from exc
 
-    def _group_columns(self, spec: MetricSpec, query: MetricQuery) -> list[tuple[str, str]]:
+    @staticmethod
+    def _plan(spec: MetricSpec, query: MetricQuery, measures: list[Measure]) -> _Source:
+        """Pick the relation to read: the monthly rollup when it covers the ask.
+
+        Covered means every semantic column the query touches -- measures,
+        their default filters, dimensions, client filters -- is in the rollup's
+        grain, the time axis (if any) is the month, and the period starts and
+        ends on month boundaries. Anything else, a tag breakdown or a day-grain
+        series or a mid-month period, falls through to the facts. The answer is
+        the same either way; only the number of rows scanned differs.
+        """
+        if query.grain is not None and query.grain != "month":
+            return _FACTS
+        if not spec.ignores_period and not _month_aligned(query.period):
+            return _FACTS
+
+        needed: set[str] = set()
+        for measure in measures:
+            needed.add(measure.column)
+            needed.update(default.field for default in measure.default_filters)
+        for name in query.dimensions:
+            dimension = DIMENSIONS[name]
+            needed.add(dimension.column)
+            if dimension.key_column:
+                needed.add(dimension.key_column)
+        needed.update(FILTERS[name].column for name in query.filters)
+
+        return _ROLLUP if needed <= _ROLLUP.columns.keys() else _FACTS
+
+    def _group_columns(
+        self, spec: MetricSpec, query: MetricQuery, source: _Source = _FACTS
+    ) -> list[tuple[str, str]]:
         """``(alias, sql)`` pairs, grain axis first so a series sorts by time."""
         columns: list[tuple[str, str]] = []
         if query.grain:
             grain = GRAINS[query.grain]
             fmt = _GRAIN_FORMAT[grain.name]
-            columns.append((grain.name, f"strftime({self._sql(grain.column)}, '{fmt}')"))
+            columns.append(
+                (grain.name, f"strftime({self._sql(grain.column, source)}, '{fmt}')")
+            )
 
         for name in query.dimensions:
             # A `month` dimension alongside a `month` grain is the same axis
@@ -119,8 +321,8 @@ class DuckDbMetricEngine:
                 continue
             dimension = DIMENSIONS[name]
             if dimension.key_column:
-                columns.append((f"{name}_id", self._sql(dimension.key_column)))
-            columns.append((name, self._sql(dimension.column)))
+                columns.append((f"{name}_id", self._sql(dimension.key_column, source)))
+            columns.append((name, self._sql(dimension.column, source)))
         return columns
 
     @staticmethod
@@ -136,11 +338,13 @@ class DuckDbMetricEngine:
         explicit = query.filters.get("currency")
         return str(explicit) if explicit else DEFAULT_CURRENCY
 
-    def _measure_sql(self, measure: Measure) -> str:
-        column = self._sql(measure.column)
-        tx_type = self._sql("tx_type")
+    def _measure_sql(self, measure: Measure, source: _Source = _FACTS) -> str:
+        column = self._sql(measure.column, source)
+        tx_type = self._sql("tx_type", source)
         if measure.agg == "count":
-            return f"COUNT({column})"
+            # A rollup row already stands for many facts; counting rollup rows
+            # would count buckets.
+            return source.row_count
         if measure.direction == "expense":
             return f"SUM(CASE WHEN {tx_type} = 'expense' THEN {column} ELSE 0 END)"
         if measure.direction == "income":
@@ -152,31 +356,39 @@ class DuckDbMetricEngine:
             return f"SUM(CASE WHEN {tx_type} = 'income' THEN {column} ELSE -{column} END)"
         return f"SUM({column})"
 
-    def _where(
+    def _scope(
         self,
         user_id: UUID,
         spec: MetricSpec,
         query: MetricQuery,
-        measures: list[Measure],
         currency: str | None,
+        source: _Source = _FACTS,
     ) -> tuple[list[str], list[Any]]:
+        """Tenant, currency and period: which rows a query reads at all."""
         clauses = ["f.user_id = ?"]
         params: list[Any] = [str(user_id)]
 
         if currency:
-            clauses.append(f"{self._sql('currency')} = ?")
+            clauses.append(f"{self._sql('currency', source)} = ?")
             params.append(currency)
         # `ignores_period` metrics are all-time by definition: narrowing
         # "lifetime in vs out" to the dashboard's month would answer a
         # different question under the same label.
         if not spec.ignores_period:
             if query.period.start:
-                clauses.append(f"{self._sql('tx_date')} >= ?")
+                clauses.append(f"{self._sql('tx_date', source)} >= ?")
                 params.append(query.period.start)
             if query.period.end:
-                clauses.append(f"{self._sql('tx_date')} <= ?")
+                clauses.append(f"{self._sql('tx_date', source)} <= ?")
                 params.append(query.period.end)
+        return clauses, params
 
+    def _predicates(
+        self, query: MetricQuery, measures: list[Measure], source: _Source = _FACTS
+    ) -> tuple[list[str], list[Any]]:
+        """What the metric itself narrows to within its scope."""
+        clauses: list[str] = []
+        params: list[Any] = []
         # When every selected measure reads the same side of the ledger, the
         # rows on the other side are excluded rather than merely zeroed by the
         # CASE. Otherwise an income row would open its own group -- a
@@ -184,21 +396,21 @@ class DuckDbMetricEngine:
         # meta.source_txn_count with rows the number does not rest on.
         directions = {m.direction for m in measures}
         if directions in ({"expense"}, {"income"}):
-            clauses.append(f"{self._sql('tx_type')} = ?")
+            clauses.append(f"{self._sql('tx_type', source)} = ?")
             params.append(next(iter(directions)))
 
         # Measure-level defaults come first and are not overridable by the
         # client: "spend excludes transfers" is a property of the measure.
         for measure in measures:
             for default in measure.default_filters:
-                clauses.append(f"{self._sql(default.field)} = ?")
+                clauses.append(f"{self._sql(default.field, source)} = ?")
                 params.append(default.value)
 
         for name, value in query.filters.items():
             if name == "currency":
                 continue  # already applied as the currency scope
             filter_def = FILTERS[name]
-            column = self._sql(filter_def.column)
+            column = self._sql(filter_def.column, source)
             if filter_def.multivalued:
                 # The column is an array, so the predicate is membership. A list
                 # of values is an OR ("tagged viaje *or* deducible"), which is
@@ -224,27 +436,21 @@ class DuckDbMetricEngine:
 
         return clauses, params
 
-    def _compile(
-        self,
-        user_id: UUID,
-        spec: MetricSpec,
-        query: MetricQuery,
-        measures: list[Measure],
-        group_by: list[tuple[str, str]],
-        currency: str | None,
-    ) -> tuple[str, list[Any]]:
+    def _compile(self, item: _Prepared) -> tuple[str, list[Any]]:
+        spec, measures, group_by, source = item.spec, item.measures, item.group_by, item.source
         select = [f"{sql} AS {alias}" for alias, sql in group_by]
-        select += [f"{self._measure_sql(m)} AS {m.name}" for m in measures]
+        select += [f"{self._measure_sql(m, source)} AS {m.name}" for m in measures]
         # Carried so meta.source_txn_count says how many rows the answer rests
         # on -- an empty widget and a widget over three transactions are
         # different claims.
-        select.append(f"COUNT(*) AS {_ROW_COUNT}")
+        select.append(f"{source.row_count} AS {_ROW_COUNT}")
 
-        clauses, params = self._where(user_id, spec, query, measures, currency)
+        clauses = item.scope[0] + item.predicates[0]
+        params = item.scope[1] + item.predicates[1]
 
         sql = (
             f"SELECT {', '.join(select)} "
-            f"{self._from(query)} "
+            f"{self._from(item.query, source)} "
             f"WHERE {' AND '.join(clauses)}"
         )
         if group_by:
@@ -268,8 +474,110 @@ class DuckDbMetricEngine:
             )
         return sql, params
 
+    def _run_fused(self, items: list[_Prepared]) -> list[MetricResult]:
+        """One statement for queries sharing a fusion key, split back per query.
+
+        Every aggregate carries its query's predicates as a ``FILTER``, so the
+        numbers are the ones each query would compute alone. A group exists for
+        a query only if one of *its* rows landed there -- the per-query count is
+        what tells -- except the ungrouped total, which like any aggregate
+        without GROUP BY is one row even over nothing.
+
+        Ordering and running sums are applied per query in Python: one ORDER BY
+        cannot serve a breakdown and a series at once.
+        """
+        key = ("fused", tuple(item.shape for item in items))
+        sql, axes = self._cached(key, lambda: self._compile_fused(items))
+        params: list[Any] = []
+        for item in items:
+            # Each aggregate's FILTER repeats its query's predicates.
+            params.extend(item.predicates[1] * (len(item.measures) + 1))
+        rows = self._cube.fetch(sql, params + items[0].scope[1])
+
+        results = []
+        offset = len(axes) + (1 if axes else 0)
+        for q, item in enumerate(items):
+            positions = [axes.index(sql) for _, sql in item.group_by]
+            # GROUPING() sets a bit, most significant first, per axis the row
+            # is *not* grouped by.
+            mask = sum(
+                1 << (len(axes) - 1 - i) for i in range(len(axes)) if i not in positions
+            )
+            width = len(item.measures)
+            start = offset + sum(len(other.measures) + 1 for other in items[:q])
+            own = [
+                tuple(row[p] for p in positions) + row[start : start + width + 1]
+                for row in rows
+                if not axes or row[len(axes)] == mask
+            ]
+            if item.group_by:
+                own = [row for row in own if row[-1]]
+            results.append(self._result(item, self._arrange(item, own)))
+        return results
+
+    def _compile_fused(self, items: list[_Prepared]) -> tuple[str, list[str]]:
+        """The fused statement, and the group expressions in select order."""
+        # Distinct group expressions across the batch. Selected under neutral
+        # aliases: two metrics may use one alias for different expressions.
+        axes: list[str] = []
+        for item in items:
+            for _, sql in item.group_by:
+                if sql not in axes:
+                    axes.append(sql)
+
+        select = [f"{sql} AS g{i}" for i, sql in enumerate(axes)]
+        if axes:
+            select.append(f"GROUPING({', '.join(axes)}) AS grouping_id")
+        for q, item in enumerate(items):
+            clauses = item.predicates[0]
+            condition = f" FILTER (WHERE {' AND '.join(clauses)})" if clauses else ""
+            for j, measure in enumerate(item.measures):
+                select.append(f"{self._measure_sql(measure, item.source)}{condition} AS m{q}_{j}")
+            select.append(f"{item.source.row_count}{condition} AS n{q}")
+
+        first = items[0]
+        scope_clauses = first.scope[0]
+        sql = (
+            f"SELECT {', '.join(select)} "
+            f"{self._from(first.query, first.source)} "
+            f"WHERE {' AND '.join(scope_clauses)}"
+        )
+        if axes:
+            sets = []
+            for item in items:
+                grouping_set = f"({', '.join(sql for _, sql in item.group_by)})"
+                if grouping_set not in sets:
+                    sets.append(grouping_set)
+            sql += f" GROUP BY GROUPING SETS ({', '.join(sets)})"
+        return sql, axes
+
+    @staticmethod
+    def _arrange(item: _Prepared, rows: list[tuple]) -> list[tuple]:
+        """Apply :meth:`_order_by` and the cumulative window to fused rows."""
+        if not item.group_by:
+            return rows
+
+        def axis(row: tuple) -> tuple:
+            # SQL sorts NULLs last in ascending order.
+            return (row[0] is None, row[0])
+
+        width = len(item.group_by)
+        if item.spec.shape == "series":
+            rows = sorted(rows, key=axis)
+        else:
+            rows = sorted(rows, key=lambda row: (-(row[width] or 0), axis(row)))
+        if item.spec.cumulative:
+            running = [Decimal(0)] * len(item.measures)
+            accumulated = []
+            for row in rows:
+                for j in range(len(running)):
+                    running[j] += row[width + j] or 0
+                accumulated.append(row[:width] + tuple(running) + row[-1:])
+            rows = accumulated
+        return rows
+
     @staticmethod
-    def _from(query: MetricQuery) -> str:
+    def _from(query: MetricQuery, source: _Source = _FACTS) -> str:
         """The FROM/JOIN chain. The bridge joins in only for a tag *breakdown*.
 
         Grouping by tag needs one row per (transaction, tag) pair, which is what
@@ -279,7 +587,7 @@ class DuckDbMetricEngine:
         the very total being filtered.
         """
         sql = (
-            "FROM fact_transactions f "
+            f"FROM {source.table} f "
             "LEFT JOIN dim_category d ON f.category_id = d.category_id"
         )
         if "tag" in query.dimensions:
@@ -311,7 +619,7 @@ class DuckDbMetricEngine:
         aliases = [alias for alias, _ in group_by]
         rows: list[dict[str, Any]] = []
         totals = {m.name: Decimal(0) for m in measures}
-        source_count = 0
+        row_counts: list[int] = []
 
         for raw in raw_rows:
             row: dict[str, Any] = {}
@@ -321,7 +629,7 @@ class DuckDbMetricEngine:
                 amount = Decimal(str(raw[len(aliases) + offset] or 0))
                 totals[measure.name] = amount if spec.cumulative else totals[measure.name] + amount
                 row[measure.name] = money(amount)
-            source_count += int(raw[-1] or 0)
+            row_counts.append(int(raw[-1] or 0))
             rows.append(row)
 
         return MetricResult(
@@ -340,6 +648,36 @@ class DuckDbMetricEngine:
             meta=MetricMeta(
                 currency=currency,
                 overlapping=overlapping,
-                source_txn_count=source_count,
+                source_txn_count=sum(row_counts),
+                row_counts=tuple(row_counts),
             ),
         )
+
+
+def _shape(spec: MetricSpec, query: MetricQuery) -> tuple:
+    """Everything the compiled SQL depends on, and none of the values it binds.
+
+    Two queries of one shape differ only in parameters: the user, the period
+    bounds, the filter operands. A filter's *arity* is shape -- it sets how
+    many placeholders an ``IN`` has -- and so is whether the period is
+    month-aligned, which picks the relation read.
+    """
+    return (
+        spec.id,
+        tuple(query.dimensions),
+        query.grain,
+        query.period.start is not None,
+        query.period.end is not None,
+        _month_aligned(query.period),
+        tuple(
+            (name, len(value) if isinstance(value, (list, tuple)) else None)
+            for name, value in query.filters.items()
+        ),
+    )
+
+
+def _month_aligned(period) -> bool:
+    """Whether the period is a run of whole calendar months (open ends count)."""
+    if period.start and period.start.day != 1:
+        return False
+    return not (period.end and (period.end + timedelta(days=1)).day != 1)
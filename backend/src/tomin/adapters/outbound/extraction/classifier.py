@@ -28,6 +28,8 @@ class KeywordTemplateClassifier:
                 return TEMPLATE_SAT_CFDI
             return TEMPLATE_UNKNOWN
 
+        # Only the leading page(s) of a streamed document: the letterhead is
+        # where a bank names itself.
         text = (doc.text or "").lower()
         for template, signatures in self.BANK_SIGNATURES.items():
             if any(sig in text for sig in signatures):
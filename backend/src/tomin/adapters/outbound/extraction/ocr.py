@@ -1,8 +1,53 @@
 from __future__ import annotations
 
+import multiprocessing
+import os
+import tempfile
+import threading
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+
 from ....application.dtos.extraction import ExtractedDocument
 
 
+def _require_ocr():
+    try:
+        import pytesseract
+        from pdf2image import convert_from_path, pdfinfo_from_path
+    except ImportError as exc:  # pragma: no cover - optional dependency
+        raise RuntimeError(
+            "OCR support requires the 'ocr' extra: pip install '.[ocr]'"
+        ) from exc
+    return pytesseract, convert_from_path, pdfinfo_from_path
+
+
+def _page_count(path: str) -> int:
+    _, _, pdfinfo_from_path = _require_ocr()
+    return int(pdfinfo_from_path(path)["Pages"])
+
+
+def _ocr_page(path: str, page: int, *, dpi: int, lang: str) -> str:
+    """Rasterise one page (1-based) and OCR it. Runs in a pool worker.
+
+    ``first_page``/``last_page`` make poppler render just this page, so a
+    worker never holds more than one page image, however long the document.
+    """
+    pytesseract, convert_from_path, _ = _require_ocr()
+    (image,) = convert_from_path(path, dpi=dpi, first_page=page, last_page=page)
+    try:
+        return pytesseract.image_to_string(image, lang=lang)
+    finally:
+        image.close()
+
+
+def _init_worker() -> None:
+    # Tesseract parallelises a page internally with OpenMP; with one page per
+    # process already, that only oversubscribes the cores.
+    os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+
+
 class OcrPdfExtractor:
     """OCR fallback for scanned/image PDFs using Tesseract.
 
@@ -10,11 +55,21 @@ class OcrPdfExtractor:
     ``pillow``) plus a system Tesseract + poppler install. Imports are lazy so
     the backend runs without these heavy dependencies when only digital PDFs
     and SAT XML are used.
+
+    Pages are OCR'd in parallel across ``processes`` worker processes, so the
+    image decoding around each Tesseract call runs outside this process's GIL
+    too. Each task renders a single page from a temporary copy of the PDF:
+    peak memory is one page image per worker rather than the whole document
+    at 300 DPI, and the text comes back in page order. The pool is started on
+    first use and kept; with ``processes=0`` pages are done one by one in the
+    calling thread.
     """
 
-    def __init__(self, lang: str = "spa+eng", dpi: int = 300) -> None:
-        self._lang = lang
-        self._dpi = dpi
+    def __init__(self, lang: str = "spa+eng", dpi: int = 300, processes: int = 2) -> None:
+        self._processes = processes
+        self._read_page: Callable[[str, int], str] = partial(_ocr_page, dpi=dpi, lang=lang)
+        self._pool: Executor | None = None
+        self._pool_lock = threading.Lock()
 
     def supports(self, filename: str, mime: str | None) -> bool:
         # Registered as an explicit fallback; the pipeline invokes it directly
@@ -22,20 +77,58 @@ class OcrPdfExtractor:
         return False
 
     def extract(self, data: bytes, filename: str, mime: str | None) -> ExtractedDocument:
+        _require_ocr()
+        # Workers read the PDF from disk: handing them the bytes would pickle a
+        # copy of the whole document into every page task.
+        fd, path = tempfile.mkstemp(suffix=".pdf", prefix="tomin_ocr_")
         try:
-            import pytesseract
-            from pdf2image import convert_from_bytes
-        except ImportError as exc:  # pragma: no cover - optional dependency
-            raise RuntimeError(
-                "OCR support requires the 'ocr' extra: pip install '.[ocr]'"
-            ) from exc
-
-        lines: list[str] = []
-        for image in convert_from_bytes(data, dpi=self._dpi):
-            text = pytesseract.image_to_string(image, lang=self._lang)
-            lines.extend(ln for ln in text.splitlines() if ln.strip())
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(data)
+            pages = self._ocr_pages(path, _page_count(path))
+        finally:
+            # Same rule as the upload itself: the raw file never outlives parsing.
+            os.remove(path)
 
+        lines = [ln for text in pages for ln in text.splitlines() if ln.strip()]
         joined = "\n".join(lines)
         return ExtractedDocument(
             kind="text", filename=filename, text=joined, lines=lines, mime=mime
         )
+
+    def close(self) -> None:
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown()
+
+    def _ocr_pages(self, path: str, count: int) -> list[str]:
+        read = self._read_page
+        if self._processes <= 0 or count <= 1:
+            return [read(path, page) for page in range(1, count + 1)]
+        pool = self._ensure_pool()
+        try:
+            # `map` yields in submission order, whichever page finishes first.
+            return list(pool.map(read, [path] * count, range(1, count + 1)))
+        except BrokenProcessPool:
+            # A worker died (OOM on a huge page, say). Drop the pool so the
+            # next document gets a fresh one, and fail this one.
+            self._discard_pool(pool)
+            raise
+
+    def _ensure_pool(self) -> Executor:
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self._processes,
+                    # Not fork: the parent is a threaded web server, and a
+                    # forked child inherits whatever locks its threads held.
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                )
+            return self._pool
+
+    def _discard_pool(self, pool: Executor) -> None:
+        with self._pool_lock:
+            if self._pool is pool:
+                self._pool = None
+        pool.shutdown(wait=False)
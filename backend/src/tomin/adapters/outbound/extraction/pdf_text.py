@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import io
+from collections.abc import Iterator
 
 from ....application.dtos.extraction import ExtractedDocument
 
@@ -11,6 +12,11 @@ class PdfTextExtractor:
     This is the fast path for statements that already contain a text layer
     (most bank e-statements). Scanned/image PDFs yield little text and should
     fall through to :class:`OcrPdfExtractor`.
+
+    The document comes back streamed (see :class:`ExtractedDocument`): only
+    the pages read to decide text-vs-OCR are kept, and parsing re-reads the
+    PDF page by page, dropping each page's layout caches before the next, so
+    memory tracks one page rather than the whole statement.
     """
 
     MIN_TEXT_CHARS = 40
@@ -19,21 +25,46 @@ class PdfTextExtractor:
         return filename.lower().endswith(".pdf")
 
     def extract(self, data: bytes, filename: str, mime: str | None) -> ExtractedDocument:
+        # Read just far enough to know there is a text layer. For a digital
+        # statement that is the first page; a scan is read to the end, as
+        # before, because only the whole document can prove it has no text.
+        head: list[str] = []
+        chars = 0
+        for page in self.iter_pages(data):
+            head.extend(page)
+            chars += sum(len(ln) for ln in page) + len(page)
+            if chars >= self.MIN_TEXT_CHARS:
+                break
+        else:
+            # Signal to the pipeline that OCR is required.
+            raise NeedsOcrError(filename)
+
+        return ExtractedDocument(
+            kind="text",
+            filename=filename,
+            text="\n".join(head),
+            lines=head,
+            mime=mime,
+            stream=lambda: self.iter_lines(data),
+        )
+
+    def iter_lines(self, data: bytes) -> Iterator[str]:
+        """Every non-blank line of the PDF, in reading order."""
+        for page in self.iter_pages(data):
+            yield from page
+
+    @staticmethod
+    def iter_pages(data: bytes) -> Iterator[list[str]]:
+        """The non-blank lines of each page, one page at a time."""
         import pdfplumber
 
-        lines: list[str] = []
         with pdfplumber.open(io.BytesIO(data)) as pdf:
             for page in pdf.pages:
                 text = page.extract_text() or ""
-                lines.extend(ln for ln in text.splitlines() if ln.strip())
-
-        joined = "\n".join(lines)
-        if len(joined) < self.MIN_TEXT_CHARS:
-            # Signal to the pipeline that OCR is required.
-            raise NeedsOcrError(filename)
-        return ExtractedDocument(
-            kind="text", filename=filename, text=joined, lines=lines, mime=mime
-        )
+                # pdfplumber keeps every parsed character and layout object
+                # of a page cached on it until told otherwise.
+                page.close()
+                yield [ln for ln in text.splitlines() if ln.strip()]
 
 
 class NeedsOcrError(Exception):
@@ -0,0 +1,3 @@
+from .in_process import InProcessJobQueue
+
+__all__ = ["InProcessJobQueue"]
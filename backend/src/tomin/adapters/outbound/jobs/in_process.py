@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import logging
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from datetime import datetime, timezone
+from typing import Any
+from uuid import UUID, uuid4
+
+from ....application.dtos.jobs import Job, JobState
+
+logger = logging.getLogger(__name__)
+
+
+class InProcessJobQueue:
+    """Implements the :class:`JobQueue` port with one thread pool per lane.
+
+    No broker: jobs live in this process and die with it. That is the trade
+    for running locally with nothing else installed; the durable record of an
+    upload is its statement row, not the job.
+
+    ``lanes`` maps a lane name to its worker count. A lane with zero workers
+    runs each job inline, inside ``submit`` -- the mode the test suite uses, so
+    a request sees its own upload without polling. Submitting to a lane that
+    was not configured is a programming error and raises ``KeyError``.
+
+    Threads rather than processes: the heavy steps (pdfplumber, Tesseract via
+    its subprocess, DuckDB, the database driver) spend their time outside the
+    GIL, and the work closes over live adapters that would not survive a pickle.
+
+    Finished jobs are kept for status polls, oldest dropped first past
+    ``retain``; queued and running jobs are never dropped.
+    """
+
+    def __init__(self, lanes: Mapping[str, int], *, retain: int = 1000) -> None:
+        self._executors: dict[str, ThreadPoolExecutor | None] = {
+            lane: (
+                ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"jobs-{lane}")
+                if workers > 0
+                else None
+            )
+            for lane, workers in lanes.items()
+        }
+        self._retain = retain
+        self._lock = threading.Lock()
+        self._jobs: OrderedDict[UUID, Job] = OrderedDict()
+
+    def submit(
+        self,
+        *,
+        owner_id: UUID,
+        lane: str,
+        work: Callable[[], Any],
+        subject_id: UUID | None = None,
+    ) -> Job:
+        executor = self._executors[lane]
+        job = Job(
+            id=uuid4(),
+            owner_id=owner_id,
+            lane=lane,
+            state=JobState.QUEUED,
+            submitted_at=datetime.now(timezone.utc),
+            subject_id=subject_id,
+        )
+        self._record(job)
+        if executor is None:
+            self._run(job, work)
+        else:
+            executor.submit(self._run, job, work)
+        return self.get(job.id) or job
+
+    def get(self, job_id: UUID) -> Job | None:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def shutdown(self, *, wait: bool = True) -> None:
+        """Stop taking work; with ``wait``, finish what is already queued."""
+        for executor in self._executors.values():
+            if executor is not None:
+                executor.shutdown(wait=wait)
+
+    def _run(self, job: Job, work: Callable[[], Any]) -> None:
+        self._record(replace(job, state=JobState.RUNNING))
+        try:
+            result = work()
+        except Exception as exc:
+            logger.exception("Job %s in lane %s failed", job.id, job.lane)
+            self._record(
+                replace(
+                    job,
+                    state=JobState.FAILED,
+                    error=str(exc) or type(exc).__name__,
+                    finished_at=datetime.now(timezone.utc),
+                )
+            )
+        else:
+            self._record(
+                replace(
+                    job,
+                    state=JobState.SUCCEEDED,
+                    result=result,
+                    finished_at=datetime.now(timezone.utc),
+                )
+            )
+
+    def _record(self, job: Job) -> None:
+        with self._lock:
+            self._jobs[job.id] = job
+            finished = [
+                key
+                for key, held in self._jobs.items()
+                if held.state in (JobState.SUCCEEDED, JobState.FAILED)
+            ]
+            for key in finished[: max(0, len(finished) - self._retain)]:
+                del self._jobs[key]
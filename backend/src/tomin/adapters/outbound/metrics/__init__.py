@@ -1,4 +1,10 @@
+from .cache import CachedMetricEngine, CacheStats
 from .resolvers.advice import FinancialAdviceResolver
 from .resolvers.projection import InvestmentProjectionResolver
 
-__all__ = ["FinancialAdviceResolver", "InvestmentProjectionResolver"]
+__all__ = [
+    "CacheStats",
+    "CachedMetricEngine",
+    "FinancialAdviceResolver",
+    "InvestmentProjectionResolver",
+]
@@ -0,0 +1,140 @@
+"""A result cache in front of the metric engine.
+
+A dashboard re-asks the same queries on every render, while a user's facts only
+change on upload, edit, tag or delete. Each cached answer is stored with the
+cube's :meth:`~tomin.application.ports.outbound.cube.CubeReader.data_version`
+for its user at the time it was read; a lookup under any other version is a
+miss. Nothing is ever invalidated explicitly, so no writer can forget to.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any
+from uuid import UUID
+
+from ....application.dtos.metrics import MetricQuery, MetricResult
+from ....application.ports.outbound.cube import CubeReader
+from ....application.ports.outbound.metrics import MetricEngine
+from ....domain.metrics.spec import MetricSpec
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    bytes: int
+
+
+@dataclass(frozen=True)
+class _Entry:
+    version: tuple[int, int]
+    result: MetricResult
+    size: int
+
+
+class CachedMetricEngine:
+    """Implements the :class:`MetricEngine` port by memoising another engine.
+
+    Entries are kept in least-recently-used order and evicted once their
+    approximate footprint passes ``max_bytes``. The footprint is the length of
+    the result's ``repr``: a proxy that grows with row count and text, which is
+    what a cap needs to bound, at a fraction of the cost of a deep
+    ``sys.getsizeof`` walk.
+
+    Results are shared between callers. ``MetricResult`` is frozen; treat its
+    rows as read-only too.
+    """
+
+    def __init__(
+        self, engine: MetricEngine, versions: CubeReader, *, max_bytes: int = 32 * 1024 * 1024
+    ) -> None:
+        self._engine = engine
+        self._versions = versions
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple, _Entry] = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def execute(self, user_id: UUID, spec: MetricSpec, query: MetricQuery) -> MetricResult:
+        return self.execute_many(user_id, [(spec, query)])[0]
+
+    def execute_many(
+        self, user_id: UUID, requests: Sequence[tuple[MetricSpec, MetricQuery]]
+    ) -> list[MetricResult]:
+        # Read before computing: a write landing mid-query then stores the
+        # answer under the version it superseded, where nobody will look.
+        version = self._versions.data_version(user_id)
+        keys = [_key(user_id, spec, query) for spec, query in requests]
+
+        results: list[MetricResult | None] = [self._get(key, version) for key in keys]
+        missing = [i for i, result in enumerate(results) if result is None]
+        if missing:
+            fresh = self._engine.execute_many(user_id, [requests[i] for i in missing])
+            for index, result in zip(missing, fresh):
+                results[index] = result
+                self._put(keys[index], version, result)
+        return results  # type: ignore[return-value]
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                entries=len(self._entries),
+                bytes=self._bytes,
+            )
+
+    def _get(self, key: tuple, version: tuple[int, int]) -> MetricResult | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.version != version:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry.result
+
+    def _put(self, key: tuple, version: tuple[int, int], result: MetricResult) -> None:
+        size = len(repr(result))
+        if size > self._max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous.size
+            self._entries[key] = _Entry(version, result, size)
+            self._bytes += size
+            while self._bytes > self._max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.size
+                self._evictions += 1
+
+
+def _key(user_id: UUID, spec: MetricSpec, query: MetricQuery) -> tuple:
+    """Everything that shapes the answer -- not ``query.key``, the widget's name."""
+    return (
+        user_id,
+        spec.id,
+        tuple(query.dimensions),
+        _freeze(query.filters),
+        query.grain,
+        query.period,
+        _freeze(query.params),
+    )
+
+
+def _freeze(values: dict[str, Any]) -> tuple:
+    return tuple(
+        (name, tuple(value) if isinstance(value, (list, tuple)) else value)
+        for name, value in sorted(values.items())
+    )
@@ -10,10 +10,17 @@ metric, executed through the same engine the widget uses, which is the whole
 point of the measure-level ``default_filters``: a second SUM written in this
 file would be a second place that has to remember transfers and excluded rows,
 and per docs/redesign-plan.md §1 one of the two always forgets.
+
+What is kept between renders is described on :class:`FinancialAdviceResolver`.
 """
 
 from __future__ import annotations
 
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable
+from dataclasses import dataclass, replace
+from datetime import date, timedelta
 from decimal import Decimal
 from typing import Any
 from uuid import UUID
@@ -27,6 +34,7 @@ from .....application.dtos.metrics import (
     ResolverContext,
     money,
 )
+from .....application.ports.outbound.cube import CubeReader
 from .....application.ports.outbound.metrics import MetricEngine
 from .....domain.metrics.catalog import MONTHLY_CASH_FLOW
 from .....domain.services.advisor import (
@@ -37,19 +45,61 @@ from .....domain.services.advisor import (
 )
 
 
+@dataclass(frozen=True)
+class _MonthVector:
+    """One user's monthly series and the advice on it, as of one data version."""
+
+    version: tuple[int, int]
+    #: ``YYYY-MM`` -> (the month's flow, the rows it rests on).
+    months: dict[str, tuple[MonthlyFlow, int]]
+    #: The flows oldest first, and every principle evaluated on them.
+    series: list[MonthlyFlow]
+    advice: list[Advice]
+
+    @classmethod
+    def evaluate(
+        cls, version: tuple[int, int], months: dict[str, tuple[MonthlyFlow, int]]
+    ) -> _MonthVector:
+        series = [months[m][0] for m in sorted(months)]
+        return cls(version, months, series, evaluate_principles(series))
+
+    @property
+    def source_count(self) -> int:
+        return sum(count for _, count in self.months.values())
+
+
 class FinancialAdviceResolver:
-    """Implements the :class:`MetricResolver` port for ``financial_advice``."""
+    """Implements the :class:`MetricResolver` port for ``financial_advice``.
+
+    Memoised per user under the cube's data version. The advice depends on
+    nothing but the monthly series, so a render under the version it was
+    computed at queries nothing and evaluates nothing: however many
+    principles :func:`evaluate_principles` grows to, they run once per
+    change to the user's facts, not once per dashboard.
+
+    The series is kept as a month vector. When the version moves, the cube
+    says which months the writes in between touched
+    (:meth:`~tomin.application.ports.outbound.cube.CubeReader.months_changed`)
+    and only those are read again, one month-aligned query per run of
+    consecutive months -- an upload touches one or two. When the cube cannot
+    tell (first use, a rebuild, a reader far behind), the whole history is
+    read, as before. At most ``max_users`` vectors are kept, least recently
+    used first out.
+    """
 
     metric_id = "financial_advice"
 
-    def __init__(self, engine: MetricEngine) -> None:
+    def __init__(self, engine: MetricEngine, versions: CubeReader, max_users: int = 1024) -> None:
         self._engine = engine
+        self._versions = versions
+        self._max_users = max_users
+        self._lock = threading.Lock()
+        self._vectors: OrderedDict[UUID, _MonthVector] = OrderedDict()
 
     def resolve(
         self, user_id: UUID, query: MetricQuery, ctx: ResolverContext
     ) -> MetricResult:
-        series, source_count = self._series(user_id, query)
-        advices = evaluate_principles(series)
+        vector = self._vector(user_id, query)
 
         return MetricResult(
             metric_id=ctx.spec.id,
@@ -58,52 +108,104 @@ class FinancialAdviceResolver:
             # No headline number: the answer is a sentence. A `0` here would be
             # read as an amount by every generic renderer that meets it.
             value=None,
-            rows=[_row(a) for a in advices],
+            rows=[_row(a) for a in vector.advice],
             meta=MetricMeta(
                 currency=DEFAULT_CURRENCY,
                 # Short history is a *partial* answer, not an empty one: the
                 # principle still renders, the frame says what is missing.
-                partial=len(series) < MIN_MONTHS_OF_HISTORY,
-                source_txn_count=source_count,
+                partial=len(vector.series) < MIN_MONTHS_OF_HISTORY,
+                source_txn_count=vector.source_count,
             ),
         )
 
     # --- the series ------------------------------------------------------
-    def _series(
-        self, user_id: UUID, query: MetricQuery
-    ) -> tuple[list[MonthlyFlow], int | None]:
-        """Monthly income/expense for the user, oldest first.
+    def _vector(self, user_id: UUID, query: MetricQuery) -> _MonthVector:
+        # Read before computing, as the metric cache does: a write landing
+        # mid-read leaves the vector labelled with the version it superseded,
+        # and the next render rereads that write's months.
+        version = self._versions.data_version(user_id)
+        with self._lock:
+            current = self._vectors.get(user_id)
+            if current is not None:
+                self._vectors.move_to_end(user_id)
+        if current is not None and current.version == version:
+            return current
+
+        changed = (
+            None
+            if current is None
+            else self._versions.months_changed(user_id, current.version, version)
+        )
+        if changed is None:
+            vector = _MonthVector.evaluate(version, self._months(user_id, query, [Period()]))
+        elif not changed:
+            # Only labels moved (a tag, a category name): same facts, same advice.
+            vector = replace(current, version=version)
+        else:
+            months = {m: v for m, v in current.months.items() if m not in changed}
+            months.update(self._months(user_id, query, _runs(changed)))
+            vector = _MonthVector.evaluate(version, months)
+
+        with self._lock:
+            self._vectors[user_id] = vector
+            self._vectors.move_to_end(user_id)
+            while len(self._vectors) > self._max_users:
+                self._vectors.popitem(last=False)
+        return vector
+
+    def _months(
+        self, user_id: UUID, query: MetricQuery, periods: list[Period]
+    ) -> dict[str, tuple[MonthlyFlow, int]]:
+        """Monthly income/expense within ``periods``, keyed by month.
 
         Deliberately unbounded in time rather than scoped to ``query.period``:
         the metric declares ``ignores_period`` because advice is a claim about
         the user's latest month against its own trailing history, and narrowing
         that to whatever the dashboard's period selector says would silently
-        redefine both "latest" and "baseline".
+        redefine both "latest" and "baseline". ``periods`` is the whole history
+        or the months being reread, never the dashboard's.
         """
-        result = self._engine.execute(
+        results = self._engine.execute_many(
             user_id,
-            MONTHLY_CASH_FLOW,
-            MetricQuery(
-                key=query.key,
-                metric=MONTHLY_CASH_FLOW.id,
-                grain="month",
-                period=Period(),
-            ),
+            [
+                (
+                    MONTHLY_CASH_FLOW,
+                    MetricQuery(
+                        key=query.key,
+                        metric=MONTHLY_CASH_FLOW.id,
+                        grain="month",
+                        period=period,
+                    ),
+                )
+                for period in periods
+            ],
         )
-        # The engine orders a series by its grain axis ascending, so "most
-        # recent last" is already true; sorting again keeps that a property of
-        # this file rather than an assumption about another one.
-        rows = sorted(result.rows, key=lambda r: str(r.get("month") or ""))
-        series = [
-            MonthlyFlow(
-                month=str(row.get("month")),
-                income=_decimal(row.get("income_amount")),
-                expense=_decimal(row.get("expense_amount")),
-            )
-            for row in rows
-            if row.get("month")
-        ]
-        return series, result.meta.source_txn_count
+        months: dict[str, tuple[MonthlyFlow, int]] = {}
+        for result in results:
+            for row, count in zip(result.rows, result.meta.row_counts, strict=True):
+                if not row.get("month"):
+                    continue
+                month = str(row["month"])
+                flow = MonthlyFlow(
+                    month=month,
+                    income=_decimal(row.get("income_amount")),
+                    expense=_decimal(row.get("expense_amount")),
+                )
+                months[month] = (flow, count)
+        return months
+
+
+def _runs(months: Iterable[str]) -> list[Period]:
+    """Consecutive ``YYYY-MM`` months folded into whole-month periods."""
+    periods: list[Period] = []
+    for month in sorted(months):
+        start = date.fromisoformat(f"{month}-01")
+        end = (start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+        if periods and periods[-1].end == start - timedelta(days=1):
+            periods[-1] = Period(periods[-1].start, end)
+        else:
+            periods.append(Period(start, end))
+    return periods
 
 
 def _row(advice: Advice) -> dict[str, Any]:
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import re
+from collections.abc import Iterable
 from datetime import date
 
 from ....application.dtos.extraction import ExtractedDocument, ParsedStatement, ParsedTransaction
@@ -15,17 +16,25 @@ class TextStatementParser:
 
     Each transaction line is expected to begin with a date and contain at
     least one monetary amount. Subclasses tune ``template_key`` / ``bank``.
+
+    Lines are consumed one at a time (:meth:`parse_lines`), so a streamed
+    document is parsed without its text ever being held whole.
     """
 
     template_key = "generic_bank"
     bank: str | None = None
 
     def parse(self, doc: ExtractedDocument) -> ParsedStatement:
-        default_year = self._detect_year(doc.text)
+        # For a streamed document `text` is the first page(s), which is where
+        # a statement prints its period.
+        return self.parse_lines(doc.iter_lines(), default_year=self._detect_year(doc.text))
+
+    def parse_lines(self, lines: Iterable[str], *, default_year: int) -> ParsedStatement:
         txs: list[ParsedTransaction] = []
-        dates: list[date] = []
+        first: date | None = None
+        last: date | None = None
 
-        for line in doc.lines or doc.text.splitlines():
+        for line in lines:
             found = find_leading_date(line, default_year)
             if not found:
                 continue
@@ -51,14 +60,15 @@ class TextStatementParser:
                     tx_type=TxType(tx_type),
                 )
             )
-            dates.append(tx_date)
+            first = tx_date if first is None else min(first, tx_date)
+            last = tx_date if last is None else max(last, tx_date)
 
         return ParsedStatement(
             source_type=SourceType.BANK_PDF,
             bank=self.bank,
             transactions=txs,
-            period_start=min(dates) if dates else None,
-            period_end=max(dates) if dates else None,
+            period_start=first,
+            period_end=last,
         )
 
     @staticmethod
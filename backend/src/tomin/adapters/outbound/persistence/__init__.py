@@ -7,6 +7,7 @@ from .repositories import (
     SqlMerchantRepository,
     SqlStatementRepository,
     SqlTagRepository,
+    SqlTransactionChangeLog,
     SqlTransactionRepository,
 )
 
@@ -19,5 +20,6 @@ __all__ = [
     "SqlMerchantRepository",
     "SqlStatementRepository",
     "SqlTagRepository",
+    "SqlTransactionChangeLog",
     "SqlTransactionRepository",
 ]
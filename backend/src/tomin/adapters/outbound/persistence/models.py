@@ -3,17 +3,21 @@ from __future__ import annotations
 from datetime import date, datetime
 
 from sqlalchemy import (
+    DDL,
     JSON,
+    BigInteger,
     Boolean,
     CheckConstraint,
     Date,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     Numeric,
     String,
     Text,
     UniqueConstraint,
+    event,
     false as sa_false,
     func,
 )
@@ -82,7 +86,12 @@ class TransactionModel(Base):
 
     # `amount` is always a non-negative magnitude; `tx_type` alone carries
     # direction (see docs/redesign-plan.md §2 "Sign convention").
-    __table_args__ = (CheckConstraint("amount >= 0", name="ck_transactions_amount_non_negative"),)
+    __table_args__ = (
+        CheckConstraint("amount >= 0", name="ck_transactions_amount_non_negative"),
+        # The list's sort key, (tx_date, id), under its tenant: a keyset page is
+        # one index range scan whatever its depth. See migration 0009.
+        Index("ix_transactions_user_date_id", "user_id", "tx_date", "id"),
+    )
 
     id: Mapped[str] = mapped_column(UUIDStr, primary_key=True)
     user_id: Mapped[str] = mapped_column(UUIDStr, index=True)
@@ -120,12 +129,66 @@ class TransactionModel(Base):
     is_cash_withdrawal: Mapped[bool] = mapped_column(
         Boolean, nullable=False, server_default=sa_false(), default=False
     )
+    # `categorization.normalize(description or raw_description)`, written by
+    # the repository on insert and edit. Search matches against this, so
+    # "cafe" finds "CAFÉ" exactly as the categorizer would. Indexed per dialect
+    # by the DDL below (and migration 0010).
+    search_text: Mapped[str | None] = mapped_column(String(500), nullable=True)
     created_at: Mapped[datetime] = _created_at()
     # Nullable rather than defaulted: a row that has never been edited has no
     # meaningful update time, and now() would claim one.
     updated_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
 
 
+#: Substring search over `transactions.search_text`. SQLite gets an FTS5 index
+#: with the trigram tokenizer -- it answers `LIKE '%term%'` from the index --
+#: kept in step by triggers; Postgres gets a pg_trgm GIN index, which serves
+#: the same LIKE directly. Declared here so `create_all` builds what migration
+#: 0010 does; the migration keeps its own frozen copy.
+SQLITE_SEARCH_DDL = (
+    (
+        "CREATE VIRTUAL TABLE transactions_fts USING fts5("
+        "search_text, content='transactions', content_rowid='rowid', tokenize='trigram')"
+    ),
+    (
+        "CREATE TRIGGER transactions_fts_ai AFTER INSERT ON transactions BEGIN "
+        "INSERT INTO transactions_fts(rowid, search_text) VALUES (new.rowid, new.search_text); "
+        "END"
+    ),
+    (
+        "CREATE TRIGGER transactions_fts_ad AFTER DELETE ON transactions BEGIN "
+        "INSERT INTO transactions_fts(transactions_fts, rowid, search_text) "
+        "VALUES ('delete', old.rowid, old.search_text); "
+        "END"
+    ),
+    (
+        "CREATE TRIGGER transactions_fts_au AFTER UPDATE OF search_text ON transactions BEGIN "
+        "INSERT INTO transactions_fts(transactions_fts, rowid, search_text) "
+        "VALUES ('delete', old.rowid, old.search_text); "
+        "INSERT INTO transactions_fts(rowid, search_text) VALUES (new.rowid, new.search_text); "
+        "END"
+    ),
+)
+POSTGRES_SEARCH_DDL = (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    (
+        "CREATE INDEX IF NOT EXISTS ix_transactions_search_trgm "
+        "ON transactions USING gin (search_text gin_trgm_ops)"
+    ),
+)
+
+for _statement in SQLITE_SEARCH_DDL:
+    event.listen(
+        TransactionModel.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite")
+    )
+for _statement in POSTGRES_SEARCH_DDL:
+    event.listen(
+        TransactionModel.__table__,
+        "after_create",
+        DDL(_statement).execute_if(dialect="postgresql"),
+    )
+
+
 class TagModel(Base):
     """A user-defined label. ``slug`` is unique *per user*, not globally.
 
@@ -176,6 +239,116 @@ class TransactionTagModel(Base):
     created_at: Mapped[datetime] = _created_at()
 
 
+class TransactionChangeModel(Base):
+    """The change log: one row per write to a transaction or to its tags.
+
+    Written by triggers (below, and migration 0011), never by the
+    repositories, so no write path -- the ORM, ``executemany``, ``COPY``, a
+    hand-run UPDATE -- can forget it. ``seq`` orders the log; the cube keeps,
+    per user, the last ``seq`` it has applied, and catching up is re-reading
+    the transactions named after it. The rows say *which* transaction, not
+    what happened: the current row, or its absence, is the whole answer.
+
+    ``sqlite_autoincrement`` so a ``seq`` is never handed out twice, even
+    after the rows holding the highest ones are pruned.
+    """
+
+    __tablename__ = "transaction_changes"
+    __table_args__ = (
+        Index("ix_transaction_changes_user_seq", "user_id", "seq"),
+        {"sqlite_autoincrement": True},
+    )
+
+    seq: Mapped[int] = mapped_column(
+        BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True
+    )
+    user_id: Mapped[str] = mapped_column(UUIDStr)
+    transaction_id: Mapped[str] = mapped_column(UUIDStr)
+    created_at: Mapped[datetime] = _created_at()
+
+
+#: The triggers that fill `transaction_changes`. Row triggers on SQLite;
+#: statement triggers with transition tables on PostgreSQL, so a bulk insert
+#: logs its rows in one INSERT ... SELECT rather than one call per row. A tag
+#: change is logged against its transaction; one whose transaction is being
+#: deleted finds no row, and the delete logs it instead. Declared here so
+#: `create_all` builds what migration 0011 does; the migration keeps its own
+#: frozen copy. Idempotent (`IF NOT EXISTS`, `OR REPLACE` -- PostgreSQL 14+)
+#: because, hung on the metadata, they run on every `create_all`.
+SQLITE_CHANGE_LOG_DDL = (
+    (
+        "CREATE TRIGGER IF NOT EXISTS transaction_changes_ai AFTER INSERT ON transactions "
+        "BEGIN INSERT INTO transaction_changes (user_id, transaction_id) VALUES (new.user_id, "
+        "new.id); END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS transaction_changes_au AFTER UPDATE ON transactions "
+        "BEGIN INSERT INTO transaction_changes (user_id, transaction_id) VALUES (new.user_id, "
+        "new.id); END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS transaction_changes_ad AFTER DELETE ON transactions "
+        "BEGIN INSERT INTO transaction_changes (user_id, transaction_id) VALUES (old.user_id, "
+        "old.id); END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS transaction_changes_tag_ai AFTER INSERT ON "
+        "transaction_tags BEGIN INSERT INTO transaction_changes (user_id, transaction_id) "
+        "SELECT user_id, id FROM transactions WHERE id = new.transaction_id; END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS transaction_changes_tag_ad AFTER DELETE ON "
+        "transaction_tags BEGIN INSERT INTO transaction_changes (user_id, transaction_id) "
+        "SELECT user_id, id FROM transactions WHERE id = old.transaction_id; END"
+    ),
+)
+POSTGRES_CHANGE_LOG_DDL = (
+    (
+        "CREATE OR REPLACE FUNCTION log_transaction_changes() RETURNS trigger LANGUAGE "
+        "plpgsql AS $$ BEGIN INSERT INTO transaction_changes (user_id, transaction_id) SELECT "
+        "user_id, id FROM changed_rows; RETURN NULL; END $$"
+    ),
+    (
+        "CREATE OR REPLACE FUNCTION log_transaction_tag_changes() RETURNS trigger LANGUAGE "
+        "plpgsql AS $$ BEGIN INSERT INTO transaction_changes (user_id, transaction_id) SELECT "
+        "t.user_id, t.id FROM transactions t WHERE t.id IN (SELECT transaction_id FROM "
+        "changed_rows); RETURN NULL; END $$"
+    ),
+    (
+        "CREATE OR REPLACE TRIGGER transaction_changes_ai AFTER INSERT ON transactions "
+        "REFERENCING NEW TABLE AS changed_rows FOR EACH STATEMENT EXECUTE FUNCTION "
+        "log_transaction_changes()"
+    ),
+    (
+        "CREATE OR REPLACE TRIGGER transaction_changes_au AFTER UPDATE ON transactions "
+        "REFERENCING NEW TABLE AS changed_rows FOR EACH STATEMENT EXECUTE FUNCTION "
+        "log_transaction_changes()"
+    ),
+    (
+        "CREATE OR REPLACE TRIGGER transaction_changes_ad AFTER DELETE ON transactions "
+        "REFERENCING OLD TABLE AS changed_rows FOR EACH STATEMENT EXECUTE FUNCTION "
+        "log_transaction_changes()"
+    ),
+    (
+        "CREATE OR REPLACE TRIGGER transaction_changes_tag_ai AFTER INSERT ON "
+        "transaction_tags REFERENCING NEW TABLE AS changed_rows FOR EACH STATEMENT EXECUTE "
+        "FUNCTION log_transaction_tag_changes()"
+    ),
+    (
+        "CREATE OR REPLACE TRIGGER transaction_changes_tag_ad AFTER DELETE ON "
+        "transaction_tags REFERENCING OLD TABLE AS changed_rows FOR EACH STATEMENT EXECUTE "
+        "FUNCTION log_transaction_tag_changes()"
+    ),
+)
+
+# On the metadata rather than a table: the triggers need `transactions`,
+# `transaction_tags` and the log all in place, whatever order they come in.
+for _statement in SQLITE_CHANGE_LOG_DDL:
+    event.listen(Base.metadata, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+for _statement in POSTGRES_CHANGE_LOG_DDL:
+    event.listen(Base.metadata, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
+
+
 class DashboardModel(Base):
     __tablename__ = "dashboards"
 
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+import io
+import itertools
 from collections.abc import Iterator
 from datetime import date
 from decimal import Decimal
 from uuid import UUID
 
-from sqlalchemy import delete, func, select
+from sqlalchemy import bindparam, delete, func, insert, or_, select, text, tuple_, update
 from sqlalchemy.exc import IntegrityError
 
 from ....application.ports.outbound.repositories import DuplicateTagError
@@ -20,6 +22,7 @@ from ....domain.entities import (
     Tag,
     Transaction,
 )
+from ....domain.services.categorization import normalize
 from ....domain.value_objects.enums import (
     SourceType,
     StatementStatus,
@@ -36,6 +39,7 @@ from .models import (
     MerchantModel,
     StatementModel,
     TagModel,
+    TransactionChangeModel,
     TransactionModel,
     TransactionTagModel,
 )
@@ -83,6 +87,81 @@ def _tags_for_user(session, user_id: str) -> dict[str, list[UUID]]:
     return grouped
 
 
+def _search_text(t: Transaction) -> str:
+    """What ``?search=`` matches against; see ``TransactionModel.search_text``."""
+    return normalize(t.description or t.raw_description)
+
+
+def _transaction_row(t: Transaction) -> dict:
+    """A new ``transactions`` row, by column name, for the bulk insert paths.
+
+    ``created_at`` is left to the server default and ``updated_at`` to NULL,
+    as the ORM insert did.
+    """
+    return {
+        "id": _u(t.id),
+        "user_id": _u(t.user_id),
+        "statement_id": _u(t.statement_id) if t.statement_id else None,
+        "tx_date": t.tx_date,
+        "raw_description": t.raw_description,
+        "description": t.description,
+        "amount": t.amount,
+        "currency": t.currency,
+        "tx_type": t.tx_type.value,
+        "status": t.status.value,
+        "category_id": _u(t.category_id) if t.category_id else None,
+        "merchant_id": _u(t.merchant_id) if t.merchant_id else None,
+        "category_source": t.category_source,
+        "notes": t.notes,
+        "excluded_from_stats": t.excluded_from_stats,
+        "is_transfer": t.is_transfer,
+        "is_cash_withdrawal": t.is_cash_withdrawal,
+        "search_text": _search_text(t),
+    }
+
+
+def _copy_csv(rows: list[dict]) -> str:
+    """``rows`` as COPY's CSV: every value quoted, NULL as an unquoted blank.
+
+    Quoting everything is what keeps ``""`` (an empty description) and NULL
+    apart, which the ``csv`` module's minimal quoting would not.
+    """
+    lines = []
+    for row in rows:
+        lines.append(
+            ",".join(
+                "" if value is None else '"' + str(value).replace('"', '""') + '"'
+                for value in row.values()
+            )
+        )
+    return "\n".join(lines) + "\n"
+
+
+def _copy_rows(session, rows: list[dict]) -> bool:
+    """Stream ``rows`` into ``transactions`` with ``COPY FROM STDIN``.
+
+    Returns False, with nothing written, when the server refuses: PostgreSQL
+    rejects ``COPY FROM`` into a table whose row-level security applies to the
+    connecting role (0003 enables it; the table owner is exempt). The caller
+    then inserts the same rows with ``executemany``.
+    """
+    columns = ", ".join(rows[0])
+    cursor = session.connection().connection.cursor()
+    try:
+        with session.begin_nested():
+            cursor.copy_expert(
+                f"COPY transactions ({columns}) FROM STDIN WITH (FORMAT csv)",
+                io.StringIO(_copy_csv(rows)),
+            )
+    except Exception as exc:
+        if getattr(exc, "pgcode", None) != "0A000":  # feature_not_supported
+            raise
+        return False
+    finally:
+        cursor.close()
+    return True
+
+
 def _to_transaction(m: TransactionModel, tag_ids: list[UUID] | None = None) -> Transaction:
     return Transaction(
         tag_ids=list(tag_ids or []),
@@ -112,29 +191,20 @@ class SqlTransactionRepository:
         self._db = db
 
     def add_many(self, transactions: list[Transaction]) -> None:
+        """Insert a batch of new transactions in one round of statements.
+
+        Core, not ORM: the rows are write-once at this point, so an identity
+        map, per-object flush bookkeeping and attribute instrumentation buy
+        nothing. On PostgreSQL over psycopg2 the batch is streamed with
+        ``COPY``; everywhere else it is a single ``executemany``.
+        """
+        if not transactions:
+            return
+        rows = [_transaction_row(t) for t in transactions]
         with self._db.session() as s:
-            for t in transactions:
-                s.add(
-                    TransactionModel(
-                        id=_u(t.id),
-                        user_id=_u(t.user_id),
-                        statement_id=_u(t.statement_id) if t.statement_id else None,
-                        tx_date=t.tx_date,
-                        raw_description=t.raw_description,
-                        description=t.description,
-                        amount=t.amount,
-                        currency=t.currency,
-                        tx_type=t.tx_type.value,
-                        status=t.status.value,
-                        category_id=_u(t.category_id) if t.category_id else None,
-                        merchant_id=_u(t.merchant_id) if t.merchant_id else None,
-                        category_source=t.category_source,
-                        notes=t.notes,
-                        excluded_from_stats=t.excluded_from_stats,
-                        is_transfer=t.is_transfer,
-                        is_cash_withdrawal=t.is_cash_withdrawal,
-                    )
-                )
+            if self._db.engine.dialect.driver == "psycopg2" and _copy_rows(s, rows):
+                return
+            s.execute(insert(TransactionModel.__table__), rows)
 
     def get(self, transaction_id: UUID) -> Transaction | None:
         with self._db.session() as s:
@@ -176,6 +246,7 @@ class SqlTransactionRepository:
             if m is None:
                 return
             m.description = transaction.description
+            m.search_text = _search_text(transaction)
             m.category_id = (
                 _u(transaction.category_id) if transaction.category_id else None
             )
@@ -193,9 +264,31 @@ class SqlTransactionRepository:
         if category_id:
             stmt = stmt.where(TransactionModel.category_id == _u(category_id))
         if search:
-            stmt = stmt.where(TransactionModel.description.ilike(f"%{search}%"))
+            stmt = self._search(stmt, normalize(search))
         return stmt
 
+    def _search(self, stmt, term: str):
+        """Substring match on the folded description, through its index.
+
+        ``normalize`` strips ``%`` and ``_`` along with the rest of the
+        punctuation, so the term is safe to splice into a LIKE pattern. A term
+        that folds to nothing ("¿?") filters nothing, as an empty box would.
+        """
+        if not term:
+            return stmt
+        pattern = f"%{term}%"
+        # The trigram index only holds three-character grams; shorter terms
+        # fall through to the plain LIKE, over rows already narrowed by user.
+        if self._db.engine.dialect.name == "sqlite" and len(term) >= 3:
+            return stmt.where(
+                text(
+                    "transactions.rowid IN (SELECT rowid FROM transactions_fts "
+                    "WHERE transactions_fts.search_text LIKE :search_pattern)"
+                ).bindparams(search_pattern=pattern)
+            )
+        # PostgreSQL's pg_trgm GIN index serves this LIKE as written.
+        return stmt.where(TransactionModel.search_text.like(pattern))
+
     def list_for_user(
         self,
         user_id: UUID,
@@ -206,11 +299,23 @@ class SqlTransactionRepository:
         search: str | None = None,
         limit: int = 100,
         offset: int = 0,
+        after: tuple[date, UUID] | None = None,
     ) -> list[Transaction]:
         with self._db.session() as s:
+            stmt = self._base_query(user_id, start, end, category_id, search)
+            if after is not None:
+                # Row-value comparison, so both dialects can walk
+                # ix_transactions_user_date_id from the cursor instead of
+                # counting their way to an offset.
+                after_date, after_id = after
+                stmt = stmt.where(
+                    tuple_(TransactionModel.tx_date, TransactionModel.id)
+                    < tuple_(after_date, _u(after_id))
+                )
             stmt = (
-                self._base_query(user_id, start, end, category_id, search)
-                .order_by(TransactionModel.tx_date.desc())
+                # `id` breaks date ties, so the order is total and a row can
+                # neither repeat nor vanish between two pages.
+                stmt.order_by(TransactionModel.tx_date.desc(), TransactionModel.id.desc())
                 .limit(limit)
                 .offset(offset)
             )
@@ -238,6 +343,69 @@ class SqlTransactionRepository:
             for m in s.scalars(stmt):
                 yield _to_transaction(m, tags.get(m.id))
 
+    def update_classification_many(self, transactions: list[Transaction]) -> int:
+        """One ``executemany`` UPDATE, guarded on ``category_source``.
+
+        The guard is in the statement rather than in the caller so that a user
+        edit committed between the caller's read and this write still wins.
+        The count is the driver's total over the executemany, which is what
+        the guard let through.
+        """
+        if not transactions:
+            return 0
+        table = TransactionModel.__table__
+        stmt = (
+            update(table)
+            .where(
+                table.c.id == bindparam("_id"),
+                or_(table.c.category_source == "auto", table.c.category_source.is_(None)),
+            )
+            .values(category_id=bindparam("_category_id"), merchant_id=bindparam("_merchant_id"))
+        )
+        with self._db.session() as s:
+            result = s.execute(
+                stmt,
+                [
+                    {
+                        "_id": _u(t.id),
+                        "_category_id": _u(t.category_id) if t.category_id else None,
+                        "_merchant_id": _u(t.merchant_id) if t.merchant_id else None,
+                    }
+                    for t in transactions
+                ],
+            )
+            return result.rowcount
+
+    def update_flags_many(self, transactions: list[Transaction]) -> None:
+        if not transactions:
+            return
+        table = TransactionModel.__table__
+        stmt = (
+            update(table)
+            .where(table.c.id == bindparam("_id"))
+            .values(
+                is_transfer=bindparam("_is_transfer"),
+                is_cash_withdrawal=bindparam("_is_cash_withdrawal"),
+            )
+        )
+        with self._db.session() as s:
+            s.execute(
+                stmt,
+                [
+                    {
+                        "_id": _u(t.id),
+                        "_is_transfer": t.is_transfer,
+                        "_is_cash_withdrawal": t.is_cash_withdrawal,
+                    }
+                    for t in transactions
+                ],
+            )
+
+    def user_ids(self) -> list[UUID]:
+        with self._db.session() as s:
+            stmt = select(TransactionModel.user_id).distinct().order_by(TransactionModel.user_id)
+            return [UUID(u) for u in s.scalars(stmt)]
+
     def count_for_user(self, user_id: UUID, **filters) -> int:
         with self._db.session() as s:
             stmt = self._base_query(
@@ -284,6 +452,8 @@ class SqlStatementRepository:
                 s.add(self._to_model(statement))
             else:
                 m.status = statement.status.value
+                m.source_type = statement.source_type.value
+                m.file_hash = statement.file_hash
                 m.period_start = statement.period_start
                 m.period_end = statement.period_end
                 m.bank = statement.bank
@@ -316,6 +486,15 @@ class SqlStatementRepository:
             )
             return s.scalar(stmt) is not None
 
+    def fail_unfinished(self) -> int:
+        with self._db.session() as s:
+            result = s.execute(
+                update(StatementModel)
+                .where(StatementModel.status == StatementStatus.PROCESSING.value)
+                .values(status=StatementStatus.FAILED.value, file_hash=None)
+            )
+            return result.rowcount
+
     @staticmethod
     def _to_model(st: Statement) -> StatementModel:
         return StatementModel(
@@ -529,6 +708,8 @@ class SqlDashboardRepository:
 class SqlCategoryRepository:
     def __init__(self, db: Database) -> None:
         self._db = db
+        self._writes = itertools.count(1)
+        self._version = 0
 
     def get_all(self) -> list[Category]:
         with self._db.session() as s:
@@ -555,6 +736,15 @@ class SqlCategoryRepository:
                         categorization_labels=list(c.categorization_labels),
                     )
                 )
+        self._version = next(self._writes)
+
+    def version(self) -> int:
+        """Bumped after each committed write.
+
+        In-process only, like the categorizer cache it keys: a write from
+        another process (a seed run from the shell, say) is seen on restart.
+        """
+        return self._version
 
 
 class SqlTagRepository:
@@ -689,9 +879,66 @@ class SqlTagRepository:
         )
 
 
+class SqlTransactionChangeLog:
+    """``transaction_changes``, which triggers fill (see the model)."""
+
+    #: How long :meth:`horizon` waits for writes in flight before giving up.
+    LOCK_TIMEOUT = "5s"
+
+    def __init__(self, db: Database) -> None:
+        self._db = db
+
+    def horizon(self) -> int:
+        """``max(seq)``, once no write can still commit a smaller one.
+
+        On PostgreSQL a sequence hands out numbers in statement order but
+        transactions commit in any order, so a reader can see 11 while 10 is
+        still uncommitted -- and a mark moved to 11 would skip 10 for good. A
+        ``SHARE`` lock on the log waits for the writers holding it and briefly
+        holds off new ones; ``max(seq)`` is then final. SQLite runs one writer
+        at a time, so commit order is ``seq`` order already.
+        """
+        with self._db.session() as s:
+            if self._db.engine.dialect.name == "postgresql":
+                s.execute(text(f"SET LOCAL lock_timeout = '{self.LOCK_TIMEOUT}'"))
+                s.execute(text("LOCK TABLE transaction_changes IN SHARE MODE"))
+            return s.scalar(select(func.max(TransactionChangeModel.seq))) or 0
+
+    def first_seq(self) -> int | None:
+        with self._db.session() as s:
+            return s.scalar(select(func.min(TransactionChangeModel.seq)))
+
+    def changed_since(self, user_id: UUID, after: int, upto: int) -> list[UUID]:
+        with self._db.session() as s:
+            stmt = (
+                select(TransactionChangeModel.transaction_id)
+                .where(
+                    TransactionChangeModel.user_id == _u(user_id),
+                    TransactionChangeModel.seq > after,
+                    TransactionChangeModel.seq <= upto,
+                )
+                .distinct()
+            )
+            return [UUID(t) for t in s.scalars(stmt)]
+
+    def user_ids(self) -> list[UUID]:
+        with self._db.session() as s:
+            stmt = select(TransactionChangeModel.user_id).distinct()
+            return [UUID(u) for u in s.scalars(stmt)]
+
+    def prune(self, before: int) -> int:
+        with self._db.session() as s:
+            result = s.execute(
+                delete(TransactionChangeModel).where(TransactionChangeModel.seq < before)
+            )
+            return result.rowcount or 0
+
+
 class SqlMerchantRepository:
     def __init__(self, db: Database) -> None:
         self._db = db
+        self._writes = itertools.count(1)
+        self._version = 0
 
     def get_all(self) -> list[Merchant]:
         with self._db.session() as s:
@@ -704,3 +951,8 @@ class SqlMerchantRepository:
         with self._db.session() as s:
             for m in merchants:
                 s.add(MerchantModel(id=_u(m.id), name=m.name, labels=list(m.labels)))
+        self._version = next(self._writes)
+
+    def version(self) -> int:
+        """See :meth:`SqlCategoryRepository.version`."""
+        return self._version
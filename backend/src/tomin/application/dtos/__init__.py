@@ -1,15 +1,18 @@
-from .extraction import ExtractedDocument, ParsedStatement, ParsedTransaction
 from .analytics import (
     CategorySpend,
     MonthlyPoint,
     RecurringItem,
     SpendingSummary,
 )
+from .extraction import ExtractedDocument, ParsedStatement, ParsedTransaction
+from .jobs import Job, JobState
 
 __all__ = [
     "ExtractedDocument",
     "ParsedStatement",
     "ParsedTransaction",
+    "Job",
+    "JobState",
     "CategorySpend",
     "MonthlyPoint",
     "RecurringItem",
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections.abc import Callable, Iterator
 from dataclasses import dataclass, field
 from datetime import date
 from decimal import Decimal
@@ -14,6 +15,12 @@ class ExtractedDocument:
     Produced by an :class:`Extractor` adapter. ``kind`` tells downstream
     components whether to expect free text (bank PDFs/OCR) or structured XML
     (SAT CFDI).
+
+    A text document may be *streamed*: ``stream`` then re-reads the source and
+    yields its lines page by page, and ``text``/``lines`` hold only the leading
+    page(s) -- enough to classify the template and find the statement year --
+    so a long statement never has its full text resident. Consumers that want
+    every line call :meth:`iter_lines`, which works either way.
     """
 
     kind: str  # "text" | "xml"
@@ -22,6 +29,12 @@ class ExtractedDocument:
     lines: list[str] = field(default_factory=list)
     xml: str | None = None
     mime: str | None = None
+    stream: Callable[[], Iterator[str]] | None = None
+
+    def iter_lines(self) -> Iterator[str]:
+        if self.stream is not None:
+            return self.stream()
+        return iter(self.lines or self.text.splitlines())
 
 
 @dataclass
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from typing import Any
+from uuid import UUID
+
+
+class JobState(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+@dataclass(frozen=True)
+class Job:
+    """A snapshot of background work; the queue replaces it as state moves on."""
+
+    id: UUID
+    owner_id: UUID
+    lane: str
+    state: JobState
+    submitted_at: datetime
+    #: What the work is about -- a statement id for an ingestion, say -- so a
+    #: status poll can find it before, or without, a result.
+    subject_id: UUID | None = None
+    finished_at: datetime | None = None
+    result: Any = None
+    error: str | None = None
@@ -61,6 +61,10 @@ class MetricMeta:
     overlapping: bool = False
     partial: bool = False
     source_txn_count: int | None = None
+    #: ``source_txn_count`` row by row, in ``rows`` order, when the engine
+    #: counted per row. Internal: for a caller that keeps rows from several
+    #: answers (see the advice resolver), never serialized.
+    row_counts: tuple[int, ...] = ()
 
 
 @dataclass(frozen=True)
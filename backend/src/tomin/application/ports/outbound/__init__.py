@@ -1,5 +1,6 @@
 from .cube import CubeReader, CubeWriter
 from .extraction import Extractor, ParserFactory, StatementParser, TemplateClassifier
+from .jobs import JobQueue
 from .metrics import MetricEngine, MetricResolver
 from .repositories import (
     AccountRepository,
@@ -10,6 +11,7 @@ from .repositories import (
     MerchantRepository,
     StatementRepository,
     TagRepository,
+    TransactionChangeLog,
     TransactionRepository,
 )
 from .storage import FileStorage
@@ -23,6 +25,7 @@ __all__ = [
     "MerchantRepository",
     "StatementRepository",
     "TagRepository",
+    "TransactionChangeLog",
     "TransactionRepository",
     "Extractor",
     "TemplateClassifier",
@@ -33,4 +36,5 @@ __all__ = [
     "MetricEngine",
     "MetricResolver",
     "FileStorage",
+    "JobQueue",
 ]
@@ -2,16 +2,22 @@ from __future__ import annotations
 
 from collections.abc import Iterable
 from datetime import date
+from pathlib import Path
 from typing import Protocol, runtime_checkable
 from uuid import UUID
 
 from ....domain.entities import Tag, Transaction
+from ....domain.services.recurrence import RecurrenceStats
 from ...dtos.analytics import CategorySpend, MonthlyPoint, SpendingSummary
 
 
 @runtime_checkable
 class CubeWriter(Protocol):
-    """Feeds structured transactions into the analytics cube (DuckDB)."""
+    """Feeds structured transactions into the analytics cube (DuckDB).
+
+    Every method advances :meth:`CubeReader.data_version` for the users whose
+    answers it changes, which is what lets a cache sit in front of the reads.
+    """
 
     def upsert_transactions(self, transactions: list[Transaction]) -> None: ...
 
@@ -25,11 +31,33 @@ class CubeWriter(Protocol):
         """Drop a deleted tag from the dimension and the bridge."""
         ...
 
-    def rebuild_for_user(self, user_id: UUID, transactions: Iterable[Transaction]) -> int:
+    def rebuild_for_user(
+        self, user_id: UUID, transactions: Iterable[Transaction], *, mark: int | None = None
+    ) -> int:
         """Drop this user's facts and re-derive them from ``transactions``.
 
         Returns the number of rows written. The caller supplies the source data
-        so that the cube adapter never depends on a repository.
+        so that the cube adapter never depends on a repository. ``mark``, when
+        given, is recorded as the user's :meth:`sync_mark` in the same commit.
+        """
+        ...
+
+    def sync_mark(self, user_id: UUID) -> int | None:
+        """The last change-log ``seq`` applied for this user; None if never synced."""
+        ...
+
+    def apply_changes(
+        self,
+        user_id: UUID,
+        transactions: list[Transaction],
+        deleted_ids: list[UUID],
+        *,
+        mark: int | None = None,
+    ) -> None:
+        """Upsert ``transactions`` and drop ``deleted_ids`` in one commit.
+
+        ``mark``, when given, becomes the user's :meth:`sync_mark` in that
+        same commit, so the mark never runs ahead of what it vouches for.
         """
         ...
 
@@ -57,3 +85,29 @@ class CubeReader(Protocol):
     ) -> list[CategorySpend]: ...
 
     def monthly_series(self, user_id: UUID, months: int = 12) -> list[MonthlyPoint]: ...
+
+    def recurrence_stats(self, user_id: UUID, min_occurrences: int = 2) -> list[RecurrenceStats]:
+        """Expense aggregates per normalized description, over the whole history."""
+        ...
+
+    def data_version(self, user_id: UUID) -> tuple[int, int]:
+        """Changes whenever a write could change this user's answers.
+
+        Opaque: compare for equality, never for order.
+        """
+        ...
+
+    def months_changed(
+        self, user_id: UUID, since: tuple[int, int], until: tuple[int, int]
+    ) -> frozenset[str] | None:
+        """``YYYY-MM`` months whose facts changed between two :meth:`data_version` tokens.
+
+        ``None`` when the cube cannot tell; the caller rereads everything.
+        """
+        ...
+
+    def export_parquet(
+        self, directory: str | Path, *, user_id: UUID | None = None, tables: Iterable[str] = ...
+    ) -> dict[str, int]:
+        """One ``<table>.parquet`` per cube table in ``directory``; rows written per table."""
+        ...
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Any, Protocol, runtime_checkable
+from uuid import UUID
+
+from ...dtos.jobs import Job
+
+
+@runtime_checkable
+class JobQueue(Protocol):
+    """Runs work after the request that submitted it has returned.
+
+    Work is grouped into named *lanes*, each with its own concurrency bound,
+    so one kind of slow job cannot starve the others of workers. Whatever
+    ``work`` returns becomes :attr:`Job.result`; whatever it raises becomes
+    :attr:`Job.error`. The queue never re-raises.
+    """
+
+    def submit(
+        self,
+        *,
+        owner_id: UUID,
+        lane: str,
+        work: Callable[[], Any],
+        subject_id: UUID | None = None,
+    ) -> Job: ...
+
+    def get(self, job_id: UUID) -> Job | None: ...
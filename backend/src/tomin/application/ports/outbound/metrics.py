@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections.abc import Sequence
 from typing import Protocol, runtime_checkable
 from uuid import UUID
 
@@ -18,6 +19,17 @@ class MetricEngine(Protocol):
 
     def execute(self, user_id: UUID, spec: MetricSpec, query: MetricQuery) -> MetricResult: ...
 
+    def execute_many(
+        self, user_id: UUID, requests: Sequence[tuple[MetricSpec, MetricQuery]]
+    ) -> list[MetricResult]:
+        """Answer several queries for one user, in order.
+
+        An adapter may share work between them; the results must be the ones
+        :meth:`execute` would give. Raises if any of them fails -- the caller
+        isolates by retrying one at a time.
+        """
+        ...
+
 
 @runtime_checkable
 class MetricResolver(Protocol):
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from collections.abc import Iterator
+from datetime import date
 from typing import Protocol, runtime_checkable
 from uuid import UUID
 
@@ -32,7 +33,14 @@ class TransactionRepository(Protocol):
         search: str | None = None,
         limit: int = 100,
         offset: int = 0,
-    ) -> list[Transaction]: ...
+        after: tuple[date, UUID] | None = None,
+    ) -> list[Transaction]:
+        """Newest first, ordered by ``(tx_date, id)`` descending.
+
+        ``after`` is the ``(tx_date, id)`` of the last row of the previous page;
+        only rows strictly past it come back.
+        """
+        ...
 
     def count_for_user(self, user_id: UUID, **filters) -> int: ...
 
@@ -73,6 +81,23 @@ class TransactionRepository(Protocol):
         """
         ...
 
+    def update_classification_many(self, transactions: list[Transaction]) -> int:
+        """Write back category and merchant for rows re-classified in bulk.
+
+        Only rows whose ``category_source`` is still ``"auto"`` (or unset) are
+        written: a correction the user made after the rows were read is kept.
+        Returns how many rows were written.
+        """
+        ...
+
+    def update_flags_many(self, transactions: list[Transaction]) -> None:
+        """Write back ``is_transfer`` and ``is_cash_withdrawal`` for re-derived rows."""
+        ...
+
+    def user_ids(self) -> list[UUID]:
+        """Every user that owns at least one transaction, for fleet-wide passes."""
+        ...
+
 
 @runtime_checkable
 class StatementRepository(Protocol):
@@ -88,6 +113,15 @@ class StatementRepository(Protocol):
 
     def exists_hash(self, user_id: UUID, file_hash: str) -> bool: ...
 
+    def fail_unfinished(self) -> int:
+        """Mark every ``PROCESSING`` statement ``FAILED`` and release its hash.
+
+        For server startup: a statement still processing then belonged to a
+        job that died with the last server process. Returns how many there
+        were.
+        """
+        ...
+
 
 @runtime_checkable
 class AccountRepository(Protocol):
@@ -163,15 +197,57 @@ class TagRepository(Protocol):
         ...
 
 
+@runtime_checkable
+class TransactionChangeLog(Protocol):
+    """Which transactions changed, in commit order, numbered by ``seq``.
+
+    Every write to a transaction or its tags adds an entry naming the
+    transaction. Entries say nothing of what changed: a reader re-reads the
+    transaction, and one that is gone was deleted.
+    """
+
+    def horizon(self) -> int:
+        """The highest ``seq`` such that no write still in flight can add one at or below it.
+
+        Everything up to here can be read now and will never grow. 0 for an
+        empty log.
+        """
+        ...
+
+    def first_seq(self) -> int | None:
+        """The oldest ``seq`` still kept; anything before it has been pruned."""
+        ...
+
+    def changed_since(self, user_id: UUID, after: int, upto: int) -> list[UUID]:
+        """The user's transactions with an entry in ``(after, upto]``, each once."""
+        ...
+
+    def user_ids(self) -> list[UUID]:
+        """Every user with an entry, deleted-out users included."""
+        ...
+
+    def prune(self, before: int) -> int:
+        """Drop the entries below ``before``. Returns how many went."""
+        ...
+
+
 @runtime_checkable
 class CategoryRepository(Protocol):
     def get_all(self) -> list[Category]: ...
 
     def add_many(self, categories: list[Category]) -> None: ...
 
+    def version(self) -> int:
+        """A token that changes whenever a write through this repository commits."""
+        ...
+
 
 @runtime_checkable
 class MerchantRepository(Protocol):
     def get_all(self) -> list[Merchant]: ...
 
     def add_many(self, merchants: list[Merchant]) -> None: ...
+
+    def version(self) -> int:
+        """A token that changes whenever a write through this repository commits."""
+        ...
@@ -1,17 +1,28 @@
+from .backfill_flags import BackfillFlagsUseCase, FlagBackfillResult
+from .categorizer import CategorizerCache
 from .dashboards import GetHomeDashboardUseCase, SaveHomeDashboardUseCase
 from .detect_recurring import DetectRecurringUseCase
-from .forecast import GetForecastUseCase, SimulateForecastUseCase
+from .export_cube import ExportCubeResult, ExportCubeUseCase
+from .forecast import GetForecastBandsUseCase, GetForecastUseCase, SimulateForecastUseCase
 from .get_spending_summary import GetSpendingSummaryUseCase
 from .goals import ManageGoalsUseCase
-from .list_transactions import ListTransactionsUseCase
+from .ingest_statement import (
+    IngestionJobNotFoundError,
+    IngestionStatus,
+    IngestStatementUseCase,
+)
+from .list_transactions import InvalidCursorError, ListTransactionsUseCase, TransactionPage
 from .metrics import GetMetricCatalogUseCase, RunMetricQueriesUseCase
 from .process_file import ProcessFileResult, ProcessFileUseCase
 from .rebuild_cube import RebuildCubeResult, RebuildCubeUseCase
+from .rebuild_fleet import FleetRebuildResult, RebuildFleetUseCase
+from .recategorize import RecategorizeResult, RecategorizeTransactionsUseCase
 from .statements import (
     DeleteStatementResult,
     ManageStatementsUseCase,
     StatementNotFoundError,
 )
+from .sync_cube import CubeSyncResult, SyncCubeUseCase
 from .tags import ManageTagsUseCase, TagNotFoundError
 from .update_transaction import (
     UNSET,
@@ -22,12 +33,24 @@ from .update_transaction import (
 
 __all__ = [
     "UNSET",
+    "BackfillFlagsUseCase",
+    "CategorizerCache",
+    "CubeSyncResult",
     "DeleteStatementResult",
     "DetectRecurringUseCase",
+    "ExportCubeResult",
+    "ExportCubeUseCase",
+    "FlagBackfillResult",
+    "FleetRebuildResult",
+    "GetForecastBandsUseCase",
     "GetForecastUseCase",
     "GetHomeDashboardUseCase",
     "GetMetricCatalogUseCase",
     "GetSpendingSummaryUseCase",
+    "IngestStatementUseCase",
+    "IngestionJobNotFoundError",
+    "IngestionStatus",
+    "InvalidCursorError",
     "ListTransactionsUseCase",
     "ManageGoalsUseCase",
     "ManageStatementsUseCase",
@@ -36,12 +59,17 @@ __all__ = [
     "ProcessFileUseCase",
     "RebuildCubeResult",
     "RebuildCubeUseCase",
+    "RebuildFleetUseCase",
+    "RecategorizeResult",
+    "RecategorizeTransactionsUseCase",
     "RunMetricQueriesUseCase",
     "SaveHomeDashboardUseCase",
     "SimulateForecastUseCase",
     "StatementNotFoundError",
+    "SyncCubeUseCase",
     "TagNotFoundError",
     "TransactionNotFoundError",
+    "TransactionPage",
     "UnknownCategoryError",
     "UpdateTransactionUseCase",
 ]
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import logging
+import time
+from collections import defaultdict
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from decimal import Decimal
+from uuid import UUID
+
+from ...domain.entities import Transaction
+from ...domain.services.flags import detect_flags_many
+from ...domain.value_objects.enums import TxType
+from ..ports.outbound import CubeWriter, TransactionRepository
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class FlagBackfillResult:
+    users: int
+    scanned: int
+    #: Rows whose flags differ from what the rule says today. Written back
+    #: unless this was a dry run.
+    changed: int
+    transfers_flipped: int
+    withdrawals_flipped: int
+    #: Net change in counted spend per currency: expenses that stop being
+    #: transfers come back into spend, new transfers leave it.
+    spend_delta: dict[str, Decimal] = field(default_factory=dict)
+    #: Net change in ``cash_withdrawn`` per currency.
+    cash_withdrawn_delta: dict[str, Decimal] = field(default_factory=dict)
+    dry_run: bool = False
+    #: The last user finished, in :meth:`TransactionRepository.user_ids`
+    #: order; pass it back as ``after_user`` to resume.
+    last_user: UUID | None = None
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.scanned / self.seconds if self.seconds else 0.0
+
+
+class BackfillFlagsUseCase:
+    """Re-derive ``is_transfer`` / ``is_cash_withdrawal`` for stored history.
+
+    The flags are computed once, at ingest, and stored, which makes a change
+    to the heuristics in ``domain/services/flags.py`` a visible event rather
+    than a silent one: old rows keep the old answer until this runs. It
+    applies today's rule -- the same :func:`detect_flags_many` over
+    ``raw_description`` that ingest uses -- and moves only the rows whose
+    answer changed.
+
+    Work goes user by user, each user's history read in keyset pages of
+    ``batch_size`` (``list_for_user(after=...)``), every page its own short
+    read, so nothing stays open while rows are written (SQLite cannot commit
+    under another connection's open read). Changed rows are written back a
+    batch at a time as soon as a batch fills, and pushed to the cube as
+    re-read from the table: memory holds a page and one batch, however long
+    any one user's history is. A user is finished before the next starts, so
+    an interrupted run resumes after the last finished user; the one it
+    stopped in is scanned again, and the rows already written no longer
+    differ. ``on_user`` hears of each user as it is done.
+
+    ``dry_run`` reads and counts everything and writes nothing: how many rows
+    would move, and how much spend and cash withdrawn would move with them.
+    """
+
+    def __init__(self, transactions: TransactionRepository, cube: CubeWriter) -> None:
+        self._transactions = transactions
+        self._cube = cube
+
+    def execute(
+        self,
+        *,
+        user_id: UUID | None = None,
+        dry_run: bool = False,
+        batch_size: int = 1000,
+        after_user: UUID | None = None,
+        on_user: Callable[[UUID], None] | None = None,
+    ) -> FlagBackfillResult:
+        """One user, or every user -- after ``after_user``, when resuming."""
+        started = time.perf_counter()
+        if user_id is not None:
+            users = [user_id]
+        else:
+            users = [
+                u for u in self._transactions.user_ids() if after_user is None or u > after_user
+            ]
+
+        tally = _Tally()
+        for user in users:
+            self._backfill(user, batch_size, tally, dry_run)
+            tally.last_user = user
+            if on_user is not None:
+                on_user(user)
+
+        result = tally.result(len(users), dry_run, time.perf_counter() - started)
+        logger.info(
+            "Flag backfill%s over %s user(s): %s of %s row(s) %s, %.0f rows/s.",
+            " (dry run)" if dry_run else "",
+            result.users,
+            result.changed,
+            result.scanned,
+            "would change" if dry_run else "changed",
+            result.rows_per_second,
+        )
+        return result
+
+    def _backfill(self, user_id: UUID, batch_size: int, tally: _Tally, dry_run: bool) -> None:
+        pending: list[Transaction] = []
+        after = None
+        while True:
+            page = self._transactions.list_for_user(user_id, limit=batch_size, after=after)
+            tally.scanned += len(page)
+            flags = detect_flags_many(t.raw_description for t in page)
+            for t, new in zip(page, flags, strict=True):
+                stored = (t.is_transfer, t.is_cash_withdrawal)
+                if (new.is_transfer, new.is_cash_withdrawal) == stored:
+                    continue
+                tally.count(t, new.is_transfer, new.is_cash_withdrawal)
+                if dry_run:
+                    continue
+                t.is_transfer = new.is_transfer
+                t.is_cash_withdrawal = new.is_cash_withdrawal
+                pending.append(t)
+            while len(pending) >= batch_size:
+                self._apply(user_id, pending[:batch_size])
+                del pending[:batch_size]
+            if len(page) < batch_size:
+                break
+            # Flags are not part of the key, so a row written back cannot move
+            # across the cursor.
+            after = (page[-1].tx_date, page[-1].id)
+        if pending:
+            self._apply(user_id, pending)
+
+    def _apply(self, user_id: UUID, batch: list[Transaction]) -> None:
+        self._transactions.update_flags_many(batch)
+        # Re-read rather than push the read copies: an edit to the same rows
+        # since the page was read (a category, a note) must not be rolled back
+        # in the cube.
+        self._cube.upsert_transactions(
+            self._transactions.list_by_ids(user_id, [t.id for t in batch])
+        )
+
+
+@dataclass
+class _Tally:
+    scanned: int = 0
+    changed: int = 0
+    transfers: int = 0
+    withdrawals: int = 0
+    spend: defaultdict[str, Decimal] = field(default_factory=lambda: defaultdict(Decimal))
+    cash: defaultdict[str, Decimal] = field(default_factory=lambda: defaultdict(Decimal))
+    last_user: UUID | None = None
+
+    def count(self, t: Transaction, is_transfer: bool, is_cash_withdrawal: bool) -> None:
+        """Record one row's move, before its flags are overwritten."""
+        self.changed += 1
+        self.transfers += is_transfer != t.is_transfer
+        self.withdrawals += is_cash_withdrawal != t.is_cash_withdrawal
+        if t.tx_type is not TxType.EXPENSE or t.excluded_from_stats:
+            # Counted by neither measure, whatever its flags say.
+            return
+        if is_transfer != t.is_transfer:
+            self.spend[t.currency] += t.amount if t.is_transfer else -t.amount
+        if is_cash_withdrawal != t.is_cash_withdrawal:
+            self.cash[t.currency] += -t.amount if t.is_cash_withdrawal else t.amount
+
+    def result(self, users: int, dry_run: bool, seconds: float) -> FlagBackfillResult:
+        return FlagBackfillResult(
+            users=users,
+            scanned=self.scanned,
+            changed=self.changed,
+            transfers_flipped=self.transfers,
+            withdrawals_flipped=self.withdrawals,
+            spend_delta=dict(self.spend),
+            cash_withdrawn_delta=dict(self.cash),
+            dry_run=dry_run,
+            last_user=self.last_user,
+            seconds=seconds,
+        )
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import threading
+
+from ...domain.services.categorization import CategorizationService
+from ..ports.outbound import CategoryRepository, MerchantRepository
+
+
+class CategorizerCache:
+    """One :class:`CategorizationService` per process, rebuilt only when the
+    reference data changes.
+
+    Building the service reads both reference tables and compiles every label
+    into its matcher; neither changes between uploads. The instance is kept
+    with the repositories' :meth:`~CategoryRepository.version` pair it was
+    built from, and :meth:`get` hands it out until either moves -- the same
+    rule as the metric cache: nothing is invalidated explicitly, so no writer
+    can forget to. The service is read-only once built, so callers share it.
+    """
+
+    def __init__(self, categories: CategoryRepository, merchants: MerchantRepository) -> None:
+        self._categories = categories
+        self._merchants = merchants
+        self._lock = threading.Lock()
+        # One attribute, swapped whole, so a reader never pairs a service
+        # with another build's version.
+        self._built: tuple[tuple[int, int], CategorizationService] | None = None
+
+    def get(self) -> CategorizationService:
+        version = self._categories.version(), self._merchants.version()
+        built = self._built
+        if built is not None and built[0] == version:
+            return built[1]
+        with self._lock:
+            # Another upload may have rebuilt it while this one waited.
+            if self._built is None or self._built[0] != version:
+                # Versions are read before the tables: a write landing in
+                # between is cached under the old version and rebuilt next call.
+                service = CategorizationService(
+                    self._categories.get_all(), self._merchants.get_all()
+                )
+                self._built = (version, service)
+            return self._built[1]
@@ -4,22 +4,24 @@ from uuid import UUID
 
 from ...domain.services.recurrence import RecurrenceService
 from ..dtos.analytics import RecurringItem
-from ..ports.outbound import TransactionRepository
+from ..ports.outbound import CubeReader
 
 
 class DetectRecurringUseCase:
-    """Detects recurring expenses / subscriptions for a user."""
+    """Detects recurring expenses / subscriptions for a user.
 
-    def __init__(
-        self, transactions: TransactionRepository, service: RecurrenceService | None = None
-    ) -> None:
-        self._transactions = transactions
+    The cube keeps a recurrence index up to date as facts are written, so
+    this is an index read over the full history: one row per candidate
+    group reaches Python, where :class:`RecurrenceService` applies the
+    cadence rules.
+    """
+
+    def __init__(self, cube: CubeReader, service: RecurrenceService | None = None) -> None:
+        self._cube = cube
         self._service = service or RecurrenceService()
 
     def execute(self, *, user_id: UUID) -> list[RecurringItem]:
-        # Pull a generous window; recurrence needs history.
-        txs = self._transactions.list_for_user(user_id, limit=5000)
-        groups = self._service.detect(txs)
+        stats = self._cube.recurrence_stats(user_id, self._service.min_occurrences)
         return [
             RecurringItem(
                 label=g.label,
@@ -27,5 +29,5 @@ class DetectRecurringUseCase:
                 frequency=g.frequency,
                 occurrences=g.occurrences,
             )
-            for g in groups
+            for g in self._service.groups(stats)
         ]
@@ -4,7 +4,12 @@ import statistics
 from decimal import Decimal
 from uuid import UUID
 
-from ...domain.services.forecasting import ForecastingService, ForecastPoint, SimulationInput
+from ...domain.services.forecasting import (
+    ForecastBand,
+    ForecastingService,
+    ForecastPoint,
+    SimulationInput,
+)
 from ..ports.outbound import CubeReader
 
 
@@ -16,17 +21,27 @@ class GetForecastUseCase:
         self._service = service or ForecastingService()
 
     def execute(self, *, user_id: UUID, months: int = 12) -> list[ForecastPoint]:
-        series = self._cube.monthly_series(user_id, months=6)
-        avg_income = _avg((p.income for p in series))
-        avg_expense = _avg((p.expense for p in series))
-        starting = _sum(p.income - p.expense for p in series)
-        sim = SimulationInput(
-            starting_net_worth=starting,
-            monthly_income=avg_income,
-            monthly_expenses=avg_expense,
-            months=months,
-        )
-        return self._service.project(sim)
+        return self._service.project(_history_input(self._cube, user_id, months))
+
+
+class GetForecastBandsUseCase:
+    """Monte Carlo bands around the default forecast's baseline.
+
+    Same history, same means as :class:`GetForecastUseCase`; the spread is the
+    user's own: the standard deviation of the same months' income and
+    expenses. The seed is fixed, so a chart does not redraw differently on
+    every refresh of unchanged data.
+    """
+
+    SEED = 0
+
+    def __init__(self, cube: CubeReader, service: ForecastingService | None = None) -> None:
+        self._cube = cube
+        self._service = service or ForecastingService()
+
+    def execute(self, *, user_id: UUID, months: int = 12, paths: int = 2000) -> list[ForecastBand]:
+        sim = _history_input(self._cube, user_id, months)
+        return self._service.scenarios(sim, paths=paths, seed=self.SEED)
 
 
 class SimulateForecastUseCase:
@@ -39,11 +54,30 @@ class SimulateForecastUseCase:
         return self._service.project(sim)
 
 
+def _history_input(cube: CubeReader, user_id: UUID, months: int) -> SimulationInput:
+    series = cube.monthly_series(user_id, months=6)
+    return SimulationInput(
+        starting_net_worth=_sum(p.income - p.expense for p in series),
+        monthly_income=_avg(p.income for p in series),
+        monthly_expenses=_avg(p.expense for p in series),
+        months=months,
+        income_volatility=_stdev(p.income for p in series),
+        expense_volatility=_stdev(p.expense for p in series),
+    )
+
+
 def _avg(values) -> Decimal:
     vals = [float(v) for v in values]
     return Decimal(str(statistics.mean(vals))).quantize(Decimal("0.01")) if vals else Decimal("0")
 
 
+def _stdev(values) -> Decimal:
+    vals = [float(v) for v in values]
+    if len(vals) < 2:
+        return Decimal("0")
+    return Decimal(str(statistics.stdev(vals))).quantize(Decimal("0.01"))
+
+
 def _sum(values) -> Decimal:
     total = Decimal("0")
     for v in values:
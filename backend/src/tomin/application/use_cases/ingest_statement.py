@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import partial
+from uuid import UUID
+
+from ...domain.value_objects.enums import SourceType, StatementStatus
+from ..dtos.jobs import Job, JobState
+from ..ports.outbound import JobQueue
+from .process_file import ProcessFileResult, ProcessFileUseCase
+
+#: Lane for PDFs. Any PDF may turn out to be a scan and fall back to OCR --
+#: seconds of CPU per page -- so these get a small pool of their own.
+OCR_LANE = "ocr"
+#: Lane for everything else (SAT XML today): milliseconds each.
+DEFAULT_LANE = "default"
+
+
+class IngestionJobNotFoundError(Exception):
+    """Raised when a job id is unknown, expired, or belongs to another user."""
+
+
+@dataclass(frozen=True)
+class IngestionStatus:
+    job_id: UUID
+    statement_id: UUID
+    status: StatementStatus
+    template: str | None = None
+    transactions_created: int | None = None
+    error: str | None = None
+
+
+class IngestStatementUseCase:
+    """Accept an upload now, process it on the job queue, report on it later.
+
+    The checks that answer the client -- duplicate, unsupported type -- still
+    run in the request (:meth:`ProcessFileUseCase.accept`), so those remain
+    immediate 409/415s. Extraction onwards runs as a job. The statement row
+    says ``PROCESSING`` from the moment the upload is accepted, so listings
+    show it; the job is what knows the outcome -- the counts, or the error.
+    """
+
+    def __init__(
+        self,
+        *,
+        process_file: ProcessFileUseCase,
+        jobs: JobQueue,
+    ) -> None:
+        self._process_file = process_file
+        self._jobs = jobs
+
+    def submit(
+        self, *, user_id: UUID, data: bytes, filename: str, mime: str | None = None
+    ) -> IngestionStatus:
+        upload = self._process_file.accept(
+            user_id=user_id, data=data, filename=filename, mime=mime
+        )
+        lane = OCR_LANE if upload.statement.source_type is SourceType.BANK_PDF else DEFAULT_LANE
+        job = self._jobs.submit(
+            owner_id=user_id,
+            lane=lane,
+            work=partial(self._process_file.process, upload),
+            subject_id=upload.statement.id,
+        )
+        return self._status(job, upload.statement.id)
+
+    def status(self, *, user_id: UUID, job_id: UUID) -> IngestionStatus:
+        job = self._jobs.get(job_id)
+        # Another user's job is reported missing, not forbidden, as statements are.
+        if job is None or job.owner_id != user_id or job.subject_id is None:
+            raise IngestionJobNotFoundError(str(job_id))
+        return self._status(job, job.subject_id)
+
+    def _status(self, job: Job, statement_id: UUID) -> IngestionStatus:
+        if job.state is JobState.FAILED:
+            return IngestionStatus(
+                job.id, statement_id, StatementStatus.FAILED, error=job.error
+            )
+        if job.state is JobState.SUCCEEDED:
+            result: ProcessFileResult = job.result
+            return IngestionStatus(
+                job.id,
+                statement_id,
+                StatementStatus.PROCESSED,
+                template=result.template,
+                transactions_created=result.transactions_created,
+            )
+        # Not the statement row's status: that turns PROCESSED before the cube
+        # write, and the upload is not done until the dashboards can see it.
+        return IngestionStatus(job.id, statement_id, StatementStatus.PROCESSING)
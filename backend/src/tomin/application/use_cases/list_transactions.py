@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+import base64
+import binascii
+import json
+from collections.abc import Iterator
 from dataclasses import dataclass
 from datetime import date
 from uuid import UUID
@@ -8,15 +12,34 @@ from ...domain.entities import Transaction
 from ..ports.outbound import TransactionRepository
 
 
+class InvalidCursorError(ValueError):
+    """The client sent a cursor this server did not issue (or mangled one)."""
+
+
 @dataclass(frozen=True)
 class TransactionPage:
     items: list[Transaction]
-    total: int
+    #: ``None`` when the caller opted out of counting.
+    total: int | None
     limit: int
     offset: int
+    #: Pass back as ``cursor`` for the next page; ``None`` on the last one.
+    next_cursor: str | None = None
 
 
 class ListTransactionsUseCase:
+    """One page of a user's transactions, newest first.
+
+    Two ways to page. ``offset`` is kept for the existing client. ``cursor`` is
+    keyset pagination over ``(tx_date, id)``: every page costs the same however
+    deep it is, and rows sharing a date cannot slip between pages.
+
+    The total is a separate COUNT over the whole filtered set, so it is
+    optional. A client scrolling by cursor already has it from the first page.
+
+    :meth:`stream` is the same listing without pages, for an export.
+    """
+
     def __init__(self, transactions: TransactionRepository) -> None:
         self._transactions = transactions
 
@@ -30,17 +53,79 @@ class ListTransactionsUseCase:
         search: str | None = None,
         limit: int = 100,
         offset: int = 0,
+        cursor: str | None = None,
+        with_total: bool = True,
     ) -> TransactionPage:
-        items = self._transactions.list_for_user(
+        if cursor and offset:
+            raise ValueError("Page by cursor or by offset, not both.")
+        # One row past the page answers "is there a next page" without a count.
+        rows = self._transactions.list_for_user(
             user_id,
             start=start,
             end=end,
             category_id=category_id,
             search=search,
-            limit=limit,
+            limit=limit + 1,
             offset=offset,
+            after=decode_cursor(cursor) if cursor else None,
         )
-        total = self._transactions.count_for_user(
-            user_id, start=start, end=end, category_id=category_id, search=search
+        items = rows[:limit]
+        next_cursor = encode_cursor(items[-1]) if len(rows) > limit and items else None
+
+        total = None
+        if with_total:
+            total = self._transactions.count_for_user(
+                user_id, start=start, end=end, category_id=category_id, search=search
+            )
+        return TransactionPage(
+            items=items, total=total, limit=limit, offset=offset, next_cursor=next_cursor
         )
-        return TransactionPage(items=items, total=total, limit=limit, offset=offset)
+
+    def stream(
+        self,
+        *,
+        user_id: UUID,
+        start: date | None = None,
+        end: date | None = None,
+        category_id: UUID | None = None,
+        search: str | None = None,
+        page_size: int = 500,
+    ) -> Iterator[Transaction]:
+        """Every matching transaction, newest first, read as it is consumed.
+
+        Keyset pages of ``page_size``, each its own short read, so nothing is
+        held open between them: a slow download never keeps a writer waiting
+        (on SQLite, an open read would lock every writer out). Memory holds
+        one page whatever the history's length. Nothing is read until the
+        first row is asked for.
+        """
+        after = None
+        while True:
+            page = self._transactions.list_for_user(
+                user_id,
+                start=start,
+                end=end,
+                category_id=category_id,
+                search=search,
+                limit=page_size,
+                after=after,
+            )
+            yield from page
+            if len(page) < page_size:
+                return
+            after = (page[-1].tx_date, page[-1].id)
+
+
+def encode_cursor(last: Transaction) -> str:
+    """Opaque to the client: the sort key of the last row it has seen."""
+    raw = json.dumps([last.tx_date.isoformat(), str(last.id)]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[date, UUID]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        tx_date, tx_id = json.loads(base64.urlsafe_b64decode(padded))
+        return date.fromisoformat(tx_date), UUID(tx_id)
+    except (binascii.Error, ValueError, TypeError) as exc:
+        raise InvalidCursorError("Invalid pagination cursor.") from exc
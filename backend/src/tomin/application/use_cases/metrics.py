@@ -45,22 +45,55 @@ class RunMetricQueriesUseCase:
         self._catalog = catalog
 
     def execute(self, *, user_id: UUID, queries: Sequence[MetricQuery]) -> MetricBatchResult:
-        results: dict[str, MetricResult | MetricError] = {}
-        for query in queries:
-            try:
-                results[query.key] = self._run_one(user_id, query)
-            except MetricValidationError as exc:
-                results[query.key] = MetricError(
-                    metric_id=query.metric, code=exc.code, message=exc.message
-                )
-            except Exception:  # deliberate: one bad widget must not 500 the batch
-                logger.exception("Metric '%s' (key %s) failed", query.metric, query.key)
-                results[query.key] = MetricError(
-                    metric_id=query.metric,
-                    code="metric_failed",
-                    message="This metric could not be computed.",
-                )
-        return MetricBatchResult(results=results)
+        outcomes: list[MetricResult | MetricError | None] = [None] * len(queries)
+        # Aggregations are held back and handed to the engine together, so a
+        # dashboard's widgets over one period can share a scan.
+        aggregations: list[tuple[int, MetricSpec, MetricQuery]] = []
+        for index, query in enumerate(queries):
+            spec = self._catalog.get(query.metric)
+            if spec is not None and spec.kind == "aggregation":
+                outcome = self._guard(query, normalize, spec, query)
+                if isinstance(outcome, MetricError):
+                    outcomes[index] = outcome
+                else:
+                    aggregations.append((index, spec, outcome))
+                continue
+            outcomes[index] = self._guard(query, self._run_one, user_id, query)
+
+        for (index, _, _), outcome in zip(aggregations, self._aggregate(user_id, aggregations)):
+            outcomes[index] = outcome
+        return MetricBatchResult(results={q.key: o for q, o in zip(queries, outcomes)})
+
+    def _aggregate(
+        self, user_id: UUID, batch: list[tuple[int, MetricSpec, MetricQuery]]
+    ) -> list[MetricResult | MetricError]:
+        if not batch:
+            return []
+        try:
+            return self._engine.execute_many(user_id, [(spec, q) for _, spec, q in batch])
+        except Exception:
+            # Something in the shared statement failed. Re-run query by query so
+            # only the culprit's key carries the error.
+            logger.exception("Fused metric batch failed; retrying each query alone")
+            return [
+                self._guard(q, self._engine.execute, user_id, spec, q)
+                for _, spec, q in batch
+            ]
+
+    @staticmethod
+    def _guard(query: MetricQuery, run, *args) -> MetricResult | MetricError:
+        """``run(*args)``, with any failure turned into an error for ``query``'s key."""
+        try:
+            return run(*args)
+        except MetricValidationError as exc:
+            return MetricError(metric_id=query.metric, code=exc.code, message=exc.message)
+        except Exception:  # deliberate: one bad widget must not 500 the batch
+            logger.exception("Metric '%s' (key %s) failed", query.metric, query.key)
+            return MetricError(
+                metric_id=query.metric,
+                code="metric_failed",
+                message="This metric could not be computed.",
+            )
 
     def _run_one(self, user_id: UUID, query: MetricQuery) -> MetricResult:
         spec = self._catalog.get(query.metric)
@@ -71,9 +104,6 @@ class RunMetricQueriesUseCase:
 
         query = normalize(spec, query)
 
-        if spec.kind == "aggregation":
-            return self._engine.execute(user_id, spec, query)
-
         resolver = self._resolvers.get(spec.id)
         if resolver is None:
             raise MetricValidationError(
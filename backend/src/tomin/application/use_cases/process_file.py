@@ -6,20 +6,19 @@ from dataclasses import dataclass
 from uuid import UUID
 
 from ...domain.entities import Statement, Transaction
-from ...domain.services.categorization import CategorizationService
-from ...domain.services.flags import detect_flags
-from ...domain.value_objects.enums import StatementStatus
+from ...domain.services.categorization import fold
+from ...domain.services.flags import detect_flags_many
+from ...domain.value_objects.enums import SourceType, StatementStatus
 from ..ports.outbound import (
-    CategoryRepository,
     CubeWriter,
     Extractor,
     FileStorage,
-    MerchantRepository,
     ParserFactory,
     StatementRepository,
     TemplateClassifier,
     TransactionRepository,
 )
+from .categorizer import CategorizerCache
 
 logger = logging.getLogger(__name__)
 
@@ -39,12 +38,32 @@ class ProcessFileResult:
     transactions_created: int
 
 
+@dataclass(frozen=True)
+class AcceptedUpload:
+    """An upload that passed the cheap checks and is waiting to be processed.
+
+    Its statement row already exists, in ``PROCESSING``, and holds the file's
+    hash, so a second copy of the same file is refused while this one is
+    still in flight.
+    """
+
+    statement: Statement
+    extractor: Extractor
+    handle: str
+    filename: str
+    mime: str | None
+
+
 class ProcessFileUseCase:
     """Orchestrates the ingestion pipeline.
 
     upload -> extract -> classify -> parse -> categorize -> persist -> discard raw.
     The raw file is only held transiently in :class:`FileStorage` and is always
     discarded before returning.
+
+    Split in two so the slow half can run off the request: :meth:`accept`
+    validates and records the upload, :meth:`process` does the work.
+    :meth:`execute` is both, back to back.
     """
 
     def __init__(
@@ -55,8 +74,7 @@ class ProcessFileUseCase:
         parser_factory: ParserFactory,
         statements: StatementRepository,
         transactions: TransactionRepository,
-        categories: CategoryRepository,
-        merchants: MerchantRepository,
+        categorizer: CategorizerCache,
         cube: CubeWriter,
         file_storage: FileStorage,
     ) -> None:
@@ -65,14 +83,23 @@ class ProcessFileUseCase:
         self._parser_factory = parser_factory
         self._statements = statements
         self._transactions = transactions
-        self._categories = categories
-        self._merchants = merchants
+        self._categorizer = categorizer
         self._cube = cube
         self._file_storage = file_storage
 
     def execute(
         self, *, user_id: UUID, data: bytes, filename: str, mime: str | None = None
     ) -> ProcessFileResult:
+        return self.process(self.accept(user_id=user_id, data=data, filename=filename, mime=mime))
+
+    def accept(
+        self, *, user_id: UUID, data: bytes, filename: str, mime: str | None = None
+    ) -> AcceptedUpload:
+        """Refuse duplicates and unsupported files, stash the bytes, open the statement.
+
+        Everything here is fast and answers the client directly; the slow part
+        -- extraction, possibly OCR -- is :meth:`process`.
+        """
         file_hash = hashlib.sha256(data).hexdigest()
         if self._statements.exists_hash(user_id, file_hash):
             raise DuplicateStatementError(filename)
@@ -81,36 +108,52 @@ class ProcessFileUseCase:
         if extractor is None:
             raise UnsupportedFileError(filename)
 
+        statement = Statement(
+            user_id=user_id,
+            # Provisional until the parser reports what the document is.
+            source_type=(
+                SourceType.SAT_XML if filename.lower().endswith(".xml") else SourceType.BANK_PDF
+            ),
+            status=StatementStatus.PROCESSING,
+            file_hash=file_hash,
+        )
         handle = self._file_storage.save(data, filename)
+        self._statements.add(statement)
+        return AcceptedUpload(statement, extractor, handle, filename, mime)
+
+    def process(self, upload: AcceptedUpload) -> ProcessFileResult:
+        """Run the pipeline for an accepted upload and settle its statement.
+
+        On failure the statement is marked ``FAILED`` and gives up its hash, so
+        the same file can be uploaded again, and the error propagates.
+        """
+        statement = upload.statement
         try:
-            doc = extractor.extract(self._file_storage.read(handle), filename, mime)
+            doc = upload.extractor.extract(
+                self._file_storage.read(upload.handle), upload.filename, upload.mime
+            )
             template = self._classifier.classify(doc)
             parser = self._parser_factory.get(template)
             parsed = parser.parse(doc)
 
-            statement = Statement(
-                user_id=user_id,
-                source_type=parsed.source_type,
-                bank=parsed.bank,
-                period_start=parsed.period_start,
-                period_end=parsed.period_end,
-                status=StatementStatus.PROCESSING,
-                file_hash=file_hash,
-            )
-            self._statements.add(statement)
-
-            categorizer = CategorizationService(
-                self._categories.get_all(), self._merchants.get_all()
-            )
+            statement.source_type = parsed.source_type
+            statement.bank = parsed.bank
+            statement.period_start = parsed.period_start
+            statement.period_end = parsed.period_end
+
+            categorizer = self._categorizer.get()
+            # Each description is folded once, for the categorizer and the
+            # flag heuristics alike.
+            folded = [fold(p.raw_description) for p in parsed.transactions]
+            # Derived once, at ingest, so every later read agrees. A transfer
+            # is not spend and a withdrawal is not a category.
+            all_flags = detect_flags_many(folded, folded=True)
             domain_txs: list[Transaction] = []
-            for p in parsed.transactions:
-                cls = categorizer.classify(p.raw_description)
-                # Derived once, at ingest, so every later read agrees. A
-                # transfer is not spend and a withdrawal is not a category.
-                flags = detect_flags(p.raw_description)
+            for p, text, flags in zip(parsed.transactions, folded, all_flags, strict=True):
+                cls = categorizer.classify(text, folded=True)
                 domain_txs.append(
                     Transaction(
-                        user_id=user_id,
+                        user_id=statement.user_id,
                         statement_id=statement.id,
                         tx_date=p.tx_date,
                         amount=p.amount,
@@ -136,9 +179,15 @@ class ProcessFileUseCase:
                 template=template,
                 transactions_created=len(domain_txs),
             )
+        except Exception:
+            if statement.status is not StatementStatus.PROCESSED:
+                statement.mark(StatementStatus.FAILED)
+                statement.file_hash = None
+                self._statements.update(statement)
+            raise
         finally:
             # Raw file is transient and must never be persisted server-side.
-            self._file_storage.discard(handle)
+            self._file_storage.discard(upload.handle)
 
     def _select_extractor(self, filename: str, mime: str | None) -> Extractor | None:
         for extractor in self._extractors:
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from itertools import islice
+from uuid import UUID
+
+from ...domain.entities import Tag, Transaction
+from ..ports.outbound import CubeWriter, TagRepository, TransactionRepository
+
+logger = logging.getLogger(__name__)
+
+#: Batches a reader may get ahead of the writer, per user.
+_FEED_DEPTH = 4
+
+
+@dataclass(frozen=True)
+class FleetRebuildResult:
+    #: Users rebuilt so far, out of ``users_total`` in this run.
+    users: int
+    users_total: int
+    rows: int
+    #: The last user finished, in :meth:`TransactionRepository.user_ids`
+    #: order; pass it back as ``after_user`` to resume.
+    last_user: UUID | None = None
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+class RebuildFleetUseCase:
+    """Re-derive every user's cube rows, reading several users at once.
+
+    :class:`RebuildCubeUseCase` is one user on one request. After the cube
+    drops its tables (a ``_SCHEMA_VERSION`` bump, a lost file) everyone needs
+    it, and one user at a time leaves DuckDB idle while SQL streams and SQL
+    idle while DuckDB merges.
+
+    So the two are overlapped. ``workers`` threads stream users' histories
+    from the relational store, each into a bounded queue of ``batch_size``
+    batches; the calling thread is the one writer, draining the queues in
+    user order into :meth:`CubeWriter.rebuild_for_user`, one transaction per
+    user, exactly as the single-user rebuild does. DuckDB allows one writer,
+    and here it is never waiting on a read. Memory tracks the queues, not
+    anyone's history.
+
+    Users finish in :meth:`TransactionRepository.user_ids` order, so
+    ``after_user`` resumes an interrupted run with nothing half-applied, and
+    ``on_user`` hears the running totals after each one.
+    """
+
+    def __init__(
+        self, transactions: TransactionRepository, cube: CubeWriter, tags: TagRepository
+    ) -> None:
+        self._transactions = transactions
+        self._cube = cube
+        self._tags = tags
+
+    def execute(
+        self,
+        *,
+        user_id: UUID | None = None,
+        workers: int = 4,
+        batch_size: int = 1000,
+        after_user: UUID | None = None,
+        on_user: Callable[[FleetRebuildResult], None] | None = None,
+    ) -> FleetRebuildResult:
+        """One user, or every user -- after ``after_user``, when resuming."""
+        started = time.perf_counter()
+        if user_id is not None:
+            users = [user_id]
+        else:
+            users = [
+                u for u in self._transactions.user_ids() if after_user is None or u > after_user
+            ]
+
+        rows = done = 0
+        last_user = None
+        stop = threading.Event()
+        pending: deque[tuple[_Feed, Future]] = deque()
+        queued = iter(users)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="rebuild") as pool:
+            try:
+                # Never more users in flight than readers: a user submitted
+                # behind a full pool would only hold its place in the queue.
+                for user in islice(queued, workers):
+                    pending.append(self._start(pool, user, batch_size, stop))
+                while pending:
+                    feed, reading = pending.popleft()
+                    self._cube.sync_tags(feed.tags())
+                    rows += self._cube.rebuild_for_user(feed.user_id, feed)
+                    reading.result()
+                    done += 1
+                    last_user = feed.user_id
+                    for user in islice(queued, 1):
+                        pending.append(self._start(pool, user, batch_size, stop))
+                    if on_user is not None:
+                        on_user(
+                            FleetRebuildResult(
+                                done, len(users), rows, last_user, time.perf_counter() - started
+                            )
+                        )
+            finally:
+                # On the way out with an error, readers parked on a full
+                # queue give up rather than wait for a writer that is gone.
+                stop.set()
+
+        result = FleetRebuildResult(
+            done, len(users), rows, last_user, time.perf_counter() - started
+        )
+        logger.info(
+            "Rebuilt cube for %s user(s) with %s reader(s): %s fact row(s), %.0f rows/s.",
+            result.users,
+            workers,
+            result.rows,
+            result.rows_per_second,
+        )
+        return result
+
+    def _start(
+        self, pool: ThreadPoolExecutor, user_id: UUID, batch_size: int, stop: threading.Event
+    ) -> tuple[_Feed, Future]:
+        feed = _Feed(user_id, stop)
+        return feed, pool.submit(feed.fill, self._transactions, self._tags, batch_size)
+
+
+class _Feed:
+    """One user's history, read on a worker thread and iterated by the writer.
+
+    The first item through the queue is the user's tags, then batches of
+    transactions, then ``None``. A reader's exception travels the same way
+    and is raised on the writer's side.
+    """
+
+    def __init__(self, user_id: UUID, stop: threading.Event) -> None:
+        self.user_id = user_id
+        self._stop = stop
+        self._queue: queue.Queue = queue.Queue(maxsize=_FEED_DEPTH)
+
+    def fill(self, transactions: TransactionRepository, tags: TagRepository, batch_size: int):
+        stream = transactions.iter_for_user(self.user_id, batch_size=batch_size)
+        try:
+            self._put(tags.list_for_user(self.user_id))
+            while batch := list(islice(stream, batch_size)):
+                self._put(batch)
+            self._put(None)
+        except _Stopped:
+            pass
+        except Exception as exc:  # re-raised on the writer's side
+            self._put(exc)
+
+    def tags(self) -> list[Tag]:
+        return self._get()
+
+    def __iter__(self) -> Iterator[Transaction]:
+        while (batch := self._get()) is not None:
+            yield from batch
+
+    def _get(self):
+        item = self._queue.get()
+        if isinstance(item, Exception):
+            raise item
+        return item
+
+    def _put(self, item) -> None:
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+        raise _Stopped
+
+
+class _Stopped(Exception):
+    """The writer has gone; the reader drops what it has."""
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass
+from uuid import UUID
+
+from ...domain.entities import Transaction
+from ..ports.outbound import CubeWriter, TransactionRepository
+from .categorizer import CategorizerCache
+
+logger = logging.getLogger(__name__)
+
+#: ``category_source`` values the categorizer may overwrite; ``None`` is a row
+#: from before the column, as the write's guard reads it.
+_AUTO_SOURCES = ("auto", None)
+
+
+@dataclass(frozen=True)
+class RecategorizeResult:
+    users: int
+    #: Rows read, user corrections included.
+    scanned: int
+    #: ``auto`` rows whose category or merchant changed, as counted by the
+    #: write: a row corrected by hand since it was read is not among them.
+    changed: int
+    seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.scanned / self.seconds if self.seconds else 0.0
+
+
+class RecategorizeTransactionsUseCase:
+    """Re-run the current categorizer over stored ``auto`` transactions.
+
+    ``category_source`` exists for this pass: rows the categorizer filled in
+    (``"auto"``) are re-decided with today's labels, rows the user set
+    (``"user"``) are never touched. Merchants are re-decided alongside, since
+    they come out of the same match.
+
+    Each user's history is read in keyset pages of ``batch_size``
+    (``list_for_user(after=...)``), every page its own short read, so no read
+    is held open while a page's changed rows are written back and pushed to
+    the cube (SQLite cannot commit under another connection's open read).
+    Memory holds one page, and a pass that dies part-way keeps the pages it
+    finished.
+    """
+
+    def __init__(
+        self,
+        transactions: TransactionRepository,
+        categorizer: CategorizerCache,
+        cube: CubeWriter,
+    ) -> None:
+        self._transactions = transactions
+        self._categorizer = categorizer
+        self._cube = cube
+
+    def execute(self, *, user_id: UUID | None = None, batch_size: int = 500) -> RecategorizeResult:
+        """One user's transactions, or every user's when ``user_id`` is None."""
+        started = time.perf_counter()
+        users = [user_id] if user_id is not None else self._transactions.user_ids()
+        scanned = changed = 0
+        for user in users:
+            user_scanned, user_changed = self._recategorize(user, batch_size)
+            scanned += user_scanned
+            changed += user_changed
+        result = RecategorizeResult(
+            users=len(users),
+            scanned=scanned,
+            changed=changed,
+            seconds=time.perf_counter() - started,
+        )
+        logger.info(
+            "Re-categorized %s user(s): %s of %s row(s) changed, %.0f rows/s.",
+            result.users,
+            result.changed,
+            result.scanned,
+            result.rows_per_second,
+        )
+        return result
+
+    def _recategorize(self, user_id: UUID, batch_size: int) -> tuple[int, int]:
+        categorizer = self._categorizer.get()
+        scanned = changed = 0
+        after = None
+        while True:
+            page = self._transactions.list_for_user(user_id, limit=batch_size, after=after)
+            scanned += len(page)
+            batch: list[Transaction] = []
+            for t in page:
+                # The rows update_classification_many's guard accepts, no more.
+                if t.category_source not in _AUTO_SOURCES:
+                    continue
+                cls = categorizer.classify(t.raw_description)
+                if (cls.category_id, cls.merchant_id) != (t.category_id, t.merchant_id):
+                    t.category_id = cls.category_id
+                    t.merchant_id = cls.merchant_id
+                    batch.append(t)
+            if batch:
+                changed += self._transactions.update_classification_many(batch)
+                # Re-read what was written rather than trusting the batch: a row
+                # the user corrected meanwhile was skipped by the write, and the
+                # cube must show the correction, not this pass's guess.
+                self._cube.upsert_transactions(
+                    self._transactions.list_by_ids(user_id, [t.id for t in batch])
+                )
+            if len(page) < batch_size:
+                return scanned, changed
+            # Classification is not part of the key, so a row written back
+            # cannot move across the cursor.
+            after = (page[-1].tx_date, page[-1].id)
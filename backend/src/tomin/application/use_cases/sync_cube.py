@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass
+from uuid import UUID
+
+from ..ports.outbound import CubeWriter, TagRepository, TransactionChangeLog, TransactionRepository
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CubeSyncResult:
+    users: int
+    #: Users with no usable mark, re-derived in full.
+    rebuilt: int
+    #: Transactions re-read and re-applied from the change log.
+    applied: int
+    #: Of those, the ones that were gone and came out of the cube.
+    deleted: int
+    #: The change-log position every synced user now stands at.
+    horizon: int
+    #: Change-log entries dropped afterwards; only a run over everyone prunes.
+    pruned: int = 0
+    seconds: float = 0.0
+
+
+class SyncCubeUseCase:
+    """Bring the cube up to the change log, applying only what changed.
+
+    Use cases write the cube eagerly, alongside the relational store, and
+    that stays the normal path. This is the repair: a write that reached the
+    database but not the cube -- the cube was locked, the process died in
+    between -- is in ``transaction_changes`` (triggers put it there), and the
+    cube keeps per user the last ``seq`` it applied. A sync re-reads the
+    transactions named after that mark, upserts the ones still there and
+    drops the ones that are not. Work is proportional to what changed, not
+    to history; replaying something the eager write already applied is
+    harmless, since both write the same row.
+
+    A user with no mark -- new cube file, tables dropped by a schema bump, or
+    a mark older than the log still reaches -- is rebuilt in full, and the
+    mark set in the same commit.
+
+    The log is read up to one :meth:`TransactionChangeLog.horizon`, taken
+    first: later writes are next time's. A run over everyone leaves every
+    user at that horizon and then prunes the log below it.
+    """
+
+    def __init__(
+        self,
+        transactions: TransactionRepository,
+        changes: TransactionChangeLog,
+        cube: CubeWriter,
+        tags: TagRepository,
+    ) -> None:
+        self._transactions = transactions
+        self._changes = changes
+        self._cube = cube
+        self._tags = tags
+
+    def execute(self, *, user_id: UUID | None = None, batch_size: int = 1000) -> CubeSyncResult:
+        """One user, or every user the store or the log knows of."""
+        started = time.perf_counter()
+        horizon = self._changes.horizon()
+        first = self._changes.first_seq()
+        if user_id is not None:
+            users = [user_id]
+        else:
+            users = sorted(set(self._transactions.user_ids()) | set(self._changes.user_ids()))
+
+        rebuilt = applied = deleted = 0
+        for user in users:
+            mark = self._cube.sync_mark(user)
+            # Entries between the mark and the oldest one kept may have been
+            # pruned; nothing short of the whole history covers them.
+            if mark is None or (first is not None and mark < first - 1):
+                self._rebuild(user, horizon, batch_size)
+                rebuilt += 1
+            elif mark < horizon:
+                user_applied, user_deleted = self._catch_up(user, mark, horizon, batch_size)
+                applied += user_applied
+                deleted += user_deleted
+
+        # Keep the newest entry: the next run's first_seq() then still tells
+        # a cube that has fallen behind this point from one that has not.
+        pruned = self._changes.prune(horizon) if user_id is None else 0
+        result = CubeSyncResult(
+            users=len(users),
+            rebuilt=rebuilt,
+            applied=applied,
+            deleted=deleted,
+            horizon=horizon,
+            pruned=pruned,
+            seconds=time.perf_counter() - started,
+        )
+        logger.info(
+            "Synced cube for %s user(s) to change %s: %s rebuilt, %s applied (%s deleted), "
+            "%s change-log row(s) pruned.",
+            result.users,
+            result.horizon,
+            result.rebuilt,
+            result.applied,
+            result.deleted,
+            result.pruned,
+        )
+        return result
+
+    def _rebuild(self, user_id: UUID, horizon: int, batch_size: int) -> None:
+        self._cube.sync_tags(self._tags.list_for_user(user_id))
+        self._cube.rebuild_for_user(
+            user_id, self._transactions.iter_for_user(user_id, batch_size=batch_size), mark=horizon
+        )
+
+    def _catch_up(self, user_id: UUID, mark: int, horizon: int, batch_size: int) -> tuple[int, int]:
+        ids = self._changes.changed_since(user_id, mark, horizon)
+        deleted = 0
+        tagged = False
+        for start in range(0, len(ids), batch_size):
+            batch = ids[start : start + batch_size]
+            current = self._transactions.list_by_ids(user_id, batch)
+            found = {t.id for t in current}
+            gone = [i for i in batch if i not in found]
+            deleted += len(gone)
+            tagged = tagged or any(t.tag_ids for t in current)
+            # The mark moves with the last batch only: a failure part-way
+            # leaves it where it was, and the next run replays the lot.
+            last = start + batch_size >= len(ids)
+            self._cube.apply_changes(user_id, current, gone, mark=horizon if last else None)
+        if not ids:
+            # Entries for other users only; nothing of this user's to redo.
+            self._cube.apply_changes(user_id, [], [], mark=horizon)
+        if tagged:
+            # A tag created while the cube was not listening has no label yet.
+            self._cube.sync_tags(self._tags.list_for_user(user_id))
+        return len(ids), deleted
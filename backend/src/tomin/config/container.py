@@ -1,14 +1,18 @@
 from __future__ import annotations
 
+import logging
 from functools import cached_property
 
 from ..adapters.outbound.cube import DuckDbCube, DuckDbMetricEngine
 from ..adapters.outbound.extraction import (
     KeywordTemplateClassifier,
+    OcrPdfExtractor,
     PdfExtractor,
     SatXmlExtractor,
 )
+from ..adapters.outbound.jobs import InProcessJobQueue
 from ..adapters.outbound.metrics import (
+    CachedMetricEngine,
     FinancialAdviceResolver,
     InvestmentProjectionResolver,
 )
@@ -22,30 +26,42 @@ from ..adapters.outbound.persistence import (
     SqlMerchantRepository,
     SqlStatementRepository,
     SqlTagRepository,
+    SqlTransactionChangeLog,
     SqlTransactionRepository,
 )
 from ..adapters.outbound.persistence.migrator import upgrade_to_head
 from ..adapters.outbound.persistence.seed import seed_reference_data
 from ..adapters.outbound.storage import TransientFileStorage
 from ..application.use_cases import (
+    BackfillFlagsUseCase,
+    CategorizerCache,
     DetectRecurringUseCase,
+    ExportCubeUseCase,
+    GetForecastBandsUseCase,
     GetForecastUseCase,
     GetHomeDashboardUseCase,
     GetMetricCatalogUseCase,
     GetSpendingSummaryUseCase,
+    IngestStatementUseCase,
     ListTransactionsUseCase,
     ManageGoalsUseCase,
     ManageStatementsUseCase,
     ManageTagsUseCase,
     ProcessFileUseCase,
     RebuildCubeUseCase,
+    RebuildFleetUseCase,
+    RecategorizeTransactionsUseCase,
     RunMetricQueriesUseCase,
     SaveHomeDashboardUseCase,
     SimulateForecastUseCase,
+    SyncCubeUseCase,
     UpdateTransactionUseCase,
 )
+from ..application.use_cases.ingest_statement import DEFAULT_LANE, OCR_LANE
 from .settings import Settings
 
+logger = logging.getLogger(__name__)
+
 
 class Container:
     """Composition root: wires adapters into use cases.
@@ -64,13 +80,18 @@ class Container:
 
     @cached_property
     def cube(self) -> DuckDbCube:
-        return DuckDbCube(self.settings.cube_path)
+        return DuckDbCube(self.settings.cube_path, readers=self.settings.cube_readers)
 
     @cached_property
-    def metric_engine(self) -> DuckDbMetricEngine:
-        # Borrows the cube's connection rather than opening its own: DuckDB is
-        # single-writer per file.
-        return DuckDbMetricEngine(self.cube)
+    def metric_engine(self) -> CachedMetricEngine:
+        # Borrows the cube's read cursors rather than opening its own connection:
+        # DuckDB is single-writer per file. The cache keys on the cube's data
+        # version, so every cube write retires the answers it could change.
+        return CachedMetricEngine(
+            DuckDbMetricEngine(self.cube),
+            self.cube,
+            max_bytes=self.settings.metric_cache_bytes,
+        )
 
     @cached_property
     def metric_resolvers(self) -> list:
@@ -80,18 +101,31 @@ class Container:
         # (transfers, excluded rows) apply to it by construction.
         return [
             InvestmentProjectionResolver(),
-            FinancialAdviceResolver(self.metric_engine),
+            FinancialAdviceResolver(self.metric_engine, self.cube),
         ]
 
     @cached_property
     def file_storage(self) -> TransientFileStorage:
         return TransientFileStorage()
 
+    @cached_property
+    def job_queue(self) -> InProcessJobQueue:
+        return InProcessJobQueue(
+            {
+                DEFAULT_LANE: self.settings.ingest_workers,
+                OCR_LANE: self.settings.ingest_ocr_workers,
+            }
+        )
+
     # --- repositories ----------------------------------------------------
     @cached_property
     def transactions(self) -> SqlTransactionRepository:
         return SqlTransactionRepository(self.database)
 
+    @cached_property
+    def change_log(self) -> SqlTransactionChangeLog:
+        return SqlTransactionChangeLog(self.database)
+
     @cached_property
     def statements(self) -> SqlStatementRepository:
         return SqlStatementRepository(self.database)
@@ -121,6 +155,10 @@ class Container:
         return SqlMerchantRepository(self.database)
 
     # --- pipeline components --------------------------------------------
+    @cached_property
+    def categorizer(self) -> CategorizerCache:
+        return CategorizerCache(self.categories, self.merchants)
+
     @cached_property
     def classifier(self) -> KeywordTemplateClassifier:
         return KeywordTemplateClassifier()
@@ -132,7 +170,10 @@ class Container:
     @cached_property
     def extractors(self) -> list:
         # Order matters: XML is matched before the PDF extractor.
-        return [SatXmlExtractor(), PdfExtractor()]
+        return [
+            SatXmlExtractor(),
+            PdfExtractor(ocr_extractor=OcrPdfExtractor(processes=self.settings.ocr_processes)),
+        ]
 
     # --- use cases -------------------------------------------------------
     @cached_property
@@ -143,12 +184,15 @@ class Container:
             parser_factory=self.parser_factory,
             statements=self.statements,
             transactions=self.transactions,
-            categories=self.categories,
-            merchants=self.merchants,
+            categorizer=self.categorizer,
             cube=self.cube,
             file_storage=self.file_storage,
         )
 
+    @cached_property
+    def ingest_statement(self) -> IngestStatementUseCase:
+        return IngestStatementUseCase(process_file=self.process_file, jobs=self.job_queue)
+
     @cached_property
     def manage_statements(self) -> ManageStatementsUseCase:
         return ManageStatementsUseCase(
@@ -201,20 +245,44 @@ class Container:
 
     @cached_property
     def detect_recurring(self) -> DetectRecurringUseCase:
-        return DetectRecurringUseCase(self.transactions)
+        return DetectRecurringUseCase(self.cube)
 
     @cached_property
     def get_forecast(self) -> GetForecastUseCase:
         return GetForecastUseCase(self.cube)
 
+    @cached_property
+    def get_forecast_bands(self) -> GetForecastBandsUseCase:
+        return GetForecastBandsUseCase(self.cube)
+
     @cached_property
     def simulate_forecast(self) -> SimulateForecastUseCase:
         return SimulateForecastUseCase()
 
+    @cached_property
+    def export_cube(self) -> ExportCubeUseCase:
+        return ExportCubeUseCase(self.cube)
+
     @cached_property
     def rebuild_cube(self) -> RebuildCubeUseCase:
         return RebuildCubeUseCase(self.transactions, self.cube, self.tags)
 
+    @cached_property
+    def rebuild_fleet(self) -> RebuildFleetUseCase:
+        return RebuildFleetUseCase(self.transactions, self.cube, self.tags)
+
+    @cached_property
+    def sync_cube(self) -> SyncCubeUseCase:
+        return SyncCubeUseCase(self.transactions, self.change_log, self.cube, self.tags)
+
+    @cached_property
+    def recategorize(self) -> RecategorizeTransactionsUseCase:
+        return RecategorizeTransactionsUseCase(self.transactions, self.categorizer, self.cube)
+
+    @cached_property
+    def backfill_flags(self) -> BackfillFlagsUseCase:
+        return BackfillFlagsUseCase(self.transactions, self.cube)
+
     @cached_property
     def manage_goals(self) -> ManageGoalsUseCase:
         return ManageGoalsUseCase(self.goals_repo)
@@ -230,3 +298,23 @@ class Container:
             self.database.create_all()
         seed_reference_data(self.categories, self.merchants)
         self.cube.sync_categories(self.categories.get_all())
+
+    def fail_interrupted_uploads(self) -> None:
+        """Fail the uploads a previous server process left mid-job.
+
+        Server startup only, never :meth:`bootstrap`: the server is the one
+        process that runs upload jobs, so a statement still processing when it
+        starts lost its job with the last one, and would otherwise hold its
+        hash against a re-upload. An operator command may run beside a live
+        server (on another ``CUBE_PATH``), where those statements are still
+        being worked on.
+        """
+        abandoned = self.statements.fail_unfinished()
+        if abandoned:
+            logger.warning("Marked %s interrupted upload(s) failed.", abandoned)
+
+    def shutdown(self) -> None:
+        """Stop taking jobs and finish the ones already queued."""
+        # Only if something used it; shutting down must not build the pools.
+        if "job_queue" in self.__dict__:
+            self.job_queue.shutdown(wait=True)
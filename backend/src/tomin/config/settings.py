@@ -12,6 +12,19 @@ class Settings(BaseSettings):
 
     database_url: str = "sqlite:///tomin.db"
     cube_path: str = "tomin_cube.duckdb"
+    # How many cube reads may run at once. Writes are serialised regardless;
+    # this bounds the read cursors opened alongside the writer.
+    cube_readers: int = 4
+    # Upper bound on the metric result cache, by approximate footprint.
+    metric_cache_bytes: int = 32 * 1024 * 1024
+    # Background workers for statement uploads. PDFs have a lane of their own
+    # because any of them may need OCR; XML never does. 0 processes uploads
+    # inline, inside the request (the test suite's mode).
+    ingest_workers: int = 4
+    ingest_ocr_workers: int = 1
+    # Processes one OCR'd document's pages are spread across; 0 OCRs them one
+    # by one on the job's own thread.
+    ocr_processes: int = 2
 
     # When true (the default) Container.bootstrap() runs `alembic upgrade head`.
     # Tests set it false and use metadata.create_all instead: they build a fresh
@@ -1,12 +1,14 @@
 from .categorization import CategorizationService, normalize
-from .forecasting import ForecastingService, ForecastPoint, SimulationInput
-from .recurrence import RecurrenceService, RecurringGroup
+from .forecasting import ForecastBand, ForecastingService, ForecastPoint, SimulationInput
+from .recurrence import RecurrenceService, RecurrenceStats, RecurringGroup
 
 __all__ = [
     "CategorizationService",
     "normalize",
     "RecurrenceService",
+    "RecurrenceStats",
     "RecurringGroup",
+    "ForecastBand",
     "ForecastingService",
     "ForecastPoint",
     "SimulationInput",
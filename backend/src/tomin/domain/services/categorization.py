@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import re
 import unicodedata
+from collections import deque
 from dataclasses import dataclass
 from uuid import UUID
 
@@ -12,17 +13,30 @@ _WS = re.compile(r"\s+")
 _NOISE = re.compile(r"[^a-z0-9 ]+")
 
 
-def normalize(text: str) -> str:
+def fold(text: str) -> str:
+    """Strip accents and lowercase: the Unicode half of :func:`normalize`.
+
+    Split out because it is the expensive half and the flag heuristics start
+    from the same fold; ingest folds each description once and hands the
+    result to both.
+    """
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in text if not unicodedata.combining(c)).lower()
+
+
+def normalize(text: str, *, folded: bool = False) -> str:
     """Lowercase, strip accents and punctuation, collapse whitespace.
 
     Used both to normalize merchant labels and incoming transaction
     descriptions so that matching is robust to bank formatting noise.
+    ``folded=True`` skips the :func:`fold` step for text already through it.
     """
     if not text:
         return ""
-    text = unicodedata.normalize("NFKD", text)
-    text = "".join(c for c in text if not unicodedata.combining(c))
-    text = text.lower()
+    if not folded:
+        text = fold(text)
     text = _NOISE.sub(" ", text)
     return _WS.sub(" ", text).strip()
 
@@ -38,6 +52,8 @@ class CategorizationService:
 
     Pure domain logic: it receives the reference data (categories, merchants)
     and performs longest-label matching against a normalized description.
+    Both label sets are compiled into one :class:`LabelAutomaton`, so a
+    description is scanned once whatever the size of the merchant table.
     """
 
     def __init__(self, categories: list[Category], merchants: list[Merchant]) -> None:
@@ -50,6 +66,7 @@ class CategorizationService:
         self._merchant_index = self._build_index(
             (lbl, m.id) for m in merchants for lbl in ([m.name] + m.labels)
         )
+        self._automaton = LabelAutomaton([self._merchant_index, self._cat_index])
         self._fallback_category = next(
             (c.id for c in categories if normalize(c.name) == normalize("Sin Categoria")),
             None,
@@ -61,15 +78,82 @@ class CategorizationService:
         index.sort(key=lambda p: len(p[0]), reverse=True)
         return index
 
-    def classify(self, raw_description: str) -> Classification:
-        norm = normalize(raw_description)
-        merchant_id = self._match(norm, self._merchant_index)
-        category_id = self._match(norm, self._cat_index) or self._fallback_category
-        return Classification(category_id=category_id, merchant_id=merchant_id)
+    def classify(self, raw_description: str, *, folded: bool = False) -> Classification:
+        """``folded=True`` takes a description already through :func:`fold`."""
+        norm = normalize(raw_description, folded=folded)
+        merchant_id, category_id = self._automaton.longest(norm)
+        return Classification(
+            category_id=category_id or self._fallback_category, merchant_id=merchant_id
+        )
 
-    @staticmethod
-    def _match(norm: str, index: list[tuple[str, UUID]]) -> UUID | None:
-        for label, _id in index:
-            if label and label in norm:
-                return _id
-        return None
+
+class LabelAutomaton:
+    """Aho-Corasick matcher over one or more ranked label indexes.
+
+    Each index is a list of ``(label, id)`` pairs in priority order -- the
+    order :meth:`CategorizationService._build_index` produces, longest label
+    first. :meth:`longest` returns, per index, the id of the first pair whose
+    label occurs anywhere in the text: exactly what scanning the list with
+    ``label in text`` gives, but in a single pass over the text instead of one
+    substring search per label.
+
+    Every trie state carries, per index, the best rank among the labels that
+    end there or at any of its suffixes (folded in along the failure links at
+    build time), so the scan only has to keep a running minimum.
+    """
+
+    _NONE = 1 << 62
+
+    def __init__(self, indexes: list[list[tuple[str, UUID]]]) -> None:
+        self._ids = [[_id for _, _id in index] for index in indexes]
+        goto: list[dict[str, int]] = [{}]
+        best: list[list[int]] = [[self._NONE] * len(indexes)]
+        for k, index in enumerate(indexes):
+            for rank, (label, _) in enumerate(index):
+                state = 0
+                for ch in label:
+                    nxt = goto[state].get(ch)
+                    if nxt is None:
+                        nxt = len(goto)
+                        goto[state][ch] = nxt
+                        goto.append({})
+                        best.append([self._NONE] * len(indexes))
+                    state = nxt
+                best[state][k] = min(best[state][k], rank)
+
+        # Breadth-first, so a state's failure target is finished before it.
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                target = goto[f].get(ch, 0)
+                fail[nxt] = target if target != nxt else 0
+                best[nxt] = [min(a, b) for a, b in zip(best[nxt], best[fail[nxt]], strict=True)]
+
+        self._goto = goto
+        self._fail = fail
+        # Most states sit mid-label with nothing ending there; None lets the
+        # scan skip them without comparing.
+        self._best = [tuple(b) if min(b) != self._NONE else None for b in best]
+
+    def longest(self, text: str) -> tuple[UUID | None, ...]:
+        """The winning id per index for ``text`` (already normalized)."""
+        goto, fail, best = self._goto, self._fail, self._best
+        found = [self._NONE] * len(self._ids)
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            hit = best[state]
+            if hit is not None:
+                found = [min(a, b) for a, b in zip(found, hit, strict=True)]
+        return tuple(
+            ids[rank] if rank != self._NONE else None
+            for ids, rank in zip(self._ids, found, strict=True)
+        )
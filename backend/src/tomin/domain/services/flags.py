@@ -31,34 +31,44 @@ as ``categorization.py``.
 from __future__ import annotations
 
 import re
-import unicodedata
+from bisect import bisect_right
+from collections.abc import Iterable
 from dataclasses import dataclass
+from itertools import accumulate
+
+from .categorization import fold
 
 _WHITESPACE = re.compile(r"\s+")
 
+# The patterns run on normalized text, where every whitespace run is exactly
+# one space -- so they spell it " " rather than `\s+`, and "\n" can separate
+# descriptions in :func:`detect_flags_many` without a match spanning two.
+
 #: Explicit "I paid my own card" / "I moved money between my own accounts"
 #: wording. Nothing else. `pago tarjeta` also covers "pago tarjeta de credito".
-_TRANSFER = re.compile(
-    r"\b(?:"
-    r"pago\s+(?:de\s+)?(?:tc|tdc|tarjeta)"
+_TRANSFER = (
+    r"pago (?:de )?(?:tc|tdc|tarjeta)"
     r"|traspaso"
-    r")\b"
 )
 
 #: ATM wording. `\b` on `atm` matters -- an unanchored substring would fire on
 #: any description that happens to contain those three letters.
-_WITHDRAWAL = re.compile(
-    r"\b(?:"
+_WITHDRAWAL = (
     r"retiro|retiros"
     r"|cajero|cajeros"
     r"|atm"
-    r"|disp(?:osicion)?\s+(?:de\s+)?efectivo"
-    r")\b"
+    r"|disp(?:osicion)? (?:de )?efectivo"
 )
 
 #: A fee *about* a withdrawal is not a withdrawal. This wins over
 #: :data:`_WITHDRAWAL` rather than merely competing with it.
-_FEE = re.compile(r"\b(?:comision|comisiones|cargo\s+por\s+servicio)\b")
+_FEE = r"comision|comisiones|cargo por servicio"
+
+#: All three in one pass, told apart by group name. No word belongs to two of
+#: them, so no match can hide another by consuming its text.
+_FLAGS = re.compile(
+    rf"\b(?:(?P<transfer>{_TRANSFER})|(?P<fee>{_FEE})|(?P<withdrawal>{_WITHDRAWAL}))\b"
+)
 
 
 @dataclass(frozen=True)
@@ -69,29 +79,58 @@ class TransactionFlags:
     is_cash_withdrawal: bool = False
 
 
-def normalize_description(description: str | None) -> str:
-    """Fold accents and case so "COMISIÓN" and "comision" are one thing."""
+_NEITHER = TransactionFlags()
+
+
+def normalize_description(description: str | None, *, folded: bool = False) -> str:
+    """Fold accents and case so "COMISIÓN" and "comision" are one thing.
+
+    ``folded=True`` takes text that already went through
+    :func:`~tomin.domain.services.categorization.fold`, which ingest computes
+    once per row for the categorizer; only the cheap tail is left to do.
+    """
     if not description:
         return ""
-    folded = unicodedata.normalize("NFKD", description).encode("ascii", "ignore").decode()
-    return _WHITESPACE.sub(" ", folded.lower()).strip()
+    if not folded:
+        description = fold(description)
+    ascii_only = description.encode("ascii", "ignore").decode()
+    return _WHITESPACE.sub(" ", ascii_only).strip()
 
 
 def is_transfer(description: str | None) -> bool:
-    return bool(_TRANSFER.search(normalize_description(description)))
+    return detect_flags(description).is_transfer
 
 
 def is_cash_withdrawal(description: str | None) -> bool:
-    text = normalize_description(description)
-    if _FEE.search(text):
-        # "COMISION RETIRO CAJERO" is the bank's charge, not the cash.
-        return False
-    return bool(_WITHDRAWAL.search(text))
+    return detect_flags(description).is_cash_withdrawal
 
 
 def detect_flags(description: str | None) -> TransactionFlags:
-    """Both flags for one description. The single entry point ingest uses."""
+    """Both flags for one description."""
+    return _flags({m.lastgroup for m in _FLAGS.finditer(normalize_description(description))})
+
+
+def detect_flags_many(
+    descriptions: Iterable[str | None], *, folded: bool = False
+) -> list[TransactionFlags]:
+    """:func:`detect_flags` for a batch, with one regex scan for all of it.
+
+    The descriptions are normalized, joined with newlines and searched once;
+    each match is attributed back to its row by offset. This is the entry
+    point ingest and the flag backfill use. ``folded`` is as for
+    :func:`normalize_description`.
+    """
+    texts = [normalize_description(d, folded=folded) for d in descriptions]
+    starts = list(accumulate((len(t) + 1 for t in texts[:-1]), initial=0))
+    found: dict[int, set[str | None]] = {}
+    for m in _FLAGS.finditer("\n".join(texts)):
+        found.setdefault(bisect_right(starts, m.start()) - 1, set()).add(m.lastgroup)
+    return [_flags(found[row]) if row in found else _NEITHER for row in range(len(texts))]
+
+
+def _flags(kinds: set[str | None]) -> TransactionFlags:
     return TransactionFlags(
-        is_transfer=is_transfer(description),
-        is_cash_withdrawal=is_cash_withdrawal(description),
+        is_transfer="transfer" in kinds,
+        # "COMISION RETIRO CAJERO" is the bank's charge, not the cash.
+        is_cash_withdrawal="withdrawal" in kinds and "fee" not in kinds,
     )
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from decimal import Decimal
 
 
@@ -20,6 +20,29 @@ class SimulationInput:
     discretionary_spending: Decimal | None = None
     annual_return_rate: float = 0.0
     months: int = 12
+    #: Month-to-month standard deviations, for :meth:`ForecastingService.scenarios`.
+    #: :meth:`ForecastingService.project` is deterministic and ignores them.
+    income_volatility: Decimal = Decimal(0)
+    expense_volatility: Decimal = Decimal(0)
+
+
+@dataclass(frozen=True)
+class ForecastBand:
+    """Baseline net worth at one month, across every simulated path."""
+
+    month_offset: int
+    #: Percentile -> net worth, e.g. ``{10: ..., 50: ..., 90: ...}``.
+    percentiles: dict[int, Decimal] = field(default_factory=dict)
+
+
+def _require_numpy():
+    try:
+        import numpy
+    except ImportError as exc:  # pragma: no cover - optional dependency
+        raise RuntimeError(
+            "Forecast scenarios require the 'forecast' extra: pip install '.[forecast]'"
+        ) from exc
+    return numpy
 
 
 class ForecastingService:
@@ -28,6 +51,12 @@ class ForecastingService:
     Deliberately simple (compounding monthly cash flow) so the UI Forecast
     Simulator can call it interactively; more sophisticated modelling can be
     layered in later without changing the port.
+
+    :meth:`project` is the two deterministic paths, in ``Decimal`` to the
+    cent. :meth:`scenarios` is the stochastic view of the baseline: thousands
+    of paths whose monthly income and expenses are drawn around the same
+    means, computed with NumPy (the optional ``forecast`` extra) a month at a
+    time across every path at once.
     """
 
     def project(self, sim: SimulationInput) -> list[ForecastPoint]:
@@ -45,12 +74,14 @@ class ForecastingService:
             else (sim.monthly_income - optimized_expenses)
         )
 
+        # The same factor _step always applied, built once instead of per step.
+        growth = Decimal(1) + Decimal(str(monthly_rate))
         points: list[ForecastPoint] = []
         baseline = sim.starting_net_worth
         optimized = sim.starting_net_worth
         for month in range(1, sim.months + 1):
-            baseline = self._step(baseline, baseline_cf, monthly_rate)
-            optimized = self._step(optimized, optimized_cf, monthly_rate)
+            baseline = self._step(baseline, baseline_cf, growth)
+            optimized = self._step(optimized, optimized_cf, growth)
             points.append(
                 ForecastPoint(
                     month_offset=month,
@@ -60,7 +91,52 @@ class ForecastingService:
             )
         return points
 
+    def scenarios(
+        self,
+        sim: SimulationInput,
+        *,
+        paths: int = 2000,
+        percentiles: tuple[int, ...] = (10, 50, 90),
+        seed: int | None = None,
+    ) -> list[ForecastBand]:
+        """Percentile bands of the baseline over ``paths`` Monte Carlo paths.
+
+        Each month of each path draws income and expenses from normal
+        distributions around ``monthly_income`` / ``monthly_expenses`` with
+        the input's volatilities, floored at zero (a month cannot earn or
+        spend a negative amount), and compounds like :meth:`project`. With
+        both volatilities zero every path is the baseline, up to float
+        rounding. The same ``seed`` gives the same bands.
+        """
+        if paths < 1:
+            raise ValueError("paths must be at least 1")
+        if sim.months < 1:
+            raise ValueError("months must be at least 1")
+        np = _require_numpy()
+        rng = np.random.default_rng(seed)
+        shape = (sim.months, paths)
+        income = rng.normal(float(sim.monthly_income), float(sim.income_volatility), shape)
+        expenses = rng.normal(float(sim.monthly_expenses), float(sim.expense_volatility), shape)
+        cash_flow = np.maximum(income, 0.0) - np.maximum(expenses, 0.0)
+
+        growth = 1.0 + sim.annual_return_rate / 12.0
+        net_worth = np.empty(shape)
+        current = np.full(paths, float(sim.starting_net_worth))
+        for month in range(sim.months):
+            current = current * growth + cash_flow[month]
+            net_worth[month] = current
+
+        bands = np.percentile(net_worth, percentiles, axis=1)
+        return [
+            ForecastBand(
+                month_offset=month + 1,
+                percentiles={
+                    p: Decimal(f"{bands[i][month]:.2f}") for i, p in enumerate(percentiles)
+                },
+            )
+            for month in range(sim.months)
+        ]
+
     @staticmethod
-    def _step(net_worth: Decimal, cash_flow: Decimal, monthly_rate: float) -> Decimal:
-        grown = net_worth * (Decimal(1) + Decimal(str(monthly_rate)))
-        return (grown + cash_flow).quantize(Decimal("0.01"))
+    def _step(net_worth: Decimal, cash_flow: Decimal, growth: Decimal) -> Decimal:
+        return (net_worth * growth + cash_flow).quantize(Decimal("0.01"))
@@ -1,9 +1,9 @@
 from __future__ import annotations
 
-import statistics
+from collections.abc import Iterable
 from dataclasses import dataclass
 from datetime import date
-from decimal import Decimal
+from decimal import ROUND_HALF_UP, Decimal
 
 from ..entities.transaction import Transaction
 from ..value_objects.enums import TxType
@@ -20,51 +20,93 @@ class RecurringGroup:
     last_date: date
 
 
+@dataclass(frozen=True)
+class RecurrenceStats:
+    """Everything the rules need about one normalized description.
+
+    Plain sums and extremes, so any store can aggregate them -- the cube does
+    it in one ``GROUP BY``. The mean gap between consecutive dates needs no
+    list of dates: the gaps telescope, so their sum is ``last - first``.
+    """
+
+    label: str
+    occurrences: int
+    total_amount: Decimal
+    first_date: date
+    last_date: date
+
+
 class RecurrenceService:
     """Detects recurring expenses (subscriptions, fixed bills).
 
     Groups expense transactions by normalized description, then inspects the
-    cadence of their dates to classify a frequency.
+    cadence of their dates to classify a frequency. :meth:`detect` does the
+    grouping itself, one :meth:`update` per transaction; :meth:`groups`
+    applies the same rules to :class:`RecurrenceStats` kept elsewhere.
     """
 
     def __init__(self, min_occurrences: int = 2) -> None:
         self._min_occurrences = min_occurrences
 
+    @property
+    def min_occurrences(self) -> int:
+        return self._min_occurrences
+
     def detect(self, transactions: list[Transaction]) -> list[RecurringGroup]:
-        groups: dict[str, list[Transaction]] = {}
+        stats: dict[str, RecurrenceStats] = {}
         for tx in transactions:
-            if tx.tx_type != TxType.EXPENSE:
-                continue
-            key = normalize(tx.description or tx.raw_description)
-            if not key:
-                continue
-            groups.setdefault(key, []).append(tx)
-
-        results: list[RecurringGroup] = []
-        for key, txs in groups.items():
-            if len(txs) < self._min_occurrences:
-                continue
-            txs.sort(key=lambda t: t.tx_date)
-            intervals = [
-                (txs[i].tx_date - txs[i - 1].tx_date).days for i in range(1, len(txs))
-            ]
-            avg_interval = statistics.mean(intervals) if intervals else 0.0
-            avg_amount = Decimal(
-                str(statistics.mean(abs(float(t.amount)) for t in txs))
-            ).quantize(Decimal("0.01"))
-            results.append(
-                RecurringGroup(
-                    label=key,
-                    occurrences=len(txs),
-                    average_amount=avg_amount,
-                    average_interval_days=avg_interval,
-                    frequency=self._classify_frequency(avg_interval),
-                    last_date=txs[-1].tx_date,
-                )
-            )
-        results.sort(key=lambda g: g.average_amount, reverse=True)
+            key = self.key(tx)
+            if key:
+                stats[key] = self.update(stats.get(key), tx)
+        return self.groups(stats.values())
+
+    @staticmethod
+    def key(tx: Transaction) -> str:
+        """The group ``tx`` belongs to; empty when it belongs to none."""
+        if tx.tx_type != TxType.EXPENSE:
+            return ""
+        return normalize(tx.description or tx.raw_description)
+
+    def update(self, stats: RecurrenceStats | None, tx: Transaction) -> RecurrenceStats:
+        """``stats`` with one more occurrence, ``tx``; its first when ``stats`` is None.
+
+        The caller has already keyed ``tx`` with :meth:`key`. Order does not
+        matter: a late-arriving statement can fold in an older date.
+        """
+        if stats is None:
+            return RecurrenceStats(self.key(tx), 1, tx.amount, tx.tx_date, tx.tx_date)
+        return RecurrenceStats(
+            stats.label,
+            stats.occurrences + 1,
+            stats.total_amount + tx.amount,
+            min(stats.first_date, tx.tx_date),
+            max(stats.last_date, tx.tx_date),
+        )
+
+    def groups(self, stats: Iterable[RecurrenceStats]) -> list[RecurringGroup]:
+        """The recurring groups among ``stats``, largest average amount first."""
+        results = [self._group(s) for s in stats if s.occurrences >= self._min_occurrences]
+        # Ties go to the group seen most recently.
+        results.sort(key=lambda g: (g.average_amount, g.last_date), reverse=True)
         return results
 
+    def _group(self, s: RecurrenceStats) -> RecurringGroup:
+        # A lone occurrence has no gap to average (min_occurrences=1).
+        span = (s.last_date - s.first_date).days
+        avg_interval = span / (s.occurrences - 1) if s.occurrences > 1 else 0.0
+        # Amounts are non-negative magnitudes (see Transaction), so no abs().
+        avg_amount = (s.total_amount / s.occurrences).quantize(
+            Decimal("0.01"), rounding=ROUND_HALF_UP
+        )
+        return RecurringGroup(
+            label=s.label,
+            occurrences=s.occurrences,
+            average_amount=avg_amount,
+            average_interval_days=avg_interval,
+            frequency=self._classify_frequency(avg_interval),
+            last_date=s.last_date,
+        )
+
     @staticmethod
     def _classify_frequency(days: float) -> str:
         if days == 0:
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+import atexit
 import logging
 import threading
+import weakref
 
 from flask import Flask
 from flask_cors import CORS
 
+from .adapters.inbound.cli import register_commands
 from .adapters.inbound.http import register_blueprints
 from .adapters.inbound.http.errors import register_error_handlers
 from .config.container import Container
@@ -33,6 +36,7 @@ def create_app(settings: Settings | None = None) -> Flask:
 
     register_blueprints(app)
     register_error_handlers(app)
+    register_commands(app)
 
     bootstrap_lock = threading.Lock()
     bootstrapped = False
@@ -45,8 +49,18 @@ def create_app(settings: Settings | None = None) -> Flask:
         with bootstrap_lock:
             if not bootstrapped:
                 container.bootstrap()
+                container.fail_interrupted_uploads()
                 bootstrapped = True
 
+    # Queued uploads finish before the process exits. Held weakly so an app
+    # that is dropped (the test suite builds hundreds) is not kept alive.
+    container_ref = weakref.ref(container)
+
+    @atexit.register
+    def _drain_jobs() -> None:
+        if (live := container_ref()) is not None:
+            live.shutdown()
+
     return app
 
 
@@ -17,6 +17,10 @@ def app(tmp_path):
         # both) without paying for the migration history on every test.
         # test_migrations.py exercises the Alembic path itself.
         run_migrations=False,
+        # Uploads run inline, so a test sees its own upload without polling.
+        # test_ingestion_jobs.py starts real workers where it needs them.
+        ingest_workers=0,
+        ingest_ocr_workers=0,
     )
     application = create_app(settings)
     # The app defers bootstrap to the first request (DuckDB single-writer lock
@@ -163,3 +163,111 @@ def test_the_dashboard_period_never_narrows_the_baseline(app, client, period):
     (row,) = resp.get_json()["results"]["a"]["rows"]
     assert row["active"] is True
     assert row["months_of_history"] == 6
+
+
+# --- kept between renders -------------------------------------------------
+class _Recording:
+    """Passes queries through, remembering the period of each."""
+
+    def __init__(self, engine):
+        self._engine = engine
+        self.periods = []
+
+    def execute_many(self, user_id, requests):
+        self.periods += [(q.period.start, q.period.end) for _, q in requests]
+        return self._engine.execute_many(user_id, requests)
+
+
+def _resolver():
+    from tomin.adapters.outbound.cube import DuckDbCube, DuckDbMetricEngine
+    from tomin.adapters.outbound.metrics import FinancialAdviceResolver
+
+    cube = DuckDbCube(":memory:")
+    engine = _Recording(DuckDbMetricEngine(cube))
+    return cube, engine, FinancialAdviceResolver(engine, cube)
+
+
+def _resolve(resolver):
+    from tomin.application.dtos.metrics import MetricQuery, ResolverContext
+    from tomin.domain.metrics.catalog import METRIC_CATALOG
+
+    spec = METRIC_CATALOG["financial_advice"]
+    return resolver.resolve(
+        DEV_USER, MetricQuery(key="a", metric=spec.id), ResolverContext(spec=spec)
+    )
+
+
+def _flows(months):
+    return [
+        Transaction(
+            user_id=DEV_USER,
+            tx_date=_month(index),
+            amount=Decimal(amount),
+            raw_description=desc,
+            tx_type=kind,
+        )
+        for index, (income, expense) in months
+        for amount, desc, kind in (
+            (income, "Nomina", TxType.INCOME),
+            (expense, "Super", TxType.EXPENSE),
+        )
+    ]
+
+
+def test_an_unchanged_history_is_neither_queried_nor_evaluated_again(monkeypatch):
+    from tomin.adapters.outbound.metrics.resolvers import advice
+
+    cube, engine, resolver = _resolver()
+    cube.upsert_transactions(_flows(enumerate([(20000, 8000)] * 6, start=1)))
+    first = _resolve(resolver)
+
+    evaluated = []
+    monkeypatch.setattr(
+        advice, "evaluate_principles", lambda series: evaluated.append(series) or []
+    )
+    cube.sync_tags([])  # a label write: a new data version, the same facts
+    again = _resolve(resolver)
+
+    assert again.rows == first.rows
+    assert again.meta == first.meta
+    assert engine.periods == [(None, None)]
+    assert evaluated == []
+
+
+def test_a_new_month_rereads_that_month_only():
+    cube, engine, resolver = _resolver()
+    cube.upsert_transactions(_flows(enumerate([(20000, 8000)] * 5, start=1)))
+    assert _resolve(resolver).meta.source_txn_count == 10
+
+    cube.upsert_transactions(_flows([(6, (30000, 8000))]))
+    result = _resolve(resolver)
+
+    assert engine.periods == [(None, None), (date(2024, 6, 1), date(2024, 6, 30))]
+    (row,) = result.rows
+    assert (row["active"], row["month"], row["suggested_amount"]) == (True, "2024-06", "10000.00")
+    assert result.meta.source_txn_count == 12
+
+
+def test_an_edit_that_empties_a_month_drops_it_from_the_series():
+    cube, engine, resolver = _resolver()
+    txs = _flows(enumerate([(20000, 8000)] * 6, start=1))
+    cube.upsert_transactions(txs)
+    _resolve(resolver)
+
+    cube.delete_transactions([t.id for t in txs if t.tx_date.month == 6])
+    (row,) = _resolve(resolver).rows
+
+    assert (row["month"], row["months_of_history"]) == ("2024-05", 5)
+    assert engine.periods[-1] == (date(2024, 6, 1), date(2024, 6, 30))
+
+
+def test_a_rebuild_rereads_the_whole_history():
+    cube, engine, resolver = _resolver()
+    txs = _flows(enumerate([(20000, 8000)] * 6, start=1))
+    cube.upsert_transactions(txs)
+    _resolve(resolver)
+
+    cube.rebuild_for_user(DEV_USER, txs[:4])
+
+    assert _resolve(resolver).rows[0]["months_of_history"] == 2
+    assert engine.periods == [(None, None), (None, None)]
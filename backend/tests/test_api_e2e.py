@@ -11,7 +11,7 @@ def test_upload_cfdi_then_query(client, sample_cfdi_bytes):
         data={"file": (sample_cfdi_bytes, "factura.xml")},
         content_type="multipart/form-data",
     )
-    assert resp.status_code == 201, resp.get_data(as_text=True)
+    assert resp.status_code == 202, resp.get_data(as_text=True)
     body = resp.get_json()
     assert body["template"] == "sat_cfdi"
     assert body["transactions_created"] == 1
@@ -39,7 +39,7 @@ def test_duplicate_upload_rejected(client, sample_cfdi_bytes):
         data={"file": (io.BytesIO(data), "factura.xml")},
         content_type="multipart/form-data",
     )
-    assert first.status_code == 201
+    assert first.status_code == 202
     second = client.post(
         "/api/statements",
         data={"file": (io.BytesIO(data), "factura.xml")},
@@ -54,7 +54,7 @@ def test_list_and_delete_statement(client, sample_cfdi_bytes):
         data={"file": (sample_cfdi_bytes, "factura.xml")},
         content_type="multipart/form-data",
     )
-    assert created.status_code == 201
+    assert created.status_code == 202
     statement_id = created.get_json()["statement_id"]
 
     listing = client.get("/api/statements").get_json()
@@ -94,7 +94,7 @@ def test_delete_statement_frees_the_duplicate_hash(client, sample_cfdi_bytes):
         data={"file": (io.BytesIO(data), "factura.xml")},
         content_type="multipart/form-data",
     )
-    assert again.status_code == 201
+    assert again.status_code == 202
 
 
 def test_goals_crud(client):
@@ -46,3 +46,52 @@ def test_longest_label_wins():
     result = svc.classify("compra uber eats centro")
     b = next(c for c in categories if c.name == "B")
     assert result.category_id == b.id
+
+
+def test_longest_label_wins_wherever_it_sits_in_the_description():
+    categories = [
+        Category(name="Short", categorization_labels=["eats"]),
+        Category(name="Long", categorization_labels=["uber eats mx"]),
+    ]
+    merchants = [
+        Merchant(name="Uber", labels=["uber"]),
+        Merchant(name="Uber Eats", labels=["uber eats"]),
+    ]
+    svc = CategorizationService(categories, merchants)
+
+    result = svc.classify("EATS ... UBER EATS MX 991")
+
+    assert result.category_id == categories[1].id
+    assert result.merchant_id == merchants[1].id
+
+
+def test_equal_length_labels_keep_their_listing_order():
+    # "oxxo" ends inside "soxxo"; between the two four-letter hits in
+    # "oxxo gaso" the merchant listed first wins, as the old scan did.
+    merchants = [
+        Merchant(name="First", labels=["gaso"]),
+        Merchant(name="Second", labels=["oxxo"]),
+        Merchant(name="Third", labels=["soxxo"]),
+    ]
+    svc = CategorizationService([], merchants)
+
+    assert svc.classify("oxxo gaso").merchant_id == merchants[0].id
+    assert svc.classify("soxxo gaso").merchant_id == merchants[2].id
+    assert svc.classify("boxxo").merchant_id == merchants[1].id
+    assert svc.classify("box").merchant_id is None
+
+
+def test_automaton_agrees_with_a_plain_label_scan():
+    import random
+
+    rng = random.Random(5)
+    for _ in range(200):
+        labels = ["".join(rng.choice("ab ") for _ in range(rng.randint(1, 4))) for _ in range(6)]
+        categories = [
+            Category(name=f"c{i}", categorization_labels=[lb]) for i, lb in enumerate(labels)
+        ]
+        svc = CategorizationService(categories, [])
+        for _ in range(10):
+            text = normalize("".join(rng.choice("ab c") for _ in range(rng.randint(0, 12))))
+            expected = next((_id for lb, _id in svc._cat_index if lb in text), None)
+            assert svc.classify(text).category_id == expected
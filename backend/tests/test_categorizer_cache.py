@@ -0,0 +1,75 @@
+"""The categorizer is built once per process and rebuilt only when labels change."""
+
+from __future__ import annotations
+
+import io
+
+from tomin.domain.entities import Category, Merchant
+
+
+def _counting(monkeypatch, repo) -> list[str]:
+    reads = []
+    get_all = repo.get_all
+
+    def counted():
+        reads.append(type(repo).__name__)
+        return get_all()
+
+    monkeypatch.setattr(repo, "get_all", counted)
+    return reads
+
+
+def _upload(client, name: str, emisor: str):
+    xml = (
+        '<?xml version="1.0"?>'
+        '<cfdi:Comprobante xmlns:cfdi="http://www.sat.gob.mx/cfd/4" '
+        'Total="120.00" Fecha="2024-02-10T09:00:00" TipoDeComprobante="I">'
+        f'<cfdi:Emisor Nombre="{emisor}" Rfc="XAXX010101000"/>'
+        "</cfdi:Comprobante>"
+    )
+    resp = client.post(
+        "/api/statements",
+        data={"file": (io.BytesIO(xml.encode()), name)},
+        content_type="multipart/form-data",
+    )
+    assert resp.status_code == 202
+    return resp
+
+
+def test_uploads_reuse_one_categorizer(app, client, monkeypatch):
+    container = app.extensions["container"]
+    client.get("/api/statements")  # the app's own first-request bootstrap reads them too
+    category_reads = _counting(monkeypatch, container.categories)
+    merchant_reads = _counting(monkeypatch, container.merchants)
+
+    for i in range(3):
+        _upload(client, f"f{i}.xml", f"OXXO {i}")
+
+    # Read once for the first upload, never again.
+    assert (len(category_reads), len(merchant_reads)) == (1, 1)
+    assert container.categorizer.get() is container.categorizer.get()
+
+
+def test_new_reference_data_is_picked_up_by_the_next_upload(app, client):
+    container = app.extensions["container"]
+    _upload(client, "a.xml", "LIBRERIA GANDHI")
+    before = container.categorizer.get()
+
+    category = Category(name="Libros", categorization_labels=["gandhi"])
+    container.categories.add_many([category])
+    container.merchants.add_many([Merchant(name="Gandhi", labels=["libreria gandhi"])])
+    _upload(client, "b.xml", "LIBRERIA GANDHI SUC 2")
+
+    assert container.categorizer.get() is not before
+    rows = {t["raw_description"]: t for t in client.get("/api/transactions").get_json()["items"]}
+    assert rows["LIBRERIA GANDHI SUC 2"]["category_id"] == str(category.id)
+    assert rows["LIBRERIA GANDHI"]["category_id"] != str(category.id)
+
+
+def test_each_write_moves_the_repository_version(app):
+    container = app.extensions["container"]
+    seen = {container.categories.version(), container.merchants.version()}
+
+    container.categories.add_many([Category(name="Mascotas", categorization_labels=["petco"])])
+
+    assert container.categories.version() not in seen
@@ -1,7 +1,10 @@
+import threading
 from datetime import date
 from decimal import Decimal
 from uuid import uuid4
 
+import pytest
+
 from tomin.adapters.outbound.cube import DuckDbCube
 from tomin.domain.entities import Category, Transaction
 from tomin.domain.value_objects.enums import TxType
@@ -44,3 +47,71 @@ def test_upsert_is_idempotent():
     cube.upsert_transactions([tx])  # same id again
     summary = cube.spending_summary(user)
     assert summary.total_expense == Decimal("100.00")
+
+
+def test_reads_run_on_cursors_beside_the_writer():
+    cube = DuckDbCube(":memory:", readers=2)
+    user = uuid4()
+    cube.upsert_transactions([
+        Transaction(user_id=user, tx_date=date(2024, 1, 5), amount=Decimal(100),
+                    raw_description="OXXO", tx_type=TxType.EXPENSE),
+    ])
+
+    # Once its cursor exists, a read must not need the writer lock -- that is
+    # the point of the cursors. (Opening a cursor does take it, briefly.)
+    cube.spending_summary(user)
+    with cube._lock:
+        assert cube.spending_summary(user).total_expense == Decimal("100.00")
+
+    with cube._reading() as first, cube._reading() as second:
+        assert first is not second
+        assert first is not cube._con
+
+
+def test_a_read_never_sees_half_of_a_write():
+    cube = DuckDbCube(":memory:")
+    user = uuid4()
+    history = [
+        Transaction(user_id=user, tx_date=date(2024, 1, 1 + i % 28), amount=Decimal(10),
+                    raw_description="OXXO", tx_type=TxType.EXPENSE)
+        for i in range(200)
+    ]
+    cube.rebuild_for_user(user, iter(history))
+
+    seen: set[Decimal] = set()
+    stop = threading.Event()
+
+    def reader():
+        while not stop.is_set():
+            seen.add(cube.spending_summary(user).total_expense)
+
+    threads = [threading.Thread(target=reader) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for _ in range(20):
+        cube.rebuild_for_user(user, iter(history))
+    stop.set()
+    for t in threads:
+        t.join()
+
+    # A rebuild deletes the user's facts and re-inserts them; between the two
+    # a reader outside the transaction would have seen 0.
+    assert seen == {Decimal("2000.00")}
+
+
+def test_a_failed_write_rolls_back_whole():
+    cube = DuckDbCube(":memory:")
+    user = uuid4()
+    tx = Transaction(user_id=user, tx_date=date(2024, 1, 5), amount=Decimal(100),
+                     raw_description="OXXO", tx_type=TxType.EXPENSE)
+    cube.upsert_transactions([tx])
+
+    def broken():
+        yield tx
+        raise RuntimeError("source went away")
+
+    with pytest.raises(RuntimeError):
+        cube.rebuild_for_user(user, broken())
+
+    assert cube.spending_summary(user).total_expense == Decimal("100.00")
+    assert cube.monthly_series(user)[-1].expense == Decimal("100.00")
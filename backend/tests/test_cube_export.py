@@ -0,0 +1,143 @@
+"""Cube tables out as Parquet: one snapshot, scoped per user, written by DuckDB."""
+
+from __future__ import annotations
+
+import io
+import tempfile
+import zipfile
+from datetime import date
+from decimal import Decimal
+from uuid import UUID, uuid4
+
+import duckdb
+import pytest
+
+from tomin.adapters.inbound.cli import export_cube_command
+from tomin.domain.entities import Category, Transaction
+from tomin.domain.value_objects.enums import TxType
+
+DEV_USER = UUID("00000000-0000-0000-0000-000000000001")
+OTHER_USER = uuid4()
+
+
+@pytest.fixture
+def seeded(app, client):
+    """Three DEV_USER rows (one tagged), two of someone else's."""
+    container = app.extensions["container"]
+    comida = Category(name="Comida")
+    container.categories.add_many([comida])
+    container.cube.sync_categories(container.categories.get_all())
+
+    txs = [
+        Transaction(
+            user_id=user,
+            tx_date=date(2024, month, 5),
+            amount=Decimal(f"{100 * month}.25"),
+            raw_description=f"OXXO {month}",
+            tx_type=TxType.EXPENSE,
+            category_id=comida.id,
+        )
+        for user, months in ((DEV_USER, (1, 2, 3)), (OTHER_USER, (1, 2)))
+        for month in months
+    ]
+    container.transactions.add_many(txs)
+    container.cube.upsert_transactions(txs)
+
+    tag = client.post("/api/tags", json={"name": "Viaje"}).get_json()
+    client.put(f"/api/transactions/{txs[0].id}/tags", json={"tag_ids": [tag["id"]]})
+    return txs
+
+
+def _read(path) -> list[tuple]:
+    return duckdb.sql(f"SELECT * FROM read_parquet('{path}')").fetchall()
+
+
+def test_the_export_writes_one_parquet_file_per_table(app, seeded, tmp_path):
+    container = app.extensions["container"]
+    result = container.export_cube.execute(tmp_path / "all")
+
+    assert result.rows == {
+        "fact_transactions": 5,
+        "bridge_transaction_tag": 1,
+        "dim_category": len(container.categories.get_all()),
+        "dim_tag": 1,
+    }
+    for table, rows in result.rows.items():
+        assert len(_read(result.path(table))) == rows
+    amounts = duckdb.sql(
+        f"SELECT amount FROM read_parquet('{result.path('fact_transactions')}') ORDER BY amount"
+    ).fetchall()
+    # Decimals stay decimals: no float on the way through.
+    assert amounts[0] == (Decimal("100.25"),)
+
+
+def test_a_user_export_holds_only_that_users_rows(app, seeded, tmp_path):
+    result = app.extensions["container"].export_cube.execute(tmp_path, user_id=OTHER_USER)
+
+    assert result.rows["fact_transactions"] == 2
+    # Their rows carry no tags; DEV_USER's tag stays out.
+    assert result.rows["bridge_transaction_tag"] == 0
+    assert result.rows["dim_tag"] == 0
+    users = duckdb.sql(
+        f"SELECT DISTINCT user_id FROM read_parquet('{result.path('fact_transactions')}')"
+    ).fetchall()
+    assert users == [(str(OTHER_USER),)]
+
+
+def test_unknown_tables_are_refused(app, tmp_path):
+    with pytest.raises(ValueError, match="rollup"):
+        app.extensions["container"].export_cube.execute(tmp_path, tables=["rollup"])
+
+
+def test_the_parquet_download_is_the_callers_facts(client, seeded, tmp_path):
+    response = client.get("/api/transactions/export.parquet")
+
+    assert response.status_code == 200
+    assert response.mimetype == "application/vnd.apache.parquet"
+    body = response.get_data()
+    assert int(response.headers["Content-Length"]) == len(body)
+    path = tmp_path / "download.parquet"
+    path.write_bytes(body)
+    descriptions = duckdb.sql(
+        f"SELECT description FROM read_parquet('{path}') ORDER BY description"
+    ).fetchall()
+    assert descriptions == [("OXXO 1",), ("OXXO 2",), ("OXXO 3",)]
+
+
+@pytest.mark.parametrize("url", ["/api/transactions/export.parquet", "/api/admin/cube/export"])
+def test_the_scratch_files_go_even_when_the_body_is_never_read(
+    client, seeded, tmp_path, monkeypatch, url
+):
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+
+    head = client.head(url)
+    head.close()
+    got = client.get(url)
+    got.get_data()
+    got.close()
+
+    assert head.status_code == 200
+    assert int(head.headers["Content-Length"]) == len(got.get_data())
+    assert list(tmp_path.glob("tomin-export-*")) == []
+
+
+def test_the_admin_export_zips_every_table_for_the_caller(client, seeded):
+    response = client.get("/api/admin/cube/export")
+
+    assert response.status_code == 200
+    with zipfile.ZipFile(io.BytesIO(response.get_data())) as zf:
+        assert sorted(zf.namelist()) == [
+            "bridge_transaction_tag.parquet",
+            "dim_category.parquet",
+            "dim_tag.parquet",
+            "fact_transactions.parquet",
+        ]
+        assert {info.compress_type for info in zf.infolist()} == {zipfile.ZIP_STORED}
+
+
+def test_the_command_exports_everyone(app, seeded, tmp_path):
+    out = app.test_cli_runner().invoke(export_cube_command, [str(tmp_path / "out")])
+
+    assert out.exit_code == 0, out.output
+    assert "fact_transactions.parquet: 5 row(s)" in out.output
+    assert (tmp_path / "out" / "dim_tag.parquet").exists()
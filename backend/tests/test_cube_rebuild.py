@@ -153,7 +153,7 @@ def test_admin_rebuild_endpoint(client, sample_cfdi_bytes):
         data={"file": (sample_cfdi_bytes, "factura.xml")},
         content_type="multipart/form-data",
     )
-    assert upload.status_code == 201
+    assert upload.status_code == 202
     created = upload.get_json()["transactions_created"]
     assert created == 1
 
@@ -178,3 +178,159 @@ def test_admin_rebuild_recovers_a_wiped_cube(client, app, sample_cfdi_bytes):
 
     summary = client.get("/api/analytics/summary").get_json()
     assert pytest.approx(summary["total_expense"]) == 500.0
+
+
+# --- bulk load ------------------------------------------------------------
+def _bridge(cube, tx):
+    return {
+        r[0]
+        for r in cube._con.execute(
+            "SELECT tag_id FROM bridge_transaction_tag WHERE tx_id = ?", [str(tx.id)]
+        ).fetchall()
+    }
+
+
+def test_upsert_rederives_bridge_rows_for_the_whole_batch():
+    cube = DuckDbCube(":memory:")
+    user = uuid4()
+    viaje, deducible = uuid4(), uuid4()
+    tagged, plain = _tx(user, 5, "100"), _tx(user, 6, "300")
+    tagged.tag_ids = [viaje, deducible]
+    cube.upsert_transactions([tagged, plain])
+    assert _bridge(cube, tagged) == {str(viaje), str(deducible)}
+    assert _bridge(cube, plain) == set()
+
+    # Untagging has to remove a row, not merely fail to add one.
+    tagged.tag_ids = [deducible]
+    cube.upsert_transactions([tagged])
+
+    assert _bridge(cube, tagged) == {str(deducible)}
+    assert cube._con.execute(
+        "SELECT tag_ids FROM fact_transactions WHERE tx_id = ?", [str(tagged.id)]
+    ).fetchone()[0] == [str(deducible)]
+
+
+def test_upsert_of_a_repeated_id_in_one_batch_keeps_the_last():
+    cube = DuckDbCube(":memory:")
+    user = uuid4()
+    tx = _tx(user, 5, "100")
+    edited = _tx(user, 5, "250")
+    edited.id = tx.id
+
+    cube.upsert_transactions([tx, edited])
+
+    assert _fact_count(cube, user) == 1
+    assert cube.spending_summary(user).total_expense == Decimal("250.00")
+
+
+def test_rebuild_spans_several_staged_batches(monkeypatch):
+    from tomin.adapters.outbound.cube import duckdb_cube
+
+    monkeypatch.setattr(duckdb_cube, "_BULK_BATCH", 2)
+    cube = DuckDbCube(":memory:")
+    user = uuid4()
+    txs = [_tx(user, day, "10") for day in range(1, 8)]
+
+    assert cube.rebuild_for_user(user, iter(txs)) == 7
+    assert _fact_count(cube, user) == 7
+    assert cube.spending_summary(user).total_expense == Decimal("70.00")
+
+
+# --- whole fleet ----------------------------------------------------------
+def _seed_fleet(container, users):
+    for n, user in enumerate(users, start=1):
+        txs = [_tx(user, day, "10") for day in range(1, 2 + 2 * n)]
+        container.transactions.add_many(txs)
+        container.cube.upsert_transactions(txs)
+
+
+def test_the_fleet_rebuild_recovers_every_user_of_a_wiped_cube(app):
+    container = app.extensions["container"]
+    users = sorted([uuid4(), uuid4(), uuid4()])
+    _seed_fleet(container, users)
+    container.cube._con.execute("DELETE FROM fact_transactions")
+
+    result = container.rebuild_fleet.execute(workers=2, batch_size=2)
+
+    assert (result.users, result.users_total, result.rows) == (3, 3, 3 + 5 + 7)
+    assert [_fact_count(container.cube, u) for u in users] == [3, 5, 7]
+    assert container.cube.spending_summary(users[2]).total_expense == Decimal("70.00")
+
+
+def test_the_fleet_rebuild_resumes_after_the_last_finished_user(app):
+    container = app.extensions["container"]
+    users = sorted([uuid4(), uuid4(), uuid4()])
+    _seed_fleet(container, users)
+    container.cube._con.execute("DELETE FROM fact_transactions")
+    progress = []
+
+    result = container.rebuild_fleet.execute(after_user=users[0], on_user=progress.append)
+
+    assert [(p.users, p.users_total, p.last_user, p.rows) for p in progress] == [
+        (1, 2, users[1], 5),
+        (2, 2, users[2], 12),
+    ]
+    assert result.last_user == users[2]
+    assert _fact_count(container.cube, users[0]) == 0
+
+
+class _FailingTransactionRepo(_FakeTransactionRepo):
+    def __init__(self, rows, broken):
+        super().__init__(rows)
+        self._broken = broken
+
+    def user_ids(self):
+        return sorted({t.user_id for t in self._rows})
+
+    def iter_for_user(self, user_id, *, batch_size=500):
+        for n, t in enumerate(super().iter_for_user(user_id)):
+            if user_id == self._broken and n == 2:
+                raise RuntimeError("connection lost")
+            yield t
+
+
+class _NoTags:
+    def list_for_user(self, user_id):
+        return []
+
+
+def test_a_failed_read_aborts_the_fleet_rebuild_and_keeps_that_users_rows():
+    from tomin.application.use_cases import RebuildFleetUseCase
+
+    cube = DuckDbCube(":memory:")
+    users = sorted([uuid4(), uuid4(), uuid4()])
+    rows = [_tx(user, day, "10") for user in users for day in range(1, 6)]
+    cube.upsert_transactions(rows)
+    repo = _FailingTransactionRepo(rows, broken=users[1])
+    progress = []
+
+    with pytest.raises(RuntimeError, match="connection lost"):
+        RebuildFleetUseCase(repo, cube, _NoTags()).execute(
+            workers=3, batch_size=1, on_user=progress.append
+        )
+
+    # The first user finished; the second's rebuild rolled back whole.
+    assert [p.last_user for p in progress] == [users[0]]
+    assert [_fact_count(cube, u) for u in users] == [5, 5, 5]
+
+
+def test_the_rebuild_command_keeps_a_checkpoint_until_it_finishes(app, tmp_path):
+    from tomin.adapters.inbound.cli import rebuild_cube_command
+
+    container = app.extensions["container"]
+    users = sorted([uuid4(), uuid4()])
+    _seed_fleet(container, users)
+    container.cube._con.execute("DELETE FROM fact_transactions")
+    checkpoint = tmp_path / "rebuild.checkpoint"
+    checkpoint.write_text(f"{users[0]}\n")
+
+    out = app.test_cli_runner().invoke(
+        rebuild_cube_command, ["--checkpoint", str(checkpoint), "--workers", "2"]
+    )
+
+    assert out.exit_code == 0, out.output
+    assert f"Resuming after user {users[0]}" in out.output
+    assert f"[1/1] {users[1]}: 5 row(s) so far" in out.output
+    assert "1 user(s), 5 fact row(s) rebuilt" in out.output
+    assert not checkpoint.exists()
+    assert [_fact_count(container.cube, u) for u in users] == [0, 5]
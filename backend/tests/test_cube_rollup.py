@@ -0,0 +1,207 @@
+"""The monthly rollup: kept in step by every cube write, and actually read.
+
+The planner may answer a metric from ``rollup_monthly_category`` only when the
+answer is indistinguishable from the one the facts give, so most of these tests
+run the same query down both paths and compare.
+"""
+
+from __future__ import annotations
+
+from dataclasses import replace
+from datetime import date
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+
+from tomin.adapters.outbound.cube import DuckDbCube, DuckDbMetricEngine
+from tomin.adapters.outbound.cube import duckdb_metric_engine as engine_module
+from tomin.application.dtos.metrics import MetricQuery, Period
+from tomin.domain.entities import Category, Transaction
+from tomin.domain.metrics.catalog import METRIC_CATALOG
+from tomin.domain.metrics.spec import normalize
+from tomin.domain.value_objects.enums import TxType
+
+COMIDA = Category(name="Comida")
+RENTA = Category(name="Renta")
+
+
+def _tx(user, when, amount, tx_type=TxType.EXPENSE, **kwargs):
+    return Transaction(
+        user_id=user,
+        tx_date=when,
+        amount=Decimal(amount),
+        raw_description=kwargs.pop("description", "MOVIMIENTO"),
+        tx_type=tx_type,
+        **kwargs,
+    )
+
+
+@pytest.fixture
+def cube():
+    cube = DuckDbCube(":memory:")
+    cube.sync_categories([COMIDA, RENTA])
+    return cube
+
+
+@pytest.fixture
+def history(cube):
+    user = uuid4()
+    viaje = uuid4()
+    txs = [
+        _tx(user, date(2024, 1, 3), "120", category_id=COMIDA.id, tag_ids=[viaje]),
+        _tx(user, date(2024, 1, 15), "8000", category_id=RENTA.id),
+        _tx(user, date(2024, 1, 31), "30000", TxType.INCOME),
+        _tx(user, date(2024, 2, 2), "5000", is_transfer=True),
+        _tx(user, date(2024, 2, 9), "1500", is_cash_withdrawal=True),
+        _tx(user, date(2024, 2, 14), "640", category_id=COMIDA.id, excluded_from_stats=True),
+        _tx(user, date(2024, 2, 20), "55", currency="USD", category_id=COMIDA.id),
+        _tx(user, date(2024, 3, 1), "300", category_id=COMIDA.id, tag_ids=[viaje]),
+    ]
+    cube.upsert_transactions(txs)
+    return user, txs, viaje
+
+
+def _run(cube, user, metric, **fields):
+    spec = METRIC_CATALOG[metric]
+    query = normalize(spec, MetricQuery(key="k", metric=metric, **fields))
+    return DuckDbMetricEngine(cube).execute(user, spec, query)
+
+
+def _planned(metric, **fields):
+    spec = METRIC_CATALOG[metric]
+    query = normalize(spec, MetricQuery(key="k", metric=metric, **fields))
+    measures = [engine_module.MEASURES[m] for m in spec.measures]
+    return DuckDbMetricEngine._plan(spec, query, measures)
+
+
+def _rollup(cube, user):
+    return sorted(
+        cube._con.execute(
+            "SELECT month, category_id, currency, tx_type, excluded_from_stats, "
+            "is_transfer, is_cash_withdrawal, amount, row_count "
+            "FROM rollup_monthly_category WHERE user_id = ?",
+            [str(user)],
+        ).fetchall(),
+        key=str,
+    )
+
+
+def _rollup_from_facts(cube, user):
+    return sorted(
+        cube._con.execute(
+            "SELECT CAST(date_trunc('month', tx_date) AS DATE), category_id, currency, "
+            "tx_type, excluded_from_stats, is_transfer, is_cash_withdrawal, SUM(amount), "
+            "COUNT(*) FROM fact_transactions WHERE user_id = ? GROUP BY ALL",
+            [str(user)],
+        ).fetchall(),
+        key=str,
+    )
+
+
+# --- the planner ----------------------------------------------------------
+_JAN = Period(date(2024, 1, 1), date(2024, 1, 31))
+
+
+@pytest.mark.parametrize(
+    "metric, fields",
+    [
+        ("spend_by_category", {}),
+        ("spend_by_category", {"period": _JAN}),
+        ("spend_by_category", {"dimensions": ("tx_type",), "filters": {"currency": "USD"}}),
+        ("monthly_cash_flow", {"filters": {"category": [str(COMIDA.id)]}}),
+        ("accumulated_spend", {"period": Period(date(2024, 1, 1), date(2024, 2, 29))}),
+        ("cash_withdrawn", {}),
+        ("lifetime_flow", {"period": Period(date(2024, 1, 10), date(2024, 1, 12))}),
+    ],
+)
+def test_covered_queries_are_routed_to_the_rollup(metric, fields):
+    assert _planned(metric, **fields) is engine_module._ROLLUP
+
+
+@pytest.mark.parametrize(
+    "metric, fields",
+    [
+        ("tag_totals", {}),
+        ("spend_by_category", {"filters": {"tag": "viaje"}}),
+        ("accumulated_spend", {"grain": "day"}),
+        ("spend_by_category", {"period": Period(date(2024, 1, 10), date(2024, 1, 31))}),
+        ("spend_by_category", {"period": Period(date(2024, 1, 1), date(2024, 1, 30))}),
+    ],
+)
+def test_uncovered_queries_fall_through_to_facts(metric, fields):
+    assert _planned(metric, **fields) is engine_module._FACTS
+
+
+@pytest.mark.parametrize(
+    "metric, fields",
+    [
+        ("spend_by_category", {}),
+        ("spend_by_category", {"period": _JAN}),
+        ("spend_by_category", {"dimensions": ("tx_type",)}),
+        ("spend_by_category", {"filters": {"currency": "USD"}}),
+        ("monthly_cash_flow", {}),
+        ("monthly_cash_flow", {"filters": {"category": [str(COMIDA.id), str(RENTA.id)]}}),
+        ("accumulated_spend", {}),
+        ("cash_withdrawn", {}),
+        ("lifetime_flow", {}),
+    ],
+)
+def test_rollup_answers_match_the_facts(cube, history, monkeypatch, metric, fields):
+    user, _, _ = history
+    from_rollup = _run(cube, user, metric, **fields)
+
+    monkeypatch.setattr(
+        DuckDbMetricEngine, "_plan", staticmethod(lambda *args: engine_module._FACTS)
+    )
+    from_facts = _run(cube, user, metric, **fields)
+
+    assert from_rollup == from_facts
+    assert from_rollup.rows  # a vacuous match proves nothing
+
+
+# --- maintenance ----------------------------------------------------------
+def test_upsert_keeps_the_rollup_equal_to_its_facts(cube, history):
+    user, txs, _ = history
+    assert _rollup(cube, user) == _rollup_from_facts(cube, user)
+
+    # An edit that moves a row to another category *and* another month must
+    # empty the bucket it left, not only fill the one it joined.
+    moved = replace(txs[0], tx_date=date(2024, 3, 9), category_id=RENTA.id)
+    cube.upsert_transactions([moved])
+
+    assert _rollup(cube, user) == _rollup_from_facts(cube, user)
+    january = [r for r in _rollup(cube, user) if r[0] == date(2024, 1, 1)]
+    assert all(r[1] != str(COMIDA.id) for r in january)
+
+
+def test_delete_keeps_the_rollup_equal_to_its_facts(cube, history):
+    user, txs, _ = history
+    cube.delete_transactions([t.id for t in txs if t.tx_date.month == 2])
+
+    assert _rollup(cube, user) == _rollup_from_facts(cube, user)
+    assert all(r[0] != date(2024, 2, 1) for r in _rollup(cube, user))
+
+
+def test_rebuild_rederives_the_users_rollup(cube, history):
+    user, txs, _ = history
+    cube._con.execute("DELETE FROM rollup_monthly_category")
+
+    cube.rebuild_for_user(user, iter(txs[:3]))
+
+    assert _rollup(cube, user) == _rollup_from_facts(cube, user)
+    assert sum(r[-1] for r in _rollup(cube, user)) == 3
+
+
+def test_a_cube_file_from_before_the_rollup_is_backfilled(tmp_path):
+    path = str(tmp_path / "cube.duckdb")
+    user = uuid4()
+    cube = DuckDbCube(path)
+    cube.upsert_transactions([_tx(user, date(2024, 1, 5), "100")])
+    cube._con.execute("DROP TABLE rollup_monthly_category")
+    cube._con.close()
+
+    reopened = DuckDbCube(path)
+
+    assert reopened.monthly_series(user)[-1].expense == Decimal("100.00")
+    assert _rollup(reopened, user) == _rollup_from_facts(reopened, user)
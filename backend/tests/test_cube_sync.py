@@ -0,0 +1,174 @@
+"""Incremental cube sync: the change log, per-user marks, and only the delta applied."""
+
+from __future__ import annotations
+
+from datetime import date
+from decimal import Decimal
+from uuid import UUID, uuid4
+
+import pytest
+
+from tomin.adapters.inbound.cli import sync_cube_command
+from tomin.domain.entities import Statement, Tag, Transaction
+from tomin.domain.value_objects.enums import SourceType, TxType
+
+DEV_USER = UUID("00000000-0000-0000-0000-000000000001")
+
+
+def _tx(user, day, amount="10", statement_id=None):
+    return Transaction(
+        user_id=user,
+        tx_date=date(2024, 1, day),
+        amount=Decimal(amount),
+        raw_description=f"OXXO {day}",
+        tx_type=TxType.EXPENSE,
+        statement_id=statement_id,
+    )
+
+
+def _facts(cube, user) -> dict[str, tuple]:
+    return {
+        tx_id: (amount, description, tag_ids)
+        for tx_id, amount, description, tag_ids in cube._con.execute(
+            "SELECT tx_id, amount, description, tag_ids FROM fact_transactions WHERE user_id = ?",
+            [str(user)],
+        ).fetchall()
+    }
+
+
+def _truth(container, user) -> dict[str, tuple]:
+    return {
+        str(t.id): (t.amount, t.description or t.raw_description, [str(g) for g in t.tag_ids])
+        for t in container.transactions.iter_for_user(user)
+    }
+
+
+@pytest.fixture
+def container(app):
+    return app.extensions["container"]
+
+
+def test_every_kind_of_write_is_logged_against_its_transaction(container):
+    statement = Statement(user_id=DEV_USER, source_type=SourceType.SAT_XML)
+    container.statements.add(statement)
+    log = container.change_log
+    txs = [_tx(DEV_USER, 5, statement_id=statement.id), _tx(DEV_USER, 6)]
+    container.transactions.add_many(txs)
+    inserted = log.horizon()
+    assert set(log.changed_since(DEV_USER, 0, inserted)) == {t.id for t in txs}
+
+    txs[1].description = "Café"
+    container.transactions.update(txs[1])
+    txs[1].is_transfer = True
+    container.transactions.update_flags_many([txs[1]])
+    tag = Tag(user_id=DEV_USER, name="Viaje")
+    container.tags.add(tag)
+    container.tags.replace_for_transaction(txs[1].id, [tag.id])
+    edited = log.horizon()
+    assert edited - inserted == 3
+    assert log.changed_since(DEV_USER, inserted, edited) == [txs[1].id]
+
+    container.transactions.delete_for_statement(statement.id)
+    assert log.changed_since(DEV_USER, edited, log.horizon()) == [txs[0].id]
+    assert log.changed_since(uuid4(), 0, log.horizon()) == []
+
+
+def test_the_first_sync_rebuilds_and_marks_the_next_applies_nothing(container):
+    container.transactions.add_many([_tx(DEV_USER, 5), _tx(DEV_USER, 6)])
+
+    first = container.sync_cube.execute(user_id=DEV_USER)
+
+    assert (first.rebuilt, first.applied) == (1, 0)
+    assert container.cube.sync_mark(DEV_USER) == first.horizon
+    assert _facts(container.cube, DEV_USER) == _truth(container, DEV_USER)
+    version = container.cube.data_version(DEV_USER)
+
+    again = container.sync_cube.execute(user_id=DEV_USER)
+
+    assert (again.rebuilt, again.applied) == (0, 0)
+    # Nothing to apply is nothing written: cached answers stay valid.
+    assert container.cube.data_version(DEV_USER) == version
+
+
+def test_writes_that_missed_the_cube_are_applied_and_nothing_else(container):
+    statement = Statement(user_id=DEV_USER, source_type=SourceType.SAT_XML)
+    container.statements.add(statement)
+    kept, edited = _tx(DEV_USER, 5), _tx(DEV_USER, 6)
+    dropped = _tx(DEV_USER, 7, statement_id=statement.id)
+    container.transactions.add_many([kept, edited, dropped])
+    container.sync_cube.execute(user_id=DEV_USER)
+
+    # The relational store moves on; the cube hears none of it.
+    edited.description = "Renta"
+    container.transactions.update(edited)
+    added = _tx(DEV_USER, 8, "99")
+    container.transactions.add_many([added])
+    tag = Tag(user_id=DEV_USER, name="Viaje")
+    container.tags.add(tag)
+    container.tags.replace_for_transaction(kept.id, [tag.id])
+    container.transactions.delete_for_statement(statement.id)
+    assert _facts(container.cube, DEV_USER) != _truth(container, DEV_USER)
+
+    result = container.sync_cube.execute(user_id=DEV_USER)
+
+    assert (result.rebuilt, result.applied, result.deleted) == (0, 4, 1)
+    assert _facts(container.cube, DEV_USER) == _truth(container, DEV_USER)
+    assert container.cube.spending_summary(DEV_USER).total_expense == Decimal("119.00")
+    # The tag made while the cube was not listening has its label.
+    labels = container.cube._con.execute("SELECT name FROM dim_tag").fetchall()
+    assert ("Viaje",) in labels
+
+
+def test_a_sync_over_everyone_prunes_the_log_and_a_stale_mark_rebuilds(container):
+    other = uuid4()
+    container.transactions.add_many([_tx(DEV_USER, 5), _tx(other, 5)])
+
+    result = container.sync_cube.execute()
+
+    assert (result.users, result.rebuilt) == (2, 2)
+    assert result.pruned == 1
+    assert container.change_log.first_seq() == result.horizon
+
+    # A cube file restored from before the prune: its mark predates the log.
+    container.cube.apply_changes(other, [], [], mark=0)
+    container.transactions.add_many([_tx(DEV_USER, 6)])
+
+    again = container.sync_cube.execute()
+
+    assert (again.rebuilt, again.applied) == (1, 1)
+    assert container.cube.sync_mark(other) == again.horizon
+
+
+def test_a_failed_apply_leaves_the_mark_behind_for_the_next_run(container, monkeypatch):
+    container.transactions.add_many([_tx(DEV_USER, 5)])
+    mark = container.sync_cube.execute(user_id=DEV_USER).horizon
+    container.transactions.add_many([_tx(DEV_USER, 6), _tx(DEV_USER, 7)])
+
+    def broken(transactions):
+        raise RuntimeError("cube is locked")
+
+    monkeypatch.setattr(container.cube, "_merge", broken)
+    with pytest.raises(RuntimeError):
+        container.sync_cube.execute(user_id=DEV_USER, batch_size=1)
+    monkeypatch.undo()
+
+    assert container.cube.sync_mark(DEV_USER) == mark
+    assert container.sync_cube.execute(user_id=DEV_USER).applied == 2
+    assert _facts(container.cube, DEV_USER) == _truth(container, DEV_USER)
+
+
+def test_the_admin_endpoint_syncs_the_caller(client, container):
+    container.transactions.add_many([_tx(DEV_USER, 5), _tx(uuid4(), 5)])
+
+    body = client.post("/api/admin/cube/sync").get_json()
+
+    assert (body["users"], body["rebuilt"], body["pruned"]) == (1, 1, 0)
+
+
+def test_the_command_syncs_everyone(app, container):
+    container.transactions.add_many([_tx(DEV_USER, 5), _tx(uuid4(), 5)])
+
+    out = app.test_cli_runner().invoke(sync_cube_command, [])
+
+    assert out.exit_code == 0, out.output
+    assert "2 user(s) synced to change 2: 2 rebuilt" in out.output
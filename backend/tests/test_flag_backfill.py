@@ -0,0 +1,148 @@
+"""Re-deriving stored flags: dry run, batched write-back, cube refresh, resume."""
+
+from __future__ import annotations
+
+from datetime import date
+from decimal import Decimal
+from uuid import UUID, uuid4
+
+from tomin.adapters.inbound.cli import backfill_flags_command
+from tomin.domain.entities import Transaction
+from tomin.domain.value_objects.enums import TxType
+
+
+def _stale(container, user_id, *rows):
+    """Rows stored with flags today's rule disagrees with (all False)."""
+    txs = [
+        Transaction(
+            user_id=user_id,
+            tx_date=date(2024, 5, day),
+            amount=Decimal(amount),
+            raw_description=description,
+            tx_type=tx_type,
+        )
+        for day, (description, amount, tx_type) in enumerate(rows, start=1)
+    ]
+    container.transactions.add_many(txs)
+    container.cube.upsert_transactions(txs)
+    return txs
+
+
+_ROWS = (
+    ("PAGO TC BBVA", "3000", TxType.EXPENSE),
+    ("RETIRO CAJERO 4412", "500", TxType.EXPENSE),
+    ("COMISION RETIRO", "35", TxType.EXPENSE),
+    ("OXXO CENTRO", "80", TxType.EXPENSE),
+    ("TRASPASO RECIBIDO", "1000", TxType.INCOME),
+)
+
+
+def _facts(container, user_id) -> dict:
+    rows = container.cube.fetch(
+        "SELECT description, is_transfer, is_cash_withdrawal FROM fact_transactions "
+        "WHERE user_id = ?",
+        [str(user_id)],
+    )
+    return {r[0]: (r[1], r[2]) for r in rows}
+
+
+def test_a_dry_run_reports_the_move_and_writes_nothing(app):
+    container = app.extensions["container"]
+    user = uuid4()
+    _stale(container, user, *_ROWS)
+
+    result = container.backfill_flags.execute(user_id=user, dry_run=True)
+
+    assert (result.scanned, result.changed) == (5, 3)
+    assert (result.transfers_flipped, result.withdrawals_flipped) == (2, 1)
+    # The card payment leaves spend; the income traspaso was never in it.
+    assert result.spend_delta == {"MXN": Decimal(-3000)}
+    assert result.cash_withdrawn_delta == {"MXN": Decimal(500)}
+    assert not any(t.is_transfer for t in container.transactions.iter_for_user(user))
+    assert _facts(container, user)["PAGO TC BBVA"] == (False, False)
+
+
+def test_changed_rows_are_written_in_batches_and_refreshed_in_the_cube(app, monkeypatch):
+    container = app.extensions["container"]
+    user = uuid4()
+    _stale(container, user, *_ROWS)
+    events = []
+    update = container.transactions.update_flags_many
+    read = container.transactions.list_for_user
+    monkeypatch.setattr(
+        container.transactions,
+        "update_flags_many",
+        lambda txs: events.append([t.raw_description for t in txs]) or update(txs),
+    )
+    monkeypatch.setattr(
+        container.transactions,
+        "list_for_user",
+        lambda *args, **kwargs: events.append("page") or read(*args, **kwargs),
+    )
+
+    result = container.backfill_flags.execute(user_id=user, batch_size=2)
+
+    assert result.changed == 3
+    # Pages newest first; a batch is written as soon as it fills, mid-history.
+    assert events == [
+        "page",
+        "page",
+        ["TRASPASO RECIBIDO", "RETIRO CAJERO 4412"],
+        "page",
+        ["PAGO TC BBVA"],
+    ]
+    assert _facts(container, user) == {
+        "PAGO TC BBVA": (True, False),
+        "RETIRO CAJERO 4412": (False, True),
+        "COMISION RETIRO": (False, False),
+        "OXXO CENTRO": (False, False),
+        "TRASPASO RECIBIDO": (True, False),
+    }
+    assert container.backfill_flags.execute(user_id=user).changed == 0
+
+
+def test_a_fleet_run_resumes_after_the_last_finished_user(app):
+    container = app.extensions["container"]
+    users = sorted([uuid4(), uuid4(), uuid4()])
+    for user in users:
+        _stale(container, user, ("PAGO TC", "10", TxType.EXPENSE))
+    finished = []
+
+    result = container.backfill_flags.execute(after_user=users[0], on_user=finished.append)
+
+    assert finished == users[1:]
+    assert (result.users, result.changed, result.last_user) == (2, 2, users[2])
+    first = next(container.transactions.iter_for_user(users[0]))
+    assert first.is_transfer is False
+
+
+def test_the_command_keeps_a_checkpoint_until_it_finishes(app, tmp_path):
+    container = app.extensions["container"]
+    users = sorted([uuid4(), uuid4()])
+    for user in users:
+        _stale(container, user, ("RETIRO ATM", "200", TxType.EXPENSE))
+    checkpoint = tmp_path / "flags.checkpoint"
+    checkpoint.write_text(f"{users[0]}\n")
+
+    out = app.test_cli_runner().invoke(backfill_flags_command, ["--checkpoint", str(checkpoint)])
+
+    assert out.exit_code == 0, out.output
+    assert f"Resuming after user {users[0]}" in out.output
+    assert "1 user(s), 1 row(s) scanned, 1 changed" in out.output
+    assert "cash withdrawn changed: +200.00 MXN" in out.output
+    assert not checkpoint.exists()
+    assert [next(container.transactions.iter_for_user(u)).is_cash_withdrawal for u in users] == [
+        False,
+        True,
+    ]
+
+
+def test_the_admin_endpoint_dry_runs_for_the_caller(client, app):
+    container = app.extensions["container"]
+    _stale(container, UUID("00000000-0000-0000-0000-000000000001"), *_ROWS)
+
+    body = client.post("/api/admin/transactions/backfill-flags?dry_run=true").get_json()
+
+    assert body["dry_run"] is True
+    assert (body["scanned"], body["changed"]) == (5, 3)
+    assert body["spend_delta"] == {"MXN": "-3000.00"}
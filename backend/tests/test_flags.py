@@ -19,7 +19,8 @@ from sqlalchemy import inspect, text
 from tomin.adapters.outbound.persistence.db import Database
 from tomin.adapters.outbound.persistence.migrator import upgrade_to_head
 from tomin.domain.entities import Transaction
-from tomin.domain.services.flags import detect_flags
+from tomin.domain.services.categorization import fold
+from tomin.domain.services.flags import TransactionFlags, detect_flags, detect_flags_many
 from tomin.domain.value_objects.enums import TxType
 
 DEV_USER = UUID("00000000-0000-0000-0000-000000000001")
@@ -110,6 +111,32 @@ def test_a_withdrawal_is_not_also_a_transfer():
     assert (flags.is_transfer, flags.is_cash_withdrawal) == (False, True)
 
 
+def test_a_batch_agrees_with_one_description_at_a_time():
+    descriptions = [
+        "PAGO TC BBVA",
+        None,
+        "COMISIÓN RETIRO CAJERO",
+        "",
+        "RETIRO ATM",
+        "OXXO SUC 4412",
+        "TRASPASO   y RETIRO",
+    ]
+
+    assert detect_flags_many(descriptions) == [detect_flags(d) for d in descriptions]
+    assert detect_flags_many([fold(d or "") for d in descriptions], folded=True) == [
+        detect_flags(d) for d in descriptions
+    ]
+    assert detect_flags_many([]) == []
+
+
+def test_a_match_never_spans_two_descriptions_in_a_batch():
+    """One row ending in "PAGO" and the next opening with "TC" is not a card payment."""
+    flags = detect_flags_many(["ABONO PAGO", "TC 1234", "COMISION", "RETIRO"])
+
+    # Nor does the fee on the third row cancel the withdrawal on the fourth.
+    assert flags == [TransactionFlags()] * 3 + [TransactionFlags(is_cash_withdrawal=True)]
+
+
 # --- flags through the metric layer --------------------------------------
 @pytest.fixture
 def seeded(app):
@@ -1,5 +1,7 @@
 from decimal import Decimal
 
+import pytest
+
 from tomin.domain.services.forecasting import ForecastingService, SimulationInput
 
 
@@ -26,3 +28,83 @@ def test_optimized_beats_baseline_with_higher_savings():
     )
     points = ForecastingService().project(sim)
     assert points[-1].optimized_net_worth > points[-1].baseline_net_worth
+
+
+def test_projection_is_the_compounded_decimal_path_to_the_cent():
+    sim = SimulationInput(
+        starting_net_worth=Decimal("1000.00"),
+        monthly_income=Decimal("30000"),
+        monthly_expenses=Decimal("25000.55"),
+        annual_return_rate=0.07,
+        months=3,
+    )
+    assert [p.baseline_net_worth for p in ForecastingService().project(sim)] == [
+        Decimal("6005.28"),
+        Decimal("11039.76"),
+        Decimal("16103.61"),
+    ]
+
+
+def test_scenarios_without_volatility_collapse_onto_the_baseline():
+    pytest.importorskip("numpy")
+    sim = SimulationInput(
+        starting_net_worth=Decimal("1000"),
+        monthly_income=Decimal("5000"),
+        monthly_expenses=Decimal("3000"),
+        annual_return_rate=0.05,
+        months=24,
+    )
+    service = ForecastingService()
+
+    bands = service.scenarios(sim, paths=50, seed=1)
+
+    for band, point in zip(bands, service.project(sim), strict=True):
+        for value in band.percentiles.values():
+            assert abs(value - point.baseline_net_worth) <= Decimal("0.05")
+
+
+def test_scenarios_spread_with_volatility_and_repeat_under_a_seed():
+    pytest.importorskip("numpy")
+    sim = SimulationInput(
+        starting_net_worth=Decimal(0),
+        monthly_income=Decimal("20000"),
+        monthly_expenses=Decimal("15000"),
+        income_volatility=Decimal("2000"),
+        expense_volatility=Decimal("3000"),
+        months=12,
+    )
+    service = ForecastingService()
+
+    bands = service.scenarios(sim, paths=4000, seed=7)
+
+    assert bands == service.scenarios(sim, paths=4000, seed=7)
+    assert [b.month_offset for b in bands] == list(range(1, 13))
+    widths = [b.percentiles[90] - b.percentiles[10] for b in bands]
+    assert all(b.percentiles[10] < b.percentiles[50] < b.percentiles[90] for b in bands)
+    assert widths[-1] > widths[0] > 0
+    # The median path follows the mean cash flow: 5000 a month.
+    assert abs(bands[-1].percentiles[50] - Decimal(60000)) < Decimal(2000)
+
+
+def test_forecast_bands_endpoint(client):
+    pytest.importorskip("numpy")
+    body = client.get("/api/forecast/bands?months=6&paths=100").get_json()
+
+    assert body["paths"] == 100
+    assert [p["month_offset"] for p in body["points"]] == [1, 2, 3, 4, 5, 6]
+    assert set(body["points"][0]) == {"month_offset", "p10", "p50", "p90"}
+
+
+def test_forecast_bands_horizon_is_bounded(client, monkeypatch):
+    pytest.importorskip("numpy")
+    from tomin.adapters.inbound.http.blueprints import forecast
+
+    monkeypatch.setattr(forecast, "MAX_MONTHS", 24)
+    capped = client.get("/api/forecast/bands?months=100000&paths=10").get_json()
+
+    assert [p["month_offset"] for p in capped["points"]] == list(range(1, 25))
+    for months in (0, -3):
+        resp = client.get(f"/api/forecast/bands?months={months}&paths=10")
+        assert resp.status_code == 400
+        assert resp.get_json()["detail"] == "months must be at least 1"
+
@@ -0,0 +1,223 @@
+"""Uploads answer 202 at once and are processed on the in-process job queue."""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import threading
+import time
+from uuid import uuid4
+
+import pytest
+
+from tomin.adapters.inbound.cli import sync_cube_command
+from tomin.adapters.outbound.extraction import SatXmlExtractor
+from tomin.adapters.outbound.jobs import InProcessJobQueue
+from tomin.application.dtos.jobs import JobState
+from tomin.application.use_cases import IngestionJobNotFoundError
+from tomin.config.settings import Settings
+from tomin.domain.entities import Statement
+from tomin.domain.value_objects.enums import SourceType, StatementStatus
+from tomin.main import create_app
+
+
+@pytest.fixture
+def app(tmp_path):
+    settings = Settings(
+        database_url=f"sqlite:///{tmp_path / 'test.db'}",
+        cube_path=":memory:",
+        auth_disabled=True,
+        run_migrations=False,
+        ingest_workers=1,
+        ingest_ocr_workers=1,
+    )
+    application = create_app(settings)
+    container = application.extensions["container"]
+    container.bootstrap()
+    yield application
+    container.job_queue.shutdown()
+
+
+@pytest.fixture
+def gate(monkeypatch):
+    """Holds every XML extraction until the test opens it."""
+    opened = threading.Event()
+    extract = SatXmlExtractor.extract
+
+    def held(self, *args):
+        assert opened.wait(5), "test never opened the gate"
+        return extract(self, *args)
+
+    monkeypatch.setattr(SatXmlExtractor, "extract", held)
+    return opened
+
+
+def _upload(client, data: bytes):
+    return client.post(
+        "/api/statements",
+        data={"file": (io.BytesIO(data), "factura.xml")},
+        content_type="multipart/form-data",
+    )
+
+
+def _settled(client, location: str) -> dict:
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        body = client.get(location).get_json()
+        if body["status"] != "processing":
+            return body
+        time.sleep(0.01)
+    raise AssertionError("upload never settled")
+
+
+def test_upload_is_accepted_before_it_is_processed(client, gate, sample_cfdi_bytes):
+    resp = _upload(client, sample_cfdi_bytes.getvalue())
+
+    assert resp.status_code == 202
+    body = resp.get_json()
+    assert body["status"] == "processing"
+    location = resp.headers["Location"]
+    assert location == f"/api/statements/jobs/{body['job_id']}"
+    assert client.get(location).get_json()["status"] == "processing"
+    listed = client.get("/api/statements").get_json()["items"]
+    assert [(s["id"], s["status"]) for s in listed] == [(body["statement_id"], "processing")]
+    # Still in flight, yet already a duplicate: the hash is taken on accept.
+    assert _upload(client, sample_cfdi_bytes.getvalue()).status_code == 409
+
+    gate.set()
+    done = _settled(client, location)
+
+    assert done["status"] == "processed"
+    assert done["template"] == "sat_cfdi"
+    assert done["transactions_created"] == 1
+    assert client.get("/api/statements").get_json()["items"][0]["status"] == "processed"
+    assert len(client.get("/api/transactions").get_json()["items"]) == 1
+
+
+def test_a_failed_upload_reports_why_and_frees_its_hash(client, monkeypatch):
+    def broken(self, *args):
+        raise RuntimeError("unreadable")
+
+    monkeypatch.setattr(SatXmlExtractor, "extract", broken)
+    resp = _upload(client, b"<xml/>")
+
+    done = _settled(client, resp.headers["Location"])
+
+    assert done["status"] == "failed"
+    assert done["error"] == "unreadable"
+    assert client.get("/api/statements").get_json()["items"][0]["status"] == "failed"
+    assert _upload(client, b"<xml/>").status_code == 202
+
+
+def _orphan(container, data: bytes) -> Statement:
+    """What a server leaves behind when it dies mid-job: accepted, never finished."""
+    orphan = Statement(
+        user_id=uuid4(),
+        source_type=SourceType.SAT_XML,
+        status=StatementStatus.PROCESSING,
+        file_hash=hashlib.sha256(data).hexdigest(),
+    )
+    container.statements.add(orphan)
+    return orphan
+
+
+def test_an_upload_cut_off_by_a_restart_is_failed_and_its_hash_freed(app, sample_cfdi_bytes):
+    container = app.extensions["container"]
+    data = sample_cfdi_bytes.getvalue()
+    orphan = _orphan(container, data)
+
+    # The server's first request is its startup.
+    app.test_client().get("/api/statements")
+
+    restarted = container.statements.get(orphan.id)
+    assert restarted.status is StatementStatus.FAILED
+    assert restarted.file_hash is None
+    assert not container.statements.exists_hash(orphan.user_id, hashlib.sha256(data).hexdigest())
+
+
+def test_an_operator_command_leaves_a_live_servers_uploads_alone(app, sample_cfdi_bytes):
+    container = app.extensions["container"]
+    orphan = _orphan(container, sample_cfdi_bytes.getvalue())
+
+    # A command may run beside a live server; this upload may be its.
+    out = app.test_cli_runner().invoke(sync_cube_command, [])
+
+    assert out.exit_code == 0, out.output
+    untouched = container.statements.get(orphan.id)
+    assert untouched.status is StatementStatus.PROCESSING
+    assert untouched.file_hash == orphan.file_hash
+
+
+def test_shutdown_finishes_the_jobs_already_queued(app, client, gate, sample_cfdi_bytes):
+    location = _upload(client, sample_cfdi_bytes.getvalue()).headers["Location"]
+    threading.Timer(0.05, gate.set).start()
+
+    app.extensions["container"].shutdown()
+
+    assert client.get(location).get_json()["status"] == "processed"
+
+
+def test_unsupported_files_are_still_refused_up_front(client):
+    resp = client.post(
+        "/api/statements",
+        data={"file": (io.BytesIO(b"hola"), "notas.txt")},
+        content_type="multipart/form-data",
+    )
+    assert resp.status_code == 415
+
+
+def test_jobs_are_private_to_their_owner(app, gate, sample_cfdi_bytes):
+    container = app.extensions["container"]
+    status = container.ingest_statement.submit(
+        user_id=uuid4(), data=sample_cfdi_bytes.getvalue(), filename="factura.xml"
+    )
+    gate.set()
+
+    with pytest.raises(IngestionJobNotFoundError):
+        container.ingest_statement.status(user_id=uuid4(), job_id=status.job_id)
+    assert app.test_client().get(f"/api/statements/jobs/{status.job_id}").status_code == 404
+
+
+def test_each_lane_is_bounded_on_its_own():
+    queue = InProcessJobQueue({"ocr": 1, "default": 2})
+    release = threading.Event()
+    running = {"ocr": 0, "default": 0}
+    peak = {"ocr": 0, "default": 0}
+    lock = threading.Lock()
+
+    def work(lane):
+        with lock:
+            running[lane] += 1
+            peak[lane] = max(peak[lane], running[lane])
+        release.wait(5)
+        with lock:
+            running[lane] -= 1
+        return lane
+
+    owner = uuid4()
+    slow = [queue.submit(owner_id=owner, lane="ocr", work=lambda: work("ocr")) for _ in range(3)]
+    quick = [
+        queue.submit(owner_id=owner, lane="default", work=lambda: work("default"))
+        for _ in range(2)
+    ]
+    deadline = time.monotonic() + 5
+    while running["default"] < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    # Both XML-lane jobs run while the OCR lane is busy with one of three.
+    assert running == {"ocr": 1, "default": 2}
+    release.set()
+    queue.shutdown()
+
+    assert peak == {"ocr": 1, "default": 2}
+    assert {queue.get(job.id).state for job in slow + quick} == {JobState.SUCCEEDED}
+    assert queue.get(slow[0].id).result == "ocr"
+
+
+def test_a_lane_without_workers_runs_inline():
+    queue = InProcessJobQueue({"default": 0})
+
+    job = queue.submit(owner_id=uuid4(), lane="default", work=lambda: 1 / 0)
+
+    assert job.state is JobState.FAILED
+    assert job.error == "division by zero"
@@ -0,0 +1,194 @@
+"""The metric result cache: a hit until the cube says the user's data moved."""
+
+from __future__ import annotations
+
+from datetime import date
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+
+from tomin.adapters.outbound.cube import DuckDbCube, DuckDbMetricEngine
+from tomin.adapters.outbound.metrics import CachedMetricEngine
+from tomin.application.dtos.metrics import MetricQuery
+from tomin.domain.entities import Category, Tag, Transaction
+from tomin.domain.metrics.catalog import METRIC_CATALOG
+from tomin.domain.metrics.spec import normalize
+from tomin.domain.value_objects.enums import TxType
+
+SPEND = METRIC_CATALOG["spend_by_category"]
+
+
+def _tx(user, amount="100", **kwargs):
+    return Transaction(
+        user_id=user,
+        tx_date=date(2024, 1, 5),
+        amount=Decimal(amount),
+        raw_description="OXXO",
+        tx_type=TxType.EXPENSE,
+        **kwargs,
+    )
+
+
+def _query(key="k", **fields):
+    return normalize(SPEND, MetricQuery(key=key, metric=SPEND.id, **fields))
+
+
+class _Counting:
+    def __init__(self, engine):
+        self._engine = engine
+        self.calls = 0
+
+    def execute_many(self, user_id, requests):
+        self.calls += len(requests)
+        return self._engine.execute_many(user_id, requests)
+
+
+@pytest.fixture
+def cube():
+    return DuckDbCube(":memory:")
+
+
+@pytest.fixture
+def inner(cube):
+    return _Counting(DuckDbMetricEngine(cube))
+
+
+@pytest.fixture
+def cache(cube, inner):
+    return CachedMetricEngine(inner, cube)
+
+
+def test_a_repeated_query_is_served_from_the_cache(cube, inner, cache):
+    user = uuid4()
+    cube.upsert_transactions([_tx(user)])
+
+    first = cache.execute(user, SPEND, _query("widget-a"))
+    # The widget key names the slot on the page, not the question.
+    again = cache.execute(user, SPEND, _query("widget-b"))
+
+    assert again is first
+    assert inner.calls == 1
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.entries) == (1, 1, 1)
+
+
+def test_every_writer_retires_the_answers_it_changes(cube, inner, cache):
+    user, other = uuid4(), uuid4()
+    tx = _tx(user)
+    cube.upsert_transactions([tx, _tx(other)])
+    cache.execute(user, SPEND, _query())
+
+    cube.upsert_transactions([_tx(other, "5")])  # someone else's data
+    cache.execute(user, SPEND, _query())
+    assert inner.calls == 1
+
+    cube.upsert_transactions([_tx(user, "50")])
+    assert cache.execute(user, SPEND, _query()).value == "150.00"
+
+    cube.delete_transactions([tx.id])
+    assert cache.execute(user, SPEND, _query()).value == "50.00"
+
+    food = Category(name="Comida")
+    cube.sync_categories([food])  # a label change reaches every user
+    cache.execute(user, SPEND, _query())
+
+    cube.rebuild_for_user(user, iter([]))
+    assert cache.execute(user, SPEND, _query()).rows == []
+    assert inner.calls == 5
+
+
+def test_labels_that_did_not_change_retire_nothing(cube, inner, cache):
+    user = uuid4()
+    food = Category(name="Comida")
+    trip = Tag(user_id=user, name="Viaje")
+    cube.sync_categories([food])
+    cube.sync_tags([trip])
+    cube.upsert_transactions([_tx(user)])
+    cache.execute(user, SPEND, _query())
+
+    # What a rebuild or a sync does per user: the labels, re-asserted.
+    cube.sync_categories([food])
+    cube.sync_tags([trip])
+    cube.sync_tags([])
+    cache.execute(user, SPEND, _query())
+    assert inner.calls == 1
+
+    trip.name = "Vacaciones"
+    cube.sync_tags([trip])
+    cache.execute(user, SPEND, _query())
+    assert inner.calls == 2
+    assert cube.fetch("SELECT name FROM dim_tag", []) == [("Vacaciones",)]
+
+
+def test_a_failed_write_keeps_the_version(cube, inner, cache):
+    user = uuid4()
+    cube.upsert_transactions([_tx(user)])
+    cache.execute(user, SPEND, _query())
+
+    def broken():
+        yield _tx(user)
+        raise RuntimeError("source went away")
+
+    with pytest.raises(RuntimeError):
+        cube.rebuild_for_user(user, broken())
+
+    cache.execute(user, SPEND, _query())
+    assert inner.calls == 1
+
+
+def test_least_recently_used_entries_go_first_past_the_cap(cube, inner):
+    a, b, c = uuid4(), uuid4(), uuid4()
+    cube.upsert_transactions([_tx(a), _tx(b), _tx(c)])
+    probe = CachedMetricEngine(inner, cube)
+    probe.execute(a, SPEND, _query())
+    one_entry = probe.stats().bytes
+
+    cache = CachedMetricEngine(inner, cube, max_bytes=2 * one_entry + one_entry // 2)
+    cache.execute(a, SPEND, _query())
+    cache.execute(b, SPEND, _query())
+    cache.execute(a, SPEND, _query())  # a is now the most recent
+    cache.execute(c, SPEND, _query())  # evicts b
+
+    calls = inner.calls
+    cache.execute(a, SPEND, _query())
+    assert inner.calls == calls
+    cache.execute(b, SPEND, _query())
+    assert inner.calls == calls + 1
+    stats = cache.stats()
+    assert stats.evictions == 2  # b, then c to make room for b again
+    assert stats.bytes <= 2 * one_entry + one_entry // 2
+
+
+def test_cache_counters_are_exposed(client):
+    body = {"queries": [{"key": "k", "metric": "spend_by_category"}]}
+    client.post("/api/metrics/query", json=body)
+    client.post("/api/metrics/query", json=body)
+
+    stats = client.get("/api/admin/metrics/cache").get_json()
+
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["entries"] == 1
+
+
+def test_the_cube_says_which_months_a_run_of_writes_touched(cube):
+    user = uuid4()
+    start = cube.data_version(user)
+    moved, march = _tx(user), _tx(user)
+    march.tx_date = date(2024, 3, 1)
+    cube.upsert_transactions([moved, march])
+    after_insert = cube.data_version(user)
+    moved.tx_date = date(2024, 2, 9)
+    cube.upsert_transactions([moved])
+    cube.sync_tags([])
+    now = cube.data_version(user)
+
+    assert cube.months_changed(user, start, after_insert) == {"2024-01", "2024-03"}
+    # An edit counts the month a row leaves as well as the one it lands in.
+    assert cube.months_changed(user, after_insert, now) == {"2024-01", "2024-02"}
+    assert cube.months_changed(user, start, now) == {"2024-01", "2024-02", "2024-03"}
+    assert cube.months_changed(user, now, now) == frozenset()
+
+    cube.rebuild_for_user(user, iter([moved]))
+    assert cube.months_changed(user, now, cube.data_version(user)) is None
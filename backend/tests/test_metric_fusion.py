@@ -0,0 +1,152 @@
+"""Fused metric batches: one scan per compatible group, same answers as alone."""
+
+from __future__ import annotations
+
+from datetime import date
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+
+from tomin.adapters.outbound.cube import DuckDbCube, DuckDbMetricEngine
+from tomin.application.dtos.metrics import MetricError, MetricQuery, MetricResult, Period
+from tomin.application.use_cases import RunMetricQueriesUseCase
+from tomin.domain.entities import Category, Transaction
+from tomin.domain.metrics.catalog import METRIC_CATALOG
+from tomin.domain.metrics.spec import normalize
+from tomin.domain.value_objects.enums import TxType
+
+COMIDA = Category(name="Comida")
+RENTA = Category(name="Renta")
+_MID_MONTH = Period(date(2024, 1, 10), date(2024, 2, 20))
+
+
+def _tx(user, when, amount, tx_type=TxType.EXPENSE, **kwargs):
+    return Transaction(
+        user_id=user,
+        tx_date=when,
+        amount=Decimal(amount),
+        raw_description="MOVIMIENTO",
+        tx_type=tx_type,
+        **kwargs,
+    )
+
+
+@pytest.fixture
+def cube():
+    cube = DuckDbCube(":memory:")
+    cube.sync_categories([COMIDA, RENTA])
+    return cube
+
+
+@pytest.fixture
+def user(cube):
+    user = uuid4()
+    viaje = uuid4()
+    cube.upsert_transactions([
+        _tx(user, date(2024, 1, 3), "120", category_id=COMIDA.id, tag_ids=[viaje]),
+        _tx(user, date(2024, 1, 15), "8000", category_id=RENTA.id),
+        _tx(user, date(2024, 1, 31), "30000", TxType.INCOME),
+        _tx(user, date(2024, 2, 2), "5000", is_transfer=True),
+        _tx(user, date(2024, 2, 9), "1500", is_cash_withdrawal=True),
+        _tx(user, date(2024, 2, 14), "640", category_id=COMIDA.id, excluded_from_stats=True),
+        _tx(user, date(2024, 2, 20), "55", currency="USD", category_id=COMIDA.id),
+        _tx(user, date(2024, 3, 1), "300", category_id=COMIDA.id, tag_ids=[viaje]),
+    ])
+    return user
+
+
+def _requests(*queries: MetricQuery):
+    return [(METRIC_CATALOG[q.metric], normalize(METRIC_CATALOG[q.metric], q)) for q in queries]
+
+
+def _dashboard(period: Period | None = None) -> list[MetricQuery]:
+    period = period or Period()
+    return [
+        MetricQuery(key="categories", metric="spend_by_category", period=period),
+        MetricQuery(key="flow", metric="monthly_cash_flow", period=period),
+        MetricQuery(key="daily", metric="accumulated_spend", period=period, grain="day"),
+        MetricQuery(key="running", metric="accumulated_spend", period=period),
+        MetricQuery(key="cash", metric="cash_withdrawn", period=period),
+        MetricQuery(
+            key="food",
+            metric="spend_by_category",
+            period=period,
+            filters={"category": [str(COMIDA.id)]},
+        ),
+        MetricQuery(key="tags", metric="tag_totals", period=period),
+        MetricQuery(key="lifetime", metric="lifetime_flow", period=period),
+        MetricQuery(key="usd", metric="spend_by_category", filters={"currency": "USD"}),
+    ]
+
+
+@pytest.mark.parametrize("period", [Period(), _MID_MONTH, Period(date(2030, 1, 1), None)])
+def test_a_fused_batch_answers_what_each_query_would_alone(cube, user, period):
+    engine = DuckDbMetricEngine(cube)
+    requests = _requests(*_dashboard(period))
+
+    fused = engine.execute_many(user, requests)
+
+    assert fused == [engine.execute(user, spec, query) for spec, query in requests]
+
+
+def test_compatible_queries_share_one_scan(cube, user, monkeypatch):
+    calls = []
+    fetch = cube.fetch
+    monkeypatch.setattr(cube, "fetch", lambda sql, params: calls.append(sql) or fetch(sql, params))
+
+    DuckDbMetricEngine(cube).execute_many(
+        user, _requests(*_dashboard(_MID_MONTH)[:6])
+    )
+
+    assert len(calls) == 1
+    assert "GROUPING SETS" in calls[0]
+
+
+def test_an_empty_grouped_query_has_no_rows_and_a_scalar_has_its_zero(cube, user):
+    nothing = Period(date(2030, 1, 1), date(2030, 1, 31))
+    categories, cash = DuckDbMetricEngine(cube).execute_many(
+        user,
+        _requests(
+            MetricQuery(key="a", metric="spend_by_category", period=nothing),
+            MetricQuery(key="b", metric="cash_withdrawn", period=nothing, dimensions=()),
+        ),
+    )
+    assert categories.rows == [] and categories.value is None
+    assert cash == DuckDbMetricEngine(cube).execute(user, *_requests(
+        MetricQuery(key="b", metric="cash_withdrawn", period=nothing, dimensions=())
+    )[0])
+
+
+class _FailingOn:
+    """Delegates to a real engine but breaks one metric, alone or fused."""
+
+    def __init__(self, engine, metric):
+        self._engine = engine
+        self._metric = metric
+
+    def execute(self, user_id, spec, query):
+        if spec.id == self._metric:
+            raise RuntimeError("boom")
+        return self._engine.execute(user_id, spec, query)
+
+    def execute_many(self, user_id, requests):
+        if any(spec.id == self._metric for spec, _ in requests):
+            raise RuntimeError("boom")
+        return self._engine.execute_many(user_id, requests)
+
+
+def test_a_failing_query_in_a_fused_batch_only_errors_its_own_key(cube, user):
+    engine = _FailingOn(DuckDbMetricEngine(cube), "monthly_cash_flow")
+    use_case = RunMetricQueriesUseCase(engine=engine)
+
+    batch = use_case.execute(user_id=user, queries=_dashboard()[:3] + [
+        MetricQuery(key="bad", metric="spend_by_category", filters={"nope": 1}),
+    ])
+
+    assert isinstance(batch.results["flow"], MetricError)
+    assert batch.results["flow"].code == "metric_failed"
+    assert isinstance(batch.results["categories"], MetricResult)
+    assert isinstance(batch.results["daily"], MetricResult)
+    assert isinstance(batch.results["bad"], MetricError)
+    assert list(batch.results) == ["categories", "flow", "daily", "bad"]
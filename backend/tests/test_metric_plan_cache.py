@@ -0,0 +1,90 @@
+"""The engine's plan cache: compiled once per query shape, values always bound."""
+
+from __future__ import annotations
+
+from datetime import date
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+
+from tomin.adapters.outbound.cube import DuckDbCube, DuckDbMetricEngine
+from tomin.application.dtos.metrics import MetricQuery, Period
+from tomin.domain.entities import Category, Transaction
+from tomin.domain.metrics.catalog import METRIC_CATALOG
+from tomin.domain.metrics.spec import normalize
+from tomin.domain.value_objects.enums import TxType
+
+COMIDA = Category(name="Comida")
+RENTA = Category(name="Renta")
+
+
+@pytest.fixture
+def cube():
+    cube = DuckDbCube(":memory:")
+    cube.sync_categories([COMIDA, RENTA])
+    return cube
+
+
+def _spend(user, when, amount, category):
+    return Transaction(
+        user_id=user,
+        tx_date=when,
+        amount=Decimal(amount),
+        raw_description="MOVIMIENTO",
+        tx_type=TxType.EXPENSE,
+        category_id=category.id,
+    )
+
+
+def _run(engine, user, metric, **fields):
+    spec = METRIC_CATALOG[metric]
+    return engine.execute(user, spec, normalize(spec, MetricQuery(key="k", metric=metric, **fields)))
+
+
+def test_one_shape_compiles_once_and_binds_each_queries_values(cube, monkeypatch):
+    alice, bob = uuid4(), uuid4()
+    cube.upsert_transactions([
+        _spend(alice, date(2024, 1, 5), "100", COMIDA),
+        _spend(alice, date(2024, 2, 5), "7", COMIDA),
+        _spend(bob, date(2024, 1, 9), "300", RENTA),
+    ])
+    engine = DuckDbMetricEngine(cube)
+    compiles = []
+    compile_ = engine._compile
+    monkeypatch.setattr(engine, "_compile", lambda item: compiles.append(1) or compile_(item))
+
+    january = Period(date(2024, 1, 1), date(2024, 1, 31))
+    february = Period(date(2024, 2, 1), date(2024, 2, 29))
+    assert _run(engine, alice, "spend_by_category", period=january).value == "100.00"
+    assert _run(engine, alice, "spend_by_category", period=february).value == "7.00"
+    assert _run(engine, bob, "spend_by_category", period=january).value == "300.00"
+    assert len(compiles) == 1
+
+
+@pytest.mark.parametrize(
+    "first, second",
+    [
+        # An IN list's length is part of the SQL text.
+        ({"filters": {"category": [str(COMIDA.id)]}},
+         {"filters": {"category": [str(COMIDA.id), str(RENTA.id)]}}),
+        # A mid-month period cannot be read from the monthly rollup.
+        ({"period": Period(date(2024, 1, 1), date(2024, 1, 31))},
+         {"period": Period(date(2024, 1, 2), date(2024, 1, 31))}),
+        ({"period": Period(date(2024, 1, 1), None)},
+         {"period": Period(None, date(2024, 1, 31))}),
+    ],
+)
+def test_what_changes_the_sql_changes_the_shape(cube, first, second):
+    user = uuid4()
+    cube.upsert_transactions([
+        _spend(user, date(2024, 1, 1), "100", COMIDA),
+        _spend(user, date(2024, 1, 9), "300", RENTA),
+    ])
+    cached = DuckDbMetricEngine(cube)
+    _run(cached, user, "spend_by_category", **first)
+
+    assert (
+        _run(cached, user, "spend_by_category", **second)
+        == _run(DuckDbMetricEngine(cube), user, "spend_by_category", **second)
+    )
@@ -50,3 +50,44 @@ def test_stamp_then_upgrade_is_a_noop_for_legacy_databases(tmp_path):
     upgrade_to_head(db)  # must not try to re-create existing tables
 
     assert "transactions" in _tables_and_columns(db.engine)
+
+
+def test_transactions_keyset_index_is_migrated(tmp_path):
+    db = Database(f"sqlite:///{tmp_path / 'm.db'}")
+    upgrade_to_head(db)
+
+    indexes = {i["name"]: i["column_names"] for i in inspect(db.engine).get_indexes("transactions")}
+
+    assert indexes["ix_transactions_user_date_id"] == ["user_id", "tx_date", "id"]
+
+
+def test_the_change_log_and_its_triggers_are_migrated(tmp_path):
+    db = Database(f"sqlite:///{tmp_path / 'm.db'}")
+    upgrade_to_head(db)
+
+    with db.engine.begin() as conn:
+        triggers = (
+            conn.exec_driver_sql(
+                "SELECT name FROM sqlite_master WHERE type = 'trigger' "
+                "AND name LIKE 'transaction_changes%' ORDER BY name"
+            )
+            .scalars()
+            .all()
+        )
+        conn.exec_driver_sql(
+            "INSERT INTO transactions (id, user_id, tx_date, amount, currency, tx_type, status) "
+            "VALUES ('t1', 'u1', '2024-01-05', 10, 'MXN', 'expense', 'completed')"
+        )
+        conn.exec_driver_sql("DELETE FROM transactions WHERE id = 't1'")
+        logged = conn.exec_driver_sql(
+            "SELECT seq, user_id, transaction_id FROM transaction_changes ORDER BY seq"
+        ).all()
+
+    assert triggers == [
+        "transaction_changes_ad",
+        "transaction_changes_ai",
+        "transaction_changes_au",
+        "transaction_changes_tag_ad",
+        "transaction_changes_tag_ai",
+    ]
+    assert logged == [(1, "u1", "t1"), (2, "u1", "t1")]
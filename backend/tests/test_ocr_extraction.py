@@ -0,0 +1,74 @@
+"""OcrPdfExtractor: one page rendered at a time, OCR'd in parallel, kept in order.
+
+pdf2image and Tesseract are optional and not needed here: the page count and
+the per-page OCR are replaced with fakes, so what is under test is the
+scheduling around them.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+
+import pytest
+
+from tomin.adapters.outbound.extraction import ocr
+from tomin.adapters.outbound.extraction.ocr import OcrPdfExtractor
+
+
+def _slow_page(path: str, page: int) -> str:
+    """Later pages finish first, so order can only come from the extractor."""
+    time.sleep(0.05 * (4 - page % 4))
+    with open(path, "rb") as fh:
+        assert fh.read() == b"%PDF-fake"
+    return f"linea {page}\n\n  \npid {os.getpid()}\n"
+
+
+@pytest.fixture(autouse=True)
+def _no_poppler(monkeypatch):
+    monkeypatch.setattr(ocr, "_require_ocr", lambda: None)
+    monkeypatch.setattr(ocr, "_page_count", lambda path: 6)
+
+
+def _lines(doc):
+    return [ln for ln in doc.lines if ln.startswith("linea")]
+
+
+def test_pages_are_read_one_at_a_time_in_order_inline():
+    extractor = OcrPdfExtractor(processes=0)
+    asked = []
+    extractor._read_page = lambda path, page: asked.append(page) or f"linea {page}\n"
+
+    doc = extractor.extract(b"%PDF-fake", "scan.pdf", "application/pdf")
+
+    assert asked == [1, 2, 3, 4, 5, 6]
+    assert doc.lines == [f"linea {p}" for p in range(1, 7)]
+    assert doc.text == "\n".join(doc.lines)
+
+
+def test_pages_fan_out_across_processes_and_come_back_in_order():
+    extractor = OcrPdfExtractor(processes=2)
+    extractor._read_page = _slow_page
+    try:
+        doc = extractor.extract(b"%PDF-fake", "scan.pdf", None)
+    finally:
+        extractor.close()
+
+    assert _lines(doc) == [f"linea {p}" for p in range(1, 7)]
+    workers = {ln for ln in doc.lines if ln.startswith("pid")}
+    assert f"pid {os.getpid()}" not in workers
+    assert "" not in doc.lines
+
+
+def test_the_temporary_copy_is_removed_even_on_failure(monkeypatch, tmp_path):
+    monkeypatch.setattr(ocr.tempfile, "tempdir", str(tmp_path))
+    extractor = OcrPdfExtractor(processes=0)
+
+    def broken(path, page):
+        raise RuntimeError("tesseract crashed")
+
+    extractor._read_page = broken
+
+    with pytest.raises(RuntimeError):
+        extractor.extract(b"%PDF-fake", "scan.pdf", None)
+    assert list(tmp_path.iterdir()) == []
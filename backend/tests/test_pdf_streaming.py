@@ -0,0 +1,116 @@
+"""PdfTextExtractor streams pages into TextStatementParser instead of one big string."""
+
+from __future__ import annotations
+
+from datetime import date
+
+import pytest
+from pdfplumber.page import Page
+
+from tomin.adapters.outbound.extraction import KeywordTemplateClassifier, PdfTextExtractor
+from tomin.adapters.outbound.extraction.classifier import TEMPLATE_BANAMEX
+from tomin.adapters.outbound.extraction.pdf_text import NeedsOcrError
+from tomin.adapters.outbound.parsing import BanamexParser
+
+
+def _pdf(pages: list[list[str]]) -> bytes:
+    """A minimal text PDF, one Helvetica line per string."""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", b""]
+    kids = []
+    font = 3
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    for lines in pages:
+        ops = ["BT /F1 10 Tf 14 TL 40 780 Td"]
+        ops += [f"({line}) Tj T*" for line in lines]
+        ops.append("ET")
+        content = "\n".join(ops).encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(content), content))
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+            b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>"
+            % (font, len(objects))
+        )
+        kids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % k for k in kids),
+        len(kids),
+    )
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1,
+        xref,
+    )
+    return bytes(out)
+
+
+_STATEMENT = [
+    ["BANAMEX Estado de cuenta", "Periodo 01/03/2024 al 31/03/2024"],
+    ["05/03 OXXO CENTRO 45.50", "07/03 SPEI RECIBIDO NOMINA 12,000.00"],
+    ["09/03 NETFLIX.COM 299.00", "Saldo final 11,655.50"],
+]
+
+
+def test_only_the_first_page_is_held_and_the_rest_is_streamed(monkeypatch):
+    events = []
+    extract_text, close = Page.extract_text, Page.close
+
+    def reading(page, *args, **kwargs):
+        events.append(("read", page.page_number))
+        return extract_text(page, *args, **kwargs)
+
+    def closing(page):
+        events.append(("close", page.page_number))
+        close(page)
+
+    monkeypatch.setattr(Page, "extract_text", reading)
+    monkeypatch.setattr(Page, "close", closing)
+
+    doc = PdfTextExtractor().extract(_pdf(_STATEMENT), "estado.pdf", "application/pdf")
+
+    assert doc.lines == _STATEMENT[0]
+    assert [e for e in events if e[0] == "read"] == [("read", 1)]
+    events.clear()
+
+    assert list(doc.iter_lines()) == [line for page in _STATEMENT for line in page]
+    # Each page's caches are dropped before the next page is parsed.
+    assert events[:6] == [
+        ("read", 1), ("close", 1), ("read", 2), ("close", 2), ("read", 3), ("close", 3)
+    ]
+
+
+def test_a_streamed_statement_classifies_and_parses_like_a_whole_one():
+    doc = PdfTextExtractor().extract(_pdf(_STATEMENT), "estado.pdf", None)
+
+    assert KeywordTemplateClassifier().classify(doc) == TEMPLATE_BANAMEX
+    statement = BanamexParser().parse(doc)
+
+    assert [t.raw_description for t in statement.transactions] == [
+        "OXXO CENTRO",
+        "SPEI RECIBIDO NOMINA",
+        "NETFLIX.COM",
+    ]
+    # The year comes from the first page, the only one kept in `text`.
+    assert (statement.period_start, statement.period_end) == (date(2024, 3, 5), date(2024, 3, 9))
+
+
+def test_parse_lines_consumes_any_iterator_once():
+    def lines():
+        yield "05/03/2024 OXXO 10.00"
+        yield "06/03/2024 OXXO 20.00"
+
+    statement = BanamexParser().parse_lines(lines(), default_year=2024)
+
+    assert [t.amount for t in statement.transactions] == [10, 20]
+
+
+def test_a_pdf_without_text_still_asks_for_ocr():
+    with pytest.raises(NeedsOcrError):
+        PdfTextExtractor().extract(_pdf([[], ["x"]]), "scan.pdf", None)
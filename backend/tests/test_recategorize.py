@@ -0,0 +1,162 @@
+"""Bulk re-categorization: auto rows follow the current labels, user rows stay."""
+
+from __future__ import annotations
+
+from datetime import date
+from decimal import Decimal
+from uuid import uuid4
+
+from tomin.domain.entities import Category, Merchant, Transaction
+
+
+def _seed(container, user_id, *rows):
+    txs = [
+        Transaction(
+            user_id=user_id,
+            tx_date=date(2024, 3, day),
+            amount=Decimal("100.00"),
+            raw_description=description,
+            category_source=source,
+        )
+        for day, (description, source) in enumerate(rows, start=1)
+    ]
+    for t in txs:
+        cls = container.categorizer.get().classify(t.raw_description)
+        t.category_id, t.merchant_id = cls.category_id, cls.merchant_id
+    container.transactions.add_many(txs)
+    container.cube.upsert_transactions(txs)
+    return txs
+
+
+def _books(container):
+    category = Category(name="Libros", categorization_labels=["gandhi", "sotano"])
+    merchant = Merchant(name="Gandhi", labels=["libreria gandhi"])
+    container.categories.add_many([category])
+    container.merchants.add_many([merchant])
+    return category, merchant
+
+
+def test_auto_rows_are_reclassified_and_user_rows_kept(app):
+    container = app.extensions["container"]
+    user = uuid4()
+    auto, mine, unrelated = _seed(
+        container,
+        user,
+        ("LIBRERIA GANDHI SUC 4", "auto"),
+        ("EL SOTANO COYOACAN", "user"),
+        ("OXXO CENTRO", "auto"),
+    )
+    category, merchant = _books(container)
+
+    result = container.recategorize.execute(user_id=user)
+
+    assert (result.users, result.scanned, result.changed) == (1, 3, 1)
+    assert result.rows_per_second > 0
+    stored = {t.id: t for t in container.transactions.iter_for_user(user)}
+    assert (stored[auto.id].category_id, stored[auto.id].merchant_id) == (
+        category.id,
+        merchant.id,
+    )
+    assert stored[mine.id].category_id == mine.category_id
+    assert stored[unrelated.id].category_id == unrelated.category_id
+    by_category = {c.category_id: c.amount for c in container.cube.spending_by_category(user)}
+    assert by_category[str(category.id)] == Decimal("100.00")
+
+
+def test_only_changed_rows_reach_the_cube(app, monkeypatch):
+    container = app.extensions["container"]
+    user = uuid4()
+    _seed(container, user, *[(f"OXXO {i}", "auto") for i in range(5)], ("GANDHI", "auto"))
+    _books(container)
+    pushed = []
+    upsert = container.cube.upsert_transactions
+    monkeypatch.setattr(
+        container.cube, "upsert_transactions", lambda txs: pushed.extend(txs) or upsert(txs)
+    )
+
+    assert container.recategorize.execute(user_id=user, batch_size=2).changed == 1
+    assert [t.raw_description for t in pushed] == ["GANDHI"]
+    # A second pass has nothing left to change.
+    assert container.recategorize.execute(user_id=user).changed == 0
+
+
+def test_a_correction_made_after_the_read_wins(app):
+    container = app.extensions["container"]
+    user = uuid4()
+    (row,) = _seed(container, user, ("GANDHI", "auto"))
+    category, _ = _books(container)
+    stale = container.transactions.get(row.id)
+    edited = container.transactions.get(row.id)
+    edited.category_id, edited.category_source = None, "user"
+    container.transactions.update(edited)
+
+    stale.category_id = category.id
+    assert container.transactions.update_classification_many([stale]) == 0
+
+    assert container.transactions.get(row.id).category_id is None
+
+
+def test_each_page_is_written_as_it_is_read(app, monkeypatch):
+    container = app.extensions["container"]
+    user = uuid4()
+    _seed(container, user, ("GANDHI 1", "auto"), ("OXXO", "auto"), ("GANDHI 3", "auto"))
+    _books(container)
+    events = []
+    read = container.transactions.list_for_user
+    write = container.transactions.update_classification_many
+    monkeypatch.setattr(
+        container.transactions,
+        "list_for_user",
+        lambda *args, **kwargs: events.append("page") or read(*args, **kwargs),
+    )
+    monkeypatch.setattr(
+        container.transactions,
+        "update_classification_many",
+        lambda txs: events.append([t.raw_description for t in txs]) or write(txs),
+    )
+
+    assert container.recategorize.execute(user_id=user, batch_size=2).changed == 2
+    # Newest first: the first page's row is written before the next is read.
+    assert events == ["page", ["GANDHI 3"], "page", ["GANDHI 1"]]
+
+
+def test_a_correction_made_mid_pass_is_not_counted_as_changed(app, monkeypatch):
+    container = app.extensions["container"]
+    user = uuid4()
+    (row,) = _seed(container, user, ("GANDHI", "auto"))
+    _books(container)
+    read = container.transactions.list_for_user
+
+    def corrected_after_the_read(*args, **kwargs):
+        page = read(*args, **kwargs)
+        edited = container.transactions.get(row.id)
+        edited.category_id, edited.category_source = None, "user"
+        container.transactions.update(edited)
+        return page
+
+    monkeypatch.setattr(container.transactions, "list_for_user", corrected_after_the_read)
+
+    result = container.recategorize.execute(user_id=user)
+
+    assert (result.scanned, result.changed) == (1, 0)
+    assert container.transactions.get(row.id).category_id is None
+
+
+def test_without_a_user_every_owner_is_visited(app):
+    container = app.extensions["container"]
+    users = [uuid4(), uuid4()]
+    for user in users:
+        _seed(container, user, ("GANDHI", "auto"), ("OXXO", "auto"))
+    _books(container)
+
+    result = container.recategorize.execute()
+
+    assert sorted(container.transactions.user_ids()) == sorted(users)
+    assert (result.users, result.scanned, result.changed) == (2, 4, 2)
+
+
+def test_the_admin_endpoint_is_scoped_to_the_caller(client):
+    body = client.post("/api/admin/transactions/recategorize").get_json()
+
+    assert body["scanned"] == body["changed"] == 0
+    assert set(body) == {"scanned", "changed", "seconds", "rows_per_second"}
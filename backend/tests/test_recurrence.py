@@ -1,9 +1,9 @@
 from datetime import date
 from decimal import Decimal
-from uuid import uuid4
+from uuid import UUID, uuid4
 
 from tomin.domain.entities import Transaction
-from tomin.domain.services.recurrence import RecurrenceService
+from tomin.domain.services.recurrence import RecurrenceService, RecurrenceStats
 from tomin.domain.value_objects.enums import TxType
 
 
@@ -33,6 +33,14 @@ def test_detects_monthly_subscription():
     assert "one off store" not in labels  # single occurrence filtered out
 
 
+def test_a_single_occurrence_is_a_group_when_one_is_enough():
+    groups = RecurrenceService(min_occurrences=1).detect([_tx(date(2024, 1, 9), "Oxxo", "50")])
+
+    assert [(g.label, g.occurrences, g.average_interval_days, g.frequency) for g in groups] == [
+        ("oxxo", 1, 0.0, "irregular")
+    ]
+
+
 def test_income_is_ignored():
     txs = [
         Transaction(user_id=uuid4(), tx_date=date(2024, 1, 1), amount=Decimal("1000"),
@@ -41,3 +49,152 @@ def test_income_is_ignored():
                     raw_description="Nomina", tx_type=TxType.INCOME),
     ]
     assert RecurrenceService().detect(txs) == []
+
+
+# --- in the cube ----------------------------------------------------------
+def _expense(user, day: date, desc: str, amount: str):
+    return Transaction(
+        user_id=user,
+        tx_date=day,
+        amount=Decimal(amount),
+        raw_description=desc,
+        tx_type=TxType.EXPENSE,
+    )
+
+
+def test_the_cube_groups_like_the_domain_does():
+    from tomin.adapters.outbound.cube import DuckDbCube
+
+    user = uuid4()
+    txs = [
+        _expense(user, date(2024, 1, 5), "NETFLIX.COM", "299"),
+        _expense(user, date(2024, 2, 5), "Netflix com", "299"),
+        _expense(user, date(2024, 3, 6), "netflix  COM!", "319"),
+        _expense(user, date(2024, 1, 2), "Café Ñandú", "80"),
+        _expense(user, date(2024, 1, 9), "CAFE NANDU", "81"),
+        _expense(user, date(2024, 1, 9), "One off store", "50"),
+        Transaction(user_id=user, tx_date=date(2024, 1, 1), amount=Decimal(9000),
+                    raw_description="Netflix com", tx_type=TxType.INCOME),
+    ]
+    cube = DuckDbCube(":memory:")
+    cube.upsert_transactions(txs)
+    service = RecurrenceService()
+
+    from_cube = service.groups(cube.recurrence_stats(user))
+
+    assert from_cube == service.detect(txs)
+    assert [(g.label, g.occurrences, g.average_amount, g.frequency) for g in from_cube] == [
+        ("netflix com", 3, Decimal("305.67"), "monthly"),
+        ("cafe nandu", 2, Decimal("80.50"), "weekly"),
+    ]
+
+
+def test_the_whole_history_counts(app, client):
+    """No window: an account with years of daily coffee still sees its first rent."""
+    from datetime import timedelta
+
+    container = app.extensions["container"]
+    user = UUID("00000000-0000-0000-0000-000000000001")
+    start = date(2010, 1, 1)
+    coffee = [_expense(user, start + timedelta(days=i), "STARBUCKS", "65") for i in range(6000)]
+    rent = [_expense(user, date(2010, m, 1), "RENTA DEPTO", "9000") for m in (1, 2, 3)]
+    container.cube.upsert_transactions(coffee + rent)
+
+    items = {i["label"]: i for i in client.get("/api/analytics/recurring").get_json()["items"]}
+
+    assert items["starbucks"]["occurrences"] == 6000
+    assert items["renta depto"] == {
+        "label": "renta depto",
+        "average_amount": 9000.0,
+        "frequency": "monthly",
+        "occurrences": 3,
+    }
+
+
+def test_a_cube_file_from_before_the_key_gets_it_filled_in(tmp_path):
+    import duckdb
+
+    from tomin.adapters.outbound.cube import DuckDbCube
+
+    path = str(tmp_path / "cube.duckdb")
+    user = uuid4()
+    cube = DuckDbCube(path)
+    cube.upsert_transactions(
+        [_expense(user, date(2024, m, 1), "Spotify México", "129") for m in (1, 2)]
+    )
+    cube._connection.close()
+    with duckdb.connect(path) as con:
+        con.execute("ALTER TABLE fact_transactions DROP COLUMN description_key")
+
+    reopened = DuckDbCube(path)
+
+    (stats,) = reopened.recurrence_stats(user)
+    assert (stats.label, stats.occurrences) == ("spotify mexico", 2)
+
+
+def test_update_folds_in_one_occurrence_at_a_time_in_any_order():
+    service = RecurrenceService()
+    txs = [
+        _tx(date(2024, 3, 5), "Netflix", "299"),
+        _tx(date(2024, 1, 5), "NETFLIX", "279"),
+        _tx(date(2024, 2, 5), "netflix", "299"),
+    ]
+
+    stats = None
+    for tx in txs:
+        stats = service.update(stats, tx)
+
+    assert stats is not None
+    assert (stats.label, stats.occurrences, stats.total_amount) == ("netflix", 3, Decimal(877))
+    assert (stats.first_date, stats.last_date) == (date(2024, 1, 5), date(2024, 3, 5))
+    assert service.groups([stats]) == service.detect(txs)
+
+
+def test_the_recurrence_index_follows_ingest_edits_and_deletes():
+    from tomin.adapters.outbound.cube import DuckDbCube
+
+    user = uuid4()
+    cube = DuckDbCube(":memory:")
+    jan, feb, mar, apr = (_expense(user, date(2024, m, 5), "Netflix", "299") for m in (1, 2, 3, 4))
+
+    cube.upsert_transactions([jan])
+    assert cube.recurrence_stats(user) == []
+    cube.upsert_transactions([feb, mar, apr])
+    (stats,) = cube.recurrence_stats(user)
+    assert (stats.occurrences, stats.last_date) == (4, date(2024, 4, 5))
+
+    # Deleting the latest occurrence brings the one before it back as last.
+    cube.delete_transactions([apr.id])
+    (stats,) = cube.recurrence_stats(user)
+    assert (stats.occurrences, stats.last_date) == (3, date(2024, 3, 5))
+
+    # An edit that takes a row out of the group, then one that moves it.
+    feb.tx_type = TxType.INCOME
+    cube.upsert_transactions([feb])
+    (stats,) = cube.recurrence_stats(user)
+    assert (stats.occurrences, stats.total_amount) == (2, Decimal(598))
+    mar.description = "Disney Plus"
+    cube.upsert_transactions([mar])
+    assert cube.recurrence_stats(user) == []
+    assert sorted(cube.recurrence_stats(user, min_occurrences=1), key=lambda s: s.label) == [
+        RecurrenceStats("disney plus", 1, Decimal(299), date(2024, 3, 5), date(2024, 3, 5)),
+        RecurrenceStats("netflix", 1, Decimal(299), date(2024, 1, 5), date(2024, 1, 5)),
+    ]
+
+
+def test_a_cube_file_from_before_the_index_derives_it(tmp_path):
+    import duckdb
+
+    from tomin.adapters.outbound.cube import DuckDbCube
+
+    path = str(tmp_path / "cube.duckdb")
+    user = uuid4()
+    cube = DuckDbCube(path)
+    cube.upsert_transactions([_expense(user, date(2024, m, 1), "Gym", "500") for m in (1, 2)])
+    cube._connection.close()
+    with duckdb.connect(path) as con:
+        con.execute("DROP TABLE recurrence_index")
+
+    (stats,) = DuckDbCube(path).recurrence_stats(user)
+
+    assert (stats.label, stats.occurrences, stats.total_amount) == ("gym", 2, Decimal(1000))
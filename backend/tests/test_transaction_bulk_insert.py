@@ -0,0 +1,67 @@
+"""SqlTransactionRepository.add_many: one Core statement, every column intact."""
+
+from __future__ import annotations
+
+import csv
+import io
+from datetime import date
+from decimal import Decimal
+from uuid import uuid4
+
+from tomin.adapters.outbound.persistence.repositories import _copy_csv, _transaction_row
+from tomin.domain.entities import Transaction
+from tomin.domain.value_objects.enums import TransactionStatus, TxType
+
+
+def _tx(**kwargs):
+    fields = {
+        "user_id": uuid4(),
+        "tx_date": date(2024, 3, 9),
+        "amount": Decimal("1234.56"),
+        "raw_description": 'PAGO "TC", BBVA\nREF 9',
+        "tx_type": TxType.EXPENSE,
+        **kwargs,
+    }
+    return Transaction(**fields)
+
+
+def test_add_many_round_trips_every_stored_field(app):
+    repo = app.extensions["container"].transactions
+    tx = _tx(
+        statement_id=uuid4(),
+        description="",
+        currency="USD",
+        status=TransactionStatus.PENDING,
+        category_id=uuid4(),
+        merchant_id=uuid4(),
+        category_source="user",
+        notes="nota",
+        excluded_from_stats=True,
+        is_transfer=True,
+    )
+
+    repo.add_many([tx, _tx(user_id=tx.user_id)])
+
+    stored = repo.get(tx.id)
+    assert stored == tx
+    assert repo.count_for_user(tx.user_id) == 2
+
+
+def test_add_many_of_nothing_opens_no_session(app, monkeypatch):
+    container = app.extensions["container"]
+    monkeypatch.setattr(container.database, "session", None)
+
+    container.transactions.add_many([])
+
+
+def test_copy_csv_keeps_null_and_empty_apart():
+    row = _transaction_row(_tx(description=""))
+
+    line = _copy_csv([row])
+
+    (parsed,) = csv.reader(io.StringIO(line))
+    assert len(parsed) == len(row)
+    assert line.endswith("\n")
+    assert '"PAGO ""TC"", BBVA\nREF 9"' in line
+    assert ',"",' in line  # description: an empty string, quoted
+    assert ",," in line  # statement_id: NULL, a bare blank
@@ -0,0 +1,104 @@
+"""GET /api/transactions/export.csv: the list's rows and filters, streamed."""
+
+from __future__ import annotations
+
+import csv
+import io
+from datetime import date
+from decimal import Decimal
+from uuid import UUID
+
+import pytest
+
+from tomin.domain.entities import Transaction
+from tomin.domain.value_objects.enums import TxType
+
+DEV_USER = UUID("00000000-0000-0000-0000-000000000001")
+HEADER = "date,description,amount,currency,type,status\r\n"
+
+
+@pytest.fixture
+def history(app):
+    txs = [
+        Transaction(
+            user_id=DEV_USER,
+            tx_date=date(2024, 1, day),
+            amount=Decimal(f"{10 + i}.50"),
+            raw_description=f"{'OXXO' if i % 2 else 'UBER'} {day}-{i}",
+            description=f"{'OXXO' if i % 2 else 'UBER'} {day}-{i}",
+            tx_type=TxType.EXPENSE,
+        )
+        for day in (3, 5, 9)
+        for i in range(4)
+    ]
+    app.extensions["container"].transactions.add_many(txs)
+    return txs
+
+
+def _rows(response) -> list[list[str]]:
+    return list(csv.reader(io.StringIO(response.get_data(as_text=True))))[1:]
+
+
+def test_the_export_lists_what_the_list_lists_in_the_same_order(client, history):
+    for query in ({}, {"start": "2024-01-04"}, {"search": "oxxo"}):
+        listed = client.get("/api/transactions", query_string={**query, "limit": 100})
+        exported = client.get("/api/transactions/export.csv", query_string=query)
+
+        assert exported.mimetype == "text/csv"
+        assert [r[1] for r in _rows(exported)] == [
+            item["description"] for item in listed.get_json()["items"]
+        ]
+
+    assert ["2024-01-09", "UBER 9-2", "12.50", "MXN", "expense", "completed"] in _rows(
+        client.get("/api/transactions/export.csv")
+    )
+
+
+def test_the_export_is_streamed_in_chunks_header_first(client, history, monkeypatch):
+    from tomin.adapters.inbound.http.blueprints import transactions
+
+    monkeypatch.setattr(transactions, "_CSV_CHUNK_ROWS", 5)
+
+    response = client.get("/api/transactions/export.csv")
+
+    assert response.is_streamed
+    chunks = list(response.response)
+    assert chunks[0] == HEADER.encode()
+    # 12 rows in chunks of 5: 5, 5, then the last 2.
+    assert [chunk.count(b"\r\n") for chunk in chunks[1:]] == [5, 5, 2]
+
+
+def test_an_empty_history_exports_the_header_alone(client):
+    assert client.get("/api/transactions/export.csv").get_data(as_text=True) == HEADER
+
+
+
+
+def test_a_stalled_download_does_not_lock_writers_out(app, client):
+    repo = app.extensions["container"].transactions
+    rows = [
+        Transaction(
+            user_id=DEV_USER,
+            tx_date=date(2023, 1, 1 + i % 28),
+            amount=Decimal("1.00"),
+            raw_description=f"OXXO {i}",
+            tx_type=TxType.EXPENSE,
+        )
+        for i in range(1200)
+    ]
+    repo.add_many(rows)
+    chunks = iter(client.get("/api/transactions/export.csv").response)
+    next(chunks), next(chunks)
+
+    # The client stops reading mid-download; ingest must still get to write.
+    late = Transaction(
+        user_id=DEV_USER,
+        tx_date=date(2024, 2, 1),
+        amount=Decimal("1.00"),
+        raw_description="OXXO",
+        tx_type=TxType.EXPENSE,
+    )
+    repo.add_many([late])
+
+    # The rest of the download carries on from where it was.
+    assert sum(chunk.count(b"\r\n") for chunk in chunks) == 700
@@ -0,0 +1,105 @@
+"""GET /api/transactions: keyset pages over (tx_date, id), and an optional total."""
+
+from __future__ import annotations
+
+from datetime import date
+from decimal import Decimal
+from uuid import UUID
+
+import pytest
+
+from tomin.domain.entities import Transaction
+from tomin.domain.value_objects.enums import TxType
+
+DEV_USER = UUID("00000000-0000-0000-0000-000000000001")
+
+
+@pytest.fixture
+def history(app):
+    """Twelve rows, four per date -- ties are what keyset order must survive."""
+    txs = [
+        Transaction(
+            user_id=DEV_USER,
+            tx_date=date(2024, 1, day),
+            amount=Decimal(10 + i),
+            raw_description=f"MOVIMIENTO {day}-{i}",
+            tx_type=TxType.EXPENSE,
+        )
+        for day in (3, 5, 9)
+        for i in range(4)
+    ]
+    app.extensions["container"].transactions.add_many(txs)
+    return txs
+
+
+def _walk(client, **params):
+    seen, pages, cursor = [], 0, None
+    while True:
+        query = {"limit": 5, **params}
+        if cursor:
+            query["cursor"] = cursor
+        body = client.get("/api/transactions", query_string=query).get_json()
+        seen += [item["id"] for item in body["items"]]
+        pages += 1
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return seen, pages, body
+
+
+def test_cursor_pages_cover_every_row_once_in_a_total_order(client, history):
+    seen, pages, _ = _walk(client)
+
+    expected = sorted(history, key=lambda t: (t.tx_date, str(t.id)), reverse=True)
+    assert seen == [str(t.id) for t in expected]
+    assert pages == 3
+
+
+def test_cursor_pages_respect_the_filters(client, history):
+    seen, _, _ = _walk(client, start="2024-01-04")
+
+    assert len(seen) == 8
+    assert set(seen) == {str(t.id) for t in history if t.tx_date >= date(2024, 1, 4)}
+
+
+def test_the_total_is_counted_once_then_skipped(client, history):
+    first = client.get("/api/transactions", query_string={"limit": 5}).get_json()
+    assert first["total"] == 12
+    assert first["next_cursor"]
+
+    cursor = first["next_cursor"]
+    second = client.get(
+        "/api/transactions", query_string={"limit": 5, "cursor": cursor}
+    ).get_json()
+    assert second["total"] is None
+
+    counted = client.get(
+        "/api/transactions", query_string={"limit": 5, "cursor": cursor, "total": "true"}
+    ).get_json()
+    assert counted["total"] == 12
+
+    skipped = client.get("/api/transactions", query_string={"total": "false"}).get_json()
+    assert skipped["total"] is None
+    assert len(skipped["items"]) == 12
+    assert skipped["next_cursor"] is None
+
+
+def test_offset_pages_still_work_and_are_stable(client, history):
+    ids = []
+    for offset in (0, 5, 10):
+        body = client.get(
+            "/api/transactions", query_string={"limit": 5, "offset": offset}
+        ).get_json()
+        ids += [item["id"] for item in body["items"]]
+    assert len(ids) == len(set(ids)) == 12
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "bnVsbA", "WyJ4IiwgInkiXQ"])
+def test_a_forged_cursor_is_a_400(client, history, cursor):
+    resp = client.get("/api/transactions", query_string={"cursor": cursor})
+    assert resp.status_code == 400
+
+
+def test_cursor_and_offset_together_are_a_400(client, history):
+    cursor = client.get("/api/transactions", query_string={"limit": 5}).get_json()["next_cursor"]
+    resp = client.get("/api/transactions", query_string={"cursor": cursor, "offset": 5})
+    assert resp.status_code == 400
@@ -0,0 +1,137 @@
+"""GET /api/transactions?search=: folded like the categorizer, served by an index."""
+
+from __future__ import annotations
+
+from datetime import date
+from decimal import Decimal
+from uuid import UUID
+
+import pytest
+from sqlalchemy import inspect, text
+
+from tomin.adapters.outbound.persistence.db import Database
+from tomin.adapters.outbound.persistence.migrator import upgrade_to_head
+from tomin.adapters.outbound.persistence.models import TransactionModel
+from tomin.domain.entities import Transaction
+from tomin.domain.value_objects.enums import TxType
+
+DEV_USER = UUID("00000000-0000-0000-0000-000000000001")
+
+
+@pytest.fixture
+def history(app):
+    txs = [
+        Transaction(
+            user_id=DEV_USER,
+            tx_date=date(2024, 1, 1 + i),
+            amount=Decimal(50),
+            raw_description=raw,
+            tx_type=TxType.EXPENSE,
+        )
+        for i, raw in enumerate(["CAFÉ LA ÑORA", "OXXO GAS", "Pago: Telmex", "UBER *TRIP"])
+    ]
+    app.extensions["container"].transactions.add_many(txs)
+    return txs
+
+
+def _search(client, term):
+    body = client.get("/api/transactions", query_string={"search": term}).get_json()
+    return sorted(item["raw_description"] for item in body["items"]), body["total"]
+
+
+@pytest.mark.parametrize(
+    ("term", "expected"),
+    [
+        ("cafe", ["CAFÉ LA ÑORA"]),
+        ("NORA", ["CAFÉ LA ÑORA"]),
+        ("oxx", ["OXXO GAS"]),
+        ("pago telmex", ["Pago: Telmex"]),
+        ("*trip", ["UBER *TRIP"]),
+        ("ex", ["Pago: Telmex"]),  # under a trigram: the unindexed path
+        ("¿?", ["CAFÉ LA ÑORA", "OXXO GAS", "Pago: Telmex", "UBER *TRIP"]),
+        ("starbucks", []),
+    ],
+)
+def test_search_is_accent_case_and_punctuation_insensitive(client, history, term, expected):
+    found, total = _search(client, term)
+
+    assert found == expected
+    assert total == len(expected)
+
+
+def test_search_follows_an_edited_description(client, history):
+    tx = history[3]
+
+    client.patch(f"/api/transactions/{tx.id}", json={"description": "Viaje aeropuerto"})
+
+    assert _search(client, "aeropuerto")[0] == ["UBER *TRIP"]
+    # The clean description replaces the raw one for search, as it does on screen.
+    assert _search(client, "uber")[0] == []
+
+
+def test_deleted_rows_leave_the_index(app, client, history):
+    repo = app.extensions["container"].transactions
+    with app.extensions["container"].database.session() as s:
+        s.delete(s.get(TransactionModel, str(history[1].id)))
+
+    assert _search(client, "oxxo")[0] == []
+    assert repo.count_for_user(DEV_USER, search="oxxo") == 0
+
+
+def test_migration_builds_the_index(tmp_path):
+    db = Database(f"sqlite:///{tmp_path / 'm.db'}")
+    upgrade_to_head(db)
+
+    assert "transactions_fts" in inspect(db.engine).get_table_names()
+    with db.engine.connect() as conn:
+        triggers = (
+            conn.exec_driver_sql(
+                "SELECT name FROM sqlite_master WHERE type = 'trigger' "
+                "AND name LIKE 'transactions_fts%' ORDER BY name"
+            )
+            .scalars()
+            .all()
+        )
+    assert triggers == ["transactions_fts_ad", "transactions_fts_ai", "transactions_fts_au"]
+
+
+def test_migration_backfills_search_text_on_pre_existing_rows(tmp_path):
+    from alembic import command
+
+    from tomin.adapters.outbound.persistence.migrator import _run, build_config
+
+    db = Database(f"sqlite:///{tmp_path / 'backfill.db'}")
+    _run(build_config(), db, command.upgrade, "0009")
+    with db.engine.begin() as conn:
+        for n, (raw, edited) in enumerate(
+            (("CAFÉ LA ÑORA", None), ("OXXO 4412", "Súper"), ("UBER *TRIP", None)), start=1
+        ):
+            conn.execute(
+                text(
+                    "INSERT INTO transactions "
+                    "(id, user_id, tx_date, raw_description, description, amount, currency, "
+                    " tx_type, status, category_source, excluded_from_stats, is_transfer, "
+                    " is_cash_withdrawal) "
+                    "VALUES (:id, :user, '2024-01-05', :raw, :edited, 100, 'MXN', 'expense', "
+                    "'completed', 'auto', 0, 0, 0)"
+                ),
+                {
+                    "id": f"{n:08d}-0000-4000-8000-000000000000",
+                    "user": str(DEV_USER),
+                    "raw": raw,
+                    "edited": edited,
+                },
+            )
+
+    upgrade_to_head(db)
+
+    with db.engine.connect() as conn:
+        folded = (
+            conn.execute(text("SELECT search_text FROM transactions ORDER BY id")).scalars().all()
+        )
+        indexed = conn.execute(
+            text("SELECT count(*) FROM transactions_fts WHERE search_text LIKE '%nora%'")
+        ).scalar()
+    # The edited description wins over the raw one, as on insert.
+    assert folded == ["cafe la nora", "super", "uber trip"]
+    assert indexed == 1
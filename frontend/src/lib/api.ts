@@ -75,6 +75,16 @@ export type Statement = {
     uploaded_at: string | null;
 };
 
+/** An upload on the server's job queue. Counts arrive once it is processed. */
+export type UploadJob = {
+    job_id: string;
+    statement_id: string;
+    status: "processing" | "processed" | "failed";
+    template: string | null;
+    transactions_created: number | null;
+    error: string | null;
+};
+
 export type RecurringItem = {
     label: string;
     average_amount: number;
@@ -145,11 +155,23 @@ export const api = {
             `/api/statements/${id}`,
             { method: "DELETE" }
         ),
-    uploadStatement: async (file: File) => {
+    uploadStatus: (jobId: string) => request<UploadJob>(`/api/statements/jobs/${jobId}`),
+    /**
+     * Resolves once the server has finished with the file. The POST only
+     * queues it (202); a scanned PDF can spend tens of seconds in OCR, so this
+     * polls the job rather than holding one request open that long.
+     */
+    uploadStatement: async (file: File): Promise<UploadJob> => {
         const form = new FormData();
         form.append("file", file);
         const res = await fetch(`${API_URL}/api/statements`, { method: "POST", body: form });
         if (!res.ok) throw new Error(await res.text());
-        return res.json();
+        let job = (await res.json()) as UploadJob;
+        while (job.status === "processing") {
+            await new Promise((resolve) => setTimeout(resolve, 1000));
+            job = await api.uploadStatus(job.job_id);
+        }
+        if (job.status === "failed") throw new Error(job.error ?? "failed");
+        return job;
     },
 };
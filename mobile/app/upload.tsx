@@ -39,7 +39,8 @@ export default function UploadScreen() {
         );
         await refresh();
 
-        // 2. Upload a transient copy for parsing.
+        // 2. Upload a transient copy for parsing. Resolves once the server's
+        // job has processed it, and throws if the job failed.
         setStatus("Procesando en el servidor...");
         try {
             const res = await api.uploadStatement(stored.localUri, stored.name, stored.mimeType);
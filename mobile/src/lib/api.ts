@@ -29,6 +29,16 @@ export type Statement = {
     uploaded_at: string | null;
 };
 
+/** An upload on the server's job queue. Counts arrive once it is processed. */
+export type UploadJob = {
+    job_id: string;
+    statement_id: string;
+    status: "processing" | "processed" | "failed";
+    template: string | null;
+    transactions_created: number | null;
+    error: string | null;
+};
+
 async function get<T>(path: string): Promise<T> {
     const res = await fetch(`${API_URL}${path}`);
     if (!res.ok) throw new Error(`API ${res.status}`);
@@ -52,21 +62,27 @@ export const api = {
      */
     deleteStatement: (id: string) =>
         del<{ statement_id: string; transactions_deleted: number }>(`/api/statements/${id}`),
+    uploadStatus: (jobId: string) => get<UploadJob>(`/api/statements/jobs/${jobId}`),
     /**
      * Uploads a transient copy of an on-device statement for processing.
      * The durable copy stays on the phone (see lib/storage).
+     *
+     * Resolves once the server has finished with the file. The POST only
+     * queues it (202), so this polls the job until it is processed or failed.
      */
-    uploadStatement: async (uri: string, name: string, mimeType: string) => {
+    uploadStatement: async (uri: string, name: string, mimeType: string): Promise<UploadJob> => {
         const form = new FormData();
         // React Native FormData file shape.
         form.append("file", { uri, name, type: mimeType } as unknown as Blob);
         const res = await fetch(`${API_URL}/api/statements`, { method: "POST", body: form });
         if (!res.ok) throw new Error(await res.text());
-        return res.json() as Promise<{
-            statement_id: string;
-            template: string;
-            transactions_created: number;
-        }>;
+        let job = (await res.json()) as UploadJob;
+        while (job.status === "processing") {
+            await new Promise((resolve) => setTimeout(resolve, 1000));
+            job = await api.uploadStatus(job.job_id);
+        }
+        if (job.status === "failed") throw new Error(job.error ?? "failed");
+        return job;
     },
 };
 